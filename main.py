@@ -121,7 +121,9 @@ def run_healhub_voice_app():
                 user_answer = ""
                 # Basic validation: ensure answer is not empty
                 while not user_answer.strip():
-                    prompt_message = f"🎤 HealHub (follow-up for {symptom_name_for_prompt}): {question_text_for_prompt}\nYour answer: "
+                    # Shown in the user's language when the KB localization build has it; recorded in English
+                    prompt_message = (f"🎤 HealHub (follow-up for {next_question_data.get('localized_symptom_name') or symptom_name_for_prompt}): "
+                                      f"{next_question_data.get('localized_question') or question_text_for_prompt}\nYour answer: ")
                     user_answer = input(prompt_message)
                     if not user_answer.strip():
                         print("An answer is required to proceed.")
@@ -0,0 +1,310 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+_MISSING = object()
+
+
+def canonical_key(*parts: Any) -> str:
+    """
+    Stable hash of JSON-serializable parts.
+
+    Dict keys are sorted and separators fixed so logically identical requests
+    (e.g. the same messages built in a different key order) map to the same key.
+    """
+    serialized = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache with optional per-entry TTL"""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at is not None and self._clock() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = self._clock() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class SQLiteCache:
+    """
+    Persistent cache tier backed by a SQLite file.
+
+    Values are stored as JSON. When the table grows beyond max_entries, the least
+    recently accessed rows are evicted. The row count is read once when the cache
+    opens and then kept up to date by this connection, so writes don't count the
+    table; len() re-reads it, picking up rows written by other connections.
+    """
+
+    def __init__(self, path: str, table: str = "cache", max_entries: int = 10000,
+                 ttl_seconds: Optional[float] = None, clock: Callable[[], float] = time.time):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_accessed ON {self.table}(accessed_at)")
+            (self._count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            value, expires_at = row
+            if expires_at is not None and now >= expires_at:
+                with self._conn:
+                    self._count -= self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,)).rowcount
+                self.expirations += 1
+                self.misses += 1
+                return default
+            with self._conn:
+                self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        now = self._clock()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        expires_at = now + ttl if ttl is not None else None
+        serialized = json.dumps(value, ensure_ascii=False)
+        with self._lock, self._conn:
+            inserted = self._conn.execute(
+                f"INSERT OR IGNORE INTO {self.table} (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, serialized, expires_at, now),
+            ).rowcount
+            if not inserted:
+                self._conn.execute(
+                    f"UPDATE {self.table} SET value = ?, expires_at = ?, accessed_at = ? WHERE key = ?",
+                    (serialized, expires_at, now, key),
+                )
+                return
+            self._count += 1
+            overflow = self._count - self.max_entries
+            if overflow > 0:
+                evicted = self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                ).rowcount
+                self._count -= evicted
+                self.evictions += evicted
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._count = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            (self._count,) = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+            return self._count
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TieredCache:
+    """
+    In-memory LRU tier in front of an optional persistent SQLite tier.
+
+    Reads check memory first, then the persistent tier (promoting hits back into
+    memory). Writes go to both tiers.
+    """
+
+    def __init__(self, memory: LRUCache, persistent: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.persistent = persistent
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is _MISSING and self.persistent is not None:
+            value = self.persistent.get(key, _MISSING)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        self.memory.set(key, value, ttl_seconds)
+        if self.persistent is not None:
+            self.persistent.set(key, value, ttl_seconds)
+
+    def clear(self):
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory": self.memory.stats(),
+            "persistent": self.persistent.stats() if self.persistent is not None else None,
+        }
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def build_tiered_cache(env_prefix: str, table: str, default_size: int, default_ttl: Optional[float]) -> TieredCache:
+    """
+    Build a TieredCache configured from environment variables:
+    {env_prefix}_SIZE, {env_prefix}_TTL (seconds) and {env_prefix}_PATH (SQLite file,
+    enables the persistent tier when set).
+    """
+    size = int(_env_float(f"{env_prefix}_SIZE", default_size))
+    ttl = _env_float(f"{env_prefix}_TTL", default_ttl)
+    path = os.getenv(f"{env_prefix}_PATH")
+
+    persistent = None
+    if path:
+        try:
+            persistent = SQLiteCache(path, table=table, max_entries=size * 20, ttl_seconds=ttl)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not open persistent cache at {path}: {e}. Using memory cache only.")
+    return TieredCache(LRUCache(max_entries=size, ttl_seconds=ttl), persistent)
+
+
+_completion_cache: Optional[TieredCache] = None
+_completion_cache_lock = threading.Lock()
+
+
+def get_completion_cache() -> TieredCache:
+    """
+    Process-wide cache for Sarvam-M chat completions.
+
+    Configured through HEALHUB_LLM_CACHE_SIZE (default 512 entries),
+    HEALHUB_LLM_CACHE_TTL (default 24h) and HEALHUB_LLM_CACHE_PATH (optional SQLite tier).
+    """
+    global _completion_cache
+    if _completion_cache is None:
+        with _completion_cache_lock:
+            if _completion_cache is None:
+                _completion_cache = build_tiered_cache("HEALHUB_LLM_CACHE", "chat_completions",
+                                                       default_size=512, default_ttl=24 * 3600)
+    return _completion_cache
+
+
+_translation_cache: Optional[TieredCache] = None
+_translation_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TieredCache:
+    """
+    Process-wide translation memory used by HealHubUtilities.
+
+    Configured through HEALHUB_TRANSLATION_CACHE_SIZE (default 4096 entries),
+    HEALHUB_TRANSLATION_CACHE_TTL (default: no expiry) and
+    HEALHUB_TRANSLATION_CACHE_PATH (optional SQLite tier).
+    """
+    global _translation_cache
+    if _translation_cache is None:
+        with _translation_cache_lock:
+            if _translation_cache is None:
+                _translation_cache = build_tiered_cache("HEALHUB_TRANSLATION_CACHE", "translations",
+                                                        default_size=4096, default_ttl=None)
+    return _translation_cache
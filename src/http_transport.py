@@ -0,0 +1,420 @@
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    from src.request_policy import (DEFAULT_POLICIES, DEFAULT_POLICY, CircuitBreaker, CircuitOpenError,
+                                    LatencyTracker, PolicyCounters, RequestPolicy, retry_after_seconds)
+    from src.rate_limiter import EndpointGovernor, EndpointLimit, RateLimiter, limits_from_env
+except ImportError:
+    import sys
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from src.request_policy import (DEFAULT_POLICIES, DEFAULT_POLICY, CircuitBreaker, CircuitOpenError,
+                                    LatencyTracker, PolicyCounters, RequestPolicy, retry_after_seconds)
+    from src.rate_limiter import EndpointGovernor, EndpointLimit, RateLimiter, limits_from_env
+
+# Per-endpoint read timeouts (seconds). Keys are the logical endpoint names used
+# by SarvamAPIClient and HealHubUtilities when calling SarvamTransport.post().
+DEFAULT_TIMEOUTS: Dict[str, float] = {
+    "chat": 30,
+    "translate": 30,
+    "tts": 30,
+    "stt": 60,
+    "detect_language": 15,
+    "default": 30,
+}
+
+DEFAULT_POOL_CONNECTIONS = 4   # Number of distinct hosts to keep pools for
+DEFAULT_POOL_MAXSIZE = 16      # Keep-alive connections kept per host
+
+
+class PoolCounters:
+    """Thread-safe counters for connection pool reuse"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0  # Connections checked out of the pool
+        self.misses = 0    # Fresh connections opened (TCP + TLS handshake)
+
+    def record_checkout(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hits": self.requests - self.misses,
+                "misses": self.misses,
+            }
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.misses = 0
+
+
+def _counting_pool_classes(counters: PoolCounters) -> Dict[str, type]:
+    """Build urllib3 pool classes that report checkouts and new connections."""
+
+    class _CountingHTTPConnectionPool(HTTPConnectionPool):
+        def _get_conn(self, timeout=None):
+            counters.record_checkout()
+            return super()._get_conn(timeout=timeout)
+
+        def _new_conn(self):
+            counters.record_miss()
+            return super()._new_conn()
+
+    class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        def _get_conn(self, timeout=None):
+            counters.record_checkout()
+            return super()._get_conn(timeout=timeout)
+
+        def _new_conn(self):
+            counters.record_miss()
+            return super()._new_conn()
+
+    return {"http": _CountingHTTPConnectionPool, "https": _CountingHTTPSConnectionPool}
+
+
+class _CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools feed a shared PoolCounters instance"""
+
+    def __init__(self, counters: PoolCounters, **kwargs):
+        self._counters = counters
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self._counters)
+
+
+class SarvamTransport:
+    """
+    Process-wide HTTP transport with keep-alive connection pooling.
+
+    All Sarvam AI calls (chat completions, translate, TTS, STT) go through a single
+    requests.Session so that TCP/TLS connections are reused across calls and across
+    client instances instead of being re-established for every request.
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 timeouts: Optional[Dict[str, float]] = None,
+                 policies: Optional[Dict[str, RequestPolicy]] = None,
+                 limits: Optional[Dict[str, EndpointLimit]] = None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+
+        self.counters = PoolCounters()
+        self.session = requests.Session()
+        adapter = _CountingHTTPAdapter(
+            self.counters,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=False,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.policies: Dict[str, RequestPolicy] = dict(DEFAULT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        self.policy_counters = PolicyCounters()
+        self._breakers: Dict[Tuple[str, int, float], CircuitBreaker] = {}
+        self._latency: Dict[str, LatencyTracker] = {}
+        self._state_lock = threading.Lock()
+        # Process-wide admission control: token bucket + max in-flight per endpoint
+        self.limiter = RateLimiter(limits)
+        self._hedge_executor = ThreadPoolExecutor(max_workers=pool_maxsize, thread_name_prefix="healhub-hedge")
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Get the configured timeout for a logical endpoint name"""
+        return self.timeouts.get(endpoint, self.timeouts["default"])
+
+    def policy_for(self, endpoint: str) -> RequestPolicy:
+        """Get the default request policy for a logical endpoint name"""
+        return self.policies.get(endpoint, DEFAULT_POLICY)
+
+    def set_policy(self, endpoint: str, policy: RequestPolicy):
+        """Change the default request policy for an endpoint (affects all callers)"""
+        self.policies[endpoint] = policy
+
+    def breaker_for(self, endpoint: str, policy: Optional[RequestPolicy] = None) -> CircuitBreaker:
+        """
+        Circuit breaker shared by every call to the endpoint with the same thresholds.
+        Policies with a different failure_threshold or reset_timeout get their own
+        breaker instead of silently using the first caller's.
+        """
+        policy = policy or self.policy_for(endpoint)
+        key = (endpoint, policy.failure_threshold, policy.reset_timeout)
+        with self._state_lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(policy.failure_threshold, policy.reset_timeout)
+                self._breakers[key] = breaker
+            return breaker
+
+    def latency_for(self, endpoint: str) -> LatencyTracker:
+        with self._state_lock:
+            return self._latency.setdefault(endpoint, LatencyTracker())
+
+    def post(self, endpoint: str, url: str, policy: Optional[RequestPolicy] = None, **kwargs) -> requests.Response:
+        """
+        POST through the pooled session, applying the endpoint's request policy.
+
+        Retryable statuses and connection errors/timeouts are retried with jittered
+        exponential backoff (or the server's Retry-After). If retries run out the last
+        response is returned (so callers' raise_for_status() still applies) or the
+        last exception re-raised. While the endpoint's circuit is open this raises
+        CircuitOpenError (a requests ConnectionError) without touching the network.
+        Each attempt first waits for the endpoint's rate limiter; if it stays saturated
+        past max_queue_wait, RateLimitTimeout (a RequestException) is raised.
+        The policy's deadline bounds the whole call: each attempt's timeout is cut to the
+        time left, and no retry is started whose backoff would run past it.
+
+        Args:
+            endpoint: Logical endpoint name (e.g. "chat", "translate") used for timeouts and policy
+            url: Full request URL
+            policy: Overrides the endpoint's default RequestPolicy for this call
+            **kwargs: Passed through to requests.Session.post (headers, json, data, files, ...)
+        """
+        kwargs.setdefault("timeout", self.timeout_for(endpoint))
+        policy = policy or self.policy_for(endpoint)
+        breaker = self.breaker_for(endpoint, policy)
+        timeout = kwargs["timeout"]
+        deadline = time.monotonic() + policy.deadline if policy.deadline else None
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                self.policy_counters.increment("circuit_rejections")
+                raise CircuitOpenError(f"Circuit open for '{endpoint}'; failing fast.")
+
+            if deadline is not None:
+                kwargs["timeout"] = _capped_timeout(timeout, deadline - time.monotonic())
+            _rewind_files(kwargs)
+            try:
+                response = self._send(endpoint, url, policy, kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                breaker.record_failure()
+                delay = policy.backoff(attempt)
+                if attempt >= policy.max_retries or _past_deadline(deadline, delay):
+                    raise
+            else:
+                if response.status_code not in policy.retry_on_status:
+                    # Non-retryable client errors (400, 401, ...) mean the backend is up
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                delay = None
+                if policy.respect_retry_after:
+                    delay = retry_after_seconds(response, policy.max_retry_after)
+                if delay is None:
+                    delay = policy.backoff(attempt)
+                if attempt >= policy.max_retries or _past_deadline(deadline, delay):
+                    return response
+                response.close()
+
+            attempt += 1
+            self.policy_counters.increment("retries")
+            print(f"🔁 Retrying '{endpoint}' in {delay:.2f}s (attempt {attempt + 1}/{policy.max_retries + 1})")
+            time.sleep(delay)
+
+    def _send(self, endpoint: str, url: str, policy: RequestPolicy, kwargs: dict) -> requests.Response:
+        """
+        Single attempt, admitted by the endpoint's rate limiter and hedged when the
+        policy asks for it and the body can be replayed.
+        """
+        governor = self.limiter.governor(endpoint)
+        governor.acquire()  # Raises RateLimitTimeout if the endpoint stays saturated
+        tracker = self.latency_for(endpoint)
+        hedgeable = policy.hedge and not kwargs.get("stream") and not kwargs.get("files")
+        start = time.perf_counter()
+        if hedgeable:
+            response = self._send_hedged(url, policy, tracker, governor, kwargs)
+        else:
+            try:
+                response = self.session.post(url, **kwargs)
+            except BaseException:
+                governor.release()
+                raise
+            if kwargs.get("stream"):
+                _release_on_close(response, governor)  # Body is still being read by the caller
+            else:
+                governor.release()
+        if response.status_code < 500:
+            tracker.record(time.perf_counter() - start)
+        return response
+
+    def _post_and_release(self, governor: EndpointGovernor, url: str, kwargs: dict) -> requests.Response:
+        try:
+            return self.session.post(url, **kwargs)
+        finally:
+            governor.release()
+
+    def _send_hedged(self, url: str, policy: RequestPolicy, tracker: LatencyTracker,
+                     governor: EndpointGovernor, kwargs: dict) -> requests.Response:
+        """
+        Send a duplicate request if the first hasn't answered within the endpoint's p95.
+        Takes ownership of the primary's rate-limiter slot; the duplicate is only sent
+        if the limiter can admit it immediately.
+        """
+        p95 = tracker.percentile(0.95)
+        delay = max(policy.hedge_min_delay, p95 if p95 is not None else policy.hedge_default_delay)
+
+        primary = self._hedge_executor.submit(self._post_and_release, governor, url, kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or not governor.try_acquire():
+            return primary.result()
+
+        self.policy_counters.increment("hedged")
+        hedge = self._hedge_executor.submit(self._post_and_release, governor, url, kwargs)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    self.policy_counters.increment("hedge_wins")
+                for loser in pending:
+                    loser.add_done_callback(_close_response)
+                return future.result()
+        raise error
+
+    def policy_stats(self) -> Dict[str, object]:
+        """Retry/hedge counters, worst circuit state and observed p95 latency per endpoint"""
+        stats: Dict[str, object] = self.policy_counters.snapshot()
+        severity = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+        circuits: Dict[str, str] = {}
+        with self._state_lock:
+            for (name, _, _), breaker in self._breakers.items():
+                if severity[breaker.state] >= severity[circuits.get(name, CircuitBreaker.CLOSED)]:
+                    circuits[name] = breaker.state
+            trackers = dict(self._latency)
+        stats["circuits"] = circuits
+        stats["p95_seconds"] = {name: tracker.percentile(0.95) for name, tracker in trackers.items()}
+        return stats
+
+    def limiter_stats(self) -> Dict[str, Dict[str, float]]:
+        """Admissions, queue-wait times and in-flight counts per endpoint"""
+        return self.limiter.stats()
+
+    def stats(self) -> Dict[str, int]:
+        """Connection pool hit/miss counters"""
+        return self.counters.snapshot()
+
+    def reset_stats(self):
+        self.counters.reset()
+
+    def close(self):
+        self._hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+
+def _capped_timeout(timeout, remaining: float):
+    """A requests timeout (seconds or a (connect, read) tuple) cut to the time left before the deadline"""
+    remaining = max(remaining, 0.001)
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def _past_deadline(deadline: Optional[float], delay: float) -> bool:
+    """Whether a retry after `delay` seconds would start at or after the deadline"""
+    return deadline is not None and time.monotonic() + delay >= deadline
+
+
+def _rewind_files(kwargs: dict):
+    """Seek file-like upload bodies back to the start so a retry resends them whole"""
+    files = kwargs.get("files")
+    if not files:
+        return
+    entries = files.values() if isinstance(files, dict) else (value for _, value in files)
+    for entry in entries:
+        file_obj = entry[1] if isinstance(entry, (tuple, list)) and len(entry) > 1 else entry
+        if hasattr(file_obj, "seek"):
+            file_obj.seek(0)
+
+
+def _release_on_close(response: requests.Response, governor: EndpointGovernor):
+    """Hold a streaming request's rate-limiter slot until its response is closed"""
+    original_close = response.close
+    released = threading.Event()
+
+    def close():
+        try:
+            original_close()
+        finally:
+            if not released.is_set():
+                released.set()
+                governor.release()
+
+    response.close = close
+
+
+def _close_response(future):
+    """Release the connection held by a hedged request that lost the race"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+_transport: Optional[SarvamTransport] = None
+_transport_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def get_transport() -> SarvamTransport:
+    """Return the shared transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = SarvamTransport(
+                    pool_connections=_env_int("HEALHUB_HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS),
+                    pool_maxsize=_env_int("HEALHUB_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE),
+                    limits=limits_from_env(),
+                )
+    return _transport
+
+
+def configure_transport(pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                        timeouts: Optional[Dict[str, float]] = None,
+                        policies: Optional[Dict[str, RequestPolicy]] = None,
+                        limits: Optional[Dict[str, EndpointLimit]] = None) -> SarvamTransport:
+    """Replace the shared transport with one using the given pool size, timeouts, policies and rate limits."""
+    global _transport
+    with _transport_lock:
+        old_transport = _transport
+        _transport = SarvamTransport(pool_connections=pool_connections,
+                                     pool_maxsize=pool_maxsize,
+                                     timeouts=timeouts,
+                                     policies=policies,
+                                     limits=limits)
+    if old_transport is not None:
+        old_transport.close()
+    return _transport
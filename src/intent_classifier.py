@@ -0,0 +1,233 @@
+import argparse
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from src.text_features import HashedNgramVectorizer
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.text_features import HashedNgramVectorizer
+
+DEFAULT_MODEL_PATH = "src/intent_classifier.npz"
+DEFAULT_TRAINING_DATA_PATH = "src/intent_training_data.jsonl"
+DEFAULT_CONFIDENCE_THRESHOLD = 0.85
+
+
+class IntentClassifier:
+    """
+    Multinomial logistic regression over hashed character/word n-grams, in NumPy.
+
+    Small enough (about 100 KB compressed) to ship with the app and fast enough
+    (well under a millisecond per query) to run before every Sarvam-M intent call.
+    Labels are HealthIntent values as strings.
+    """
+
+    def __init__(self, labels: Sequence[str], vectorizer: HashedNgramVectorizer,
+                 weights: np.ndarray, bias: np.ndarray):
+        self.labels = list(labels)
+        self.vectorizer = vectorizer
+        self.weights = weights.astype(np.float32)   # (n_features, n_labels)
+        self.bias = bias.astype(np.float32)         # (n_labels,)
+
+    @classmethod
+    def train(cls, texts: Sequence[str], labels: Sequence[str],
+              vectorizer: Optional[HashedNgramVectorizer] = None,
+              epochs: int = 200, learning_rate: float = 0.05, l2: float = 1e-5,
+              seed: int = 0) -> "IntentClassifier":
+        """Fit softmax regression with full-batch Adam; classes are weighted inversely to their frequency"""
+        vectorizer = vectorizer or HashedNgramVectorizer()
+        label_names = sorted(set(labels))
+        y = np.array([label_names.index(label) for label in labels])
+        X = vectorizer.transform(texts)
+        targets = np.eye(len(label_names), dtype=np.float32)[y]
+        class_counts = np.bincount(y, minlength=len(label_names))
+        sample_weights = (len(y) / (len(label_names) * class_counts[y])).astype(np.float32)[:, None]
+
+        rng = np.random.default_rng(seed)
+        params = [rng.normal(0, 0.01, (X.shape[1], len(label_names))).astype(np.float32),
+                  np.zeros(len(label_names), dtype=np.float32)]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        for step in range(1, epochs + 1):
+            probs = _softmax(X @ params[0] + params[1])
+            error = (probs - targets) * sample_weights / len(y)
+            grads = [X.T @ error + l2 * params[0], error.sum(axis=0)]
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                p -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + eps)
+        return cls(label_names, vectorizer, params[0], params[1])
+
+    def predict_proba(self, texts: Sequence[str]) -> np.ndarray:
+        return _softmax(self.vectorizer.transform(texts) @ self.weights + self.bias)
+
+    def predict_batch(self, texts: Sequence[str]) -> List[Tuple[str, float]]:
+        if not texts:
+            return []
+        probs = self.predict_proba(texts)
+        best = probs.argmax(axis=1)
+        return [(self.labels[index], float(probs[row, index])) for row, index in enumerate(best)]
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """(label, confidence) for one text"""
+        # Sparse path: sum the weight rows of the hashed features instead of a dense matmul
+        indices = self.vectorizer.indices(text)
+        if len(indices) == 0:
+            return self.labels[int(self.bias.argmax())], float(_softmax(self.bias[None, :])[0].max())
+        unique, counts = np.unique(indices, return_counts=True)
+        values = np.log1p(counts.astype(np.float32))
+        values /= np.linalg.norm(values)
+        probs = _softmax((values @ self.weights[unique] + self.bias)[None, :])[0]
+        best = int(probs.argmax())
+        return self.labels[best], float(probs[best])
+
+    def save(self, path: str):
+        np.savez_compressed(path, weights=self.weights.astype(np.float16), bias=self.bias,
+                            labels=np.array(self.labels),
+                            vectorizer=np.array(json.dumps(self.vectorizer.to_dict())))
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(labels=[str(label) for label in data["labels"]],
+                       vectorizer=HashedNgramVectorizer.from_dict(json.loads(str(data["vectorizer"]))),
+                       weights=data["weights"], bias=data["bias"])
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+@dataclass
+class EvaluationReport:
+    """Accuracy overall and on the queries the fast path would take at `threshold`"""
+    threshold: float
+    total: int
+    accuracy: float
+    coverage: float            # Share of queries with confidence >= threshold
+    covered_accuracy: float    # Accuracy (agreement with the labels) on those queries
+    per_label: Dict[str, Dict[str, float]]
+
+    def format(self) -> str:
+        lines = [f"{self.total} queries: accuracy {self.accuracy:.1%}; at threshold {self.threshold:.2f} "
+                 f"the fast path covers {self.coverage:.1%} with {self.covered_accuracy:.1%} agreement"]
+        for label, row in sorted(self.per_label.items()):
+            lines.append(f"  {label:18s} n={int(row['support']):4d}  precision {row['precision']:.1%}  recall {row['recall']:.1%}")
+        return "\n".join(lines)
+
+
+def evaluate(classifier: IntentClassifier, texts: Sequence[str], labels: Sequence[str],
+             threshold: float = DEFAULT_CONFIDENCE_THRESHOLD) -> EvaluationReport:
+    predictions = classifier.predict_batch(texts)
+    correct = np.array([predicted == label for (predicted, _), label in zip(predictions, labels)])
+    covered = np.array([confidence >= threshold for _, confidence in predictions])
+    per_label = {}
+    for label in sorted(set(labels) | set(classifier.labels)):
+        predicted_as = np.array([predicted == label for predicted, _ in predictions])
+        actual = np.array([gold == label for gold in labels])
+        true_positives = int((predicted_as & actual).sum())
+        per_label[label] = {"support": int(actual.sum()),
+                            "precision": true_positives / predicted_as.sum() if predicted_as.any() else 0.0,
+                            "recall": true_positives / actual.sum() if actual.any() else 0.0}
+    return EvaluationReport(
+        threshold=threshold,
+        total=len(labels),
+        accuracy=float(correct.mean()) if len(labels) else 0.0,
+        coverage=float(covered.mean()) if len(labels) else 0.0,
+        covered_accuracy=float(correct[covered].mean()) if covered.any() else 0.0,
+        per_label=per_label,
+    )
+
+
+def load_dataset(path: str) -> Tuple[List[str], List[str]]:
+    """Read a JSONL file of {"text": ..., "intent": ...} records (the format log_labeled_query writes)"""
+    texts, labels = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                texts.append(record["text"])
+                labels.append(record["intent"])
+    return texts, labels
+
+
+_log_lock = threading.Lock()
+
+
+def log_labeled_query(path: str, text: str, intent: str, language: str, confidence: float):
+    """Append a Sarvam-M labelled query to a JSONL training log"""
+    record = {"text": text, "intent": intent, "language": language, "confidence": confidence, "ts": time.time()}
+    try:
+        with _log_lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write intent training log {path}: {e}")
+
+
+def _split(texts: List[str], labels: List[str], holdout: float, seed: int):
+    order = np.random.default_rng(seed).permutation(len(texts))
+    cut = int(len(texts) * (1 - holdout))
+    pick = lambda items, indices: [items[i] for i in indices]
+    return (pick(texts, order[:cut]), pick(labels, order[:cut]),
+            pick(texts, order[cut:]), pick(labels, order[cut:]))
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="Train or evaluate the local intent classifier.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    train_parser = subcommands.add_parser("train", help="Fit a model on labelled queries and save it")
+    train_parser.add_argument("--data", nargs="+", default=[DEFAULT_TRAINING_DATA_PATH],
+                              help="JSONL files of {text, intent} (seed data and/or HEALHUB_INTENT_LOG_PATH logs)")
+    train_parser.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    train_parser.add_argument("--holdout", type=float, default=0.2,
+                              help="Fraction held out for the evaluation report before refitting on everything")
+    train_parser.add_argument("--epochs", type=int, default=200)
+    train_parser.add_argument("--l2", type=float, default=1e-5)
+    train_parser.add_argument("--features", type=int, default=HashedNgramVectorizer.n_features)
+    train_parser.add_argument("--seed", type=int, default=0)
+    train_parser.add_argument("--threshold", type=float, default=DEFAULT_CONFIDENCE_THRESHOLD)
+
+    eval_parser = subcommands.add_parser("evaluate", help="Report accuracy and fast-path coverage of a saved model")
+    eval_parser.add_argument("--data", nargs="+", required=True)
+    eval_parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    eval_parser.add_argument("--threshold", type=float, default=DEFAULT_CONFIDENCE_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    texts, labels = [], []
+    for path in args.data:
+        file_texts, file_labels = load_dataset(path)
+        texts += file_texts
+        labels += file_labels
+
+    if args.command == "evaluate":
+        classifier = IntentClassifier.load(args.model)
+        print(evaluate(classifier, texts, labels, args.threshold).format())
+        return
+
+    vectorizer = HashedNgramVectorizer(n_features=args.features)
+    if args.holdout > 0:
+        train_texts, train_labels, test_texts, test_labels = _split(texts, labels, args.holdout, args.seed)
+        held_out = IntentClassifier.train(train_texts, train_labels, vectorizer, epochs=args.epochs, l2=args.l2, seed=args.seed)
+        print("Held-out evaluation:")
+        print(evaluate(held_out, test_texts, test_labels, args.threshold).format())
+    start = time.perf_counter()
+    classifier = IntentClassifier.train(texts, labels, vectorizer, epochs=args.epochs, l2=args.l2, seed=args.seed)
+    classifier.save(args.out)
+    print(f"✅ Trained on {len(texts)} queries in {time.perf_counter() - start:.1f}s; saved to {args.out} "
+          f"({os.path.getsize(args.out) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import argparse
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from dotenv import load_dotenv
+
+try:
+    from src.knowledge_registry import DEFAULT_KB_LOCALIZATION_PATH, DEFAULT_KB_PATH, kb_fingerprint
+    from src.nlu_processor import SUPPORTED_LANGUAGE_CODES
+    from src.utils import TRANSLATION_MODE, TRANSLATION_MODEL, HealHubUtilities
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.knowledge_registry import DEFAULT_KB_LOCALIZATION_PATH, DEFAULT_KB_PATH, kb_fingerprint
+    from src.nlu_processor import SUPPORTED_LANGUAGE_CODES
+    from src.utils import TRANSLATION_MODE, TRANSLATION_MODEL, HealHubUtilities
+
+# Languages the KB carries aliases for: every supported language except English,
+# whose terms are the KB's own symptom names and keywords
+ALIAS_LANGUAGES = tuple(code for code in SUPPORTED_LANGUAGE_CODES if not code.startswith("en"))
+
+# Sentence lists are written one item per line; keyword lists stay on one line, like the hand-edited KB
+_MULTILINE_KEYS = ("follow_up_questions", "basic_triage_points")
+
+
+def format_kb_json(data: Any, indent: int = 2, _level: int = 0, _key: Optional[str] = None) -> str:
+    """JSON text in the KB's layout: 2-space indent, keyword lists on one line, sentence lists one per line"""
+    pad, inner = " " * (indent * _level), " " * (indent * (_level + 1))
+    if isinstance(data, dict):
+        if not data:
+            return "{}"
+        items = [f"{inner}{json.dumps(key, ensure_ascii=False)}: {format_kb_json(value, indent, _level + 1, key)}"
+                 for key, value in data.items()]
+        return "{\n" + ",\n".join(items) + "\n" + pad + "}"
+    if isinstance(data, list):
+        if not data or (all(isinstance(item, str) for item in data) and _key not in _MULTILINE_KEYS):
+            return json.dumps(data, ensure_ascii=False)
+        return "[\n" + ",\n".join(inner + format_kb_json(item, indent, _level + 1) for item in data) + "\n" + pad + "]"
+    return json.dumps(data, ensure_ascii=False)
+
+
+def load_kb(filepath: str) -> Dict[str, Any]:
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_kb(data: Dict[str, Any], filepath: str):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(format_kb_json(data) + "\n")
+
+
+def _dedupe(terms: Iterable[str], exclude: Iterable[str] = ()) -> List[str]:
+    """Unique non-empty terms in first-seen order, compared case-insensitively"""
+    seen = {term.casefold() for term in exclude}
+    result = []
+    for term in terms:
+        term = " ".join(term.split())
+        if term and term.casefold() not in seen:
+            seen.add(term.casefold())
+            result.append(term)
+    return result
+
+
+def build_keyword_aliases(symptoms: Sequence[Dict[str, Any]], utils: HealHubUtilities,
+                          languages: Sequence[str] = ALIAS_LANGUAGES, transliterate: bool = True,
+                          refresh: bool = False) -> int:
+    """
+    Add `keyword_aliases` ({language code: [terms]}) to each KB symptom, in place.
+
+    The symptom name and English keywords are translated into each language (packed
+    /translate requests through translate_many) and, if `transliterate`, each new
+    native-script alias is also romanized (e.g. "bukhar" for "बुखार") for users who
+    type their language in Latin script. Existing aliases, including hand-curated
+    ones, are kept unless `refresh`. Returns the number of aliases added.
+    """
+    added = 0
+    for language in languages:
+        terms = _dedupe(term for symptom in symptoms
+                        for term in [symptom["symptom_name"]] + list(symptom.get("keywords", [])))
+        translations = dict(zip(terms, utils.translate_many(terms, language)))
+        for symptom in symptoms:
+            aliases = symptom.setdefault("keyword_aliases", {})
+            existing = [] if refresh else list(aliases.get(language, []))
+            english_terms = [symptom["symptom_name"]] + list(symptom.get("keywords", []))
+            new_terms = _dedupe((translations.get(term, "") for term in english_terms), exclude=existing + english_terms)
+            if transliterate:
+                romanized = [utils.transliterate_text(term, language) for term in new_terms]
+                new_terms += _dedupe((term for term in romanized if term), exclude=existing + english_terms + new_terms)
+            aliases[language] = existing + new_terms
+            added += len(new_terms)
+    return added
+
+
+def build_kb_localization(symptoms: Sequence[Dict[str, Any]], utils: HealHubUtilities,
+                          languages: Sequence[str] = ALIAS_LANGUAGES) -> Dict[str, Any]:
+    """
+    Translate every symptom name, follow-up question and triage point into each language.
+
+    Returns {"version": {...}, "languages": {code: {symptom_name.lower(): {field: translation}}}}.
+    The version stamp carries the KB fingerprint, so SymptomChecker ignores a build made
+    for a different KB. A string /translate failed on (returned unchanged) is stored as
+    null and translated live instead.
+    """
+    texts = list(dict.fromkeys(text for symptom in symptoms
+                               for text in [symptom["symptom_name"], *symptom.get("follow_up_questions", []),
+                                            *symptom.get("basic_triage_points", [])]))
+    localized_languages = {}
+    failed = 0
+    for language in languages:
+        translations = dict(zip(texts, utils.translate_many(texts, language)))
+        for text, translation in translations.items():
+            if not translation or translation == text:
+                translations[text] = None
+                failed += 1
+        localized_languages[language] = {
+            symptom["symptom_name"].lower(): {
+                "symptom_name": translations[symptom["symptom_name"]],
+                "follow_up_questions": [translations[text] for text in symptom.get("follow_up_questions", [])],
+                "basic_triage_points": [translations[text] for text in symptom.get("basic_triage_points", [])],
+            }
+            for symptom in symptoms
+        }
+    if failed:
+        print(f"⚠️ {failed} strings were not translated and will be translated live; re-run to fill them in.")
+
+    version = {
+        "kb_fingerprint": kb_fingerprint(symptoms),
+        "built_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "translation_model": TRANSLATION_MODEL,
+        "translation_mode": TRANSLATION_MODE,
+    }
+    return {"version": version, "languages": localized_languages}
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline build steps for the symptom knowledge base.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    aliases_parser = subcommands.add_parser("aliases", help="Translate and transliterate symptom keywords into every supported language")
+    aliases_parser.add_argument("--kb", default=DEFAULT_KB_PATH)
+    aliases_parser.add_argument("--out", help="Output path (default: rewrite --kb in place)")
+    aliases_parser.add_argument("--languages", nargs="+", default=list(ALIAS_LANGUAGES))
+    aliases_parser.add_argument("--refresh", action="store_true", help="Replace existing aliases instead of extending them")
+    aliases_parser.add_argument("--no-transliterate", action="store_true", help="Skip romanized aliases")
+
+    localize_parser = subcommands.add_parser("localize", help="Pre-translate symptom names, follow-up questions and triage points")
+    localize_parser.add_argument("--kb", default=DEFAULT_KB_PATH)
+    localize_parser.add_argument("--out", default=DEFAULT_KB_LOCALIZATION_PATH)
+    localize_parser.add_argument("--languages", nargs="+", default=list(ALIAS_LANGUAGES))
+
+    args = parser.parse_args(argv)
+    load_dotenv()
+    api_key = os.getenv("SARVAM_API_KEY")
+    if not api_key:
+        print("❌ Please set SARVAM_API_KEY environment variable")
+        return
+
+    kb = load_kb(args.kb)
+    utils = HealHubUtilities(api_key=api_key)
+    if args.command == "aliases":
+        added = build_keyword_aliases(kb["symptoms"], utils, args.languages,
+                                      transliterate=not args.no_transliterate, refresh=args.refresh)
+        out = args.out or args.kb
+        write_kb(kb, out)
+        print(f"✅ Added {added} keyword aliases for {len(kb['symptoms'])} symptoms in {len(args.languages)} languages; wrote {out}")
+    elif args.command == "localize":
+        localization = build_kb_localization(kb["symptoms"], utils, args.languages)
+        write_kb(localization, args.out)
+        print(f"✅ Localized {len(kb['symptoms'])} symptoms into {len(args.languages)} languages "
+              f"(KB {localization['version']['kb_fingerprint']}); wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import types
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+try:
+    from src.phrase_matcher import PhraseMatcher
+    from src.safety_matcher import DIAGNOSIS_PATTERNS, SafetyMatcher
+    from src.intent_classifier import DEFAULT_MODEL_PATH, IntentClassifier
+    from src.symptom_index import SymptomIndex
+    from src.semantic_matcher import SemanticSymptomMatcher
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.phrase_matcher import PhraseMatcher
+    from src.safety_matcher import DIAGNOSIS_PATTERNS, SafetyMatcher
+    from src.intent_classifier import DEFAULT_MODEL_PATH, IntentClassifier
+    from src.symptom_index import SymptomIndex
+    from src.semantic_matcher import SemanticSymptomMatcher
+
+DEFAULT_KB_PATH = "src/symptom_knowledge_base.json"
+DEFAULT_KB_LOCALIZATION_PATH = "src/symptom_kb_localized.json"
+DEFAULT_NLU_CONFIG_PATH = "src/nlu_config.json"
+DEFAULT_CHECK_INTERVAL = 2.0  # Seconds between mtime checks of a loaded file
+
+# KB fields translated by the offline localization build (`python src/kb_build.py localize`)
+LOCALIZED_KB_FIELDS = ("symptom_name", "follow_up_questions", "basic_triage_points")
+
+# (st_mtime_ns, st_size, st_ino) of a file, or None if it does not exist
+FileStamp = Optional[Tuple[int, int, int]]
+
+
+def freeze(value: Any) -> Any:
+    """Deep read-only copy of parsed JSON: dicts become MappingProxyType, lists become tuples"""
+    if isinstance(value, dict):
+        return types.MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def file_stamp(filepath: str) -> FileStamp:
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+@dataclass(frozen=True)
+class SymptomKnowledge:
+    """Immutable snapshot of the symptom knowledge base and the indexes built from it"""
+    source: str
+    stamp: FileStamp
+    symptoms: Tuple[Mapping[str, Any], ...]        # KB entries in file order
+    by_name: Mapping[str, Mapping[str, Any]]       # symptom_name.lower() -> entry
+    keyword_matcher: PhraseMatcher                 # Symptom names and keywords -> symptom_name
+    index: SymptomIndex                            # Stemmed name/keyword inverted index -> entry
+    semantic: SemanticSymptomMatcher               # N-gram TF-IDF matrix for paraphrases -> entry
+    error: Optional[str] = None                    # Why the snapshot is empty, if it is
+    fingerprint: str = ""                          # kb_fingerprint() of the symptoms
+
+
+@dataclass(frozen=True)
+class KBLocalization:
+    """Immutable snapshot of the pre-localized KB strings written by `kb_build.py localize`"""
+    source: str
+    stamp: FileStamp
+    version: Mapping[str, Any]                     # Build stamp: kb_fingerprint, built_at, translation model
+    languages: Mapping[str, Mapping[str, Mapping[str, Any]]]  # language code -> symptom_name.lower() -> localized fields
+    error: Optional[str] = None                    # Why the snapshot is empty, if it is
+
+
+@dataclass(frozen=True)
+class NLUConfig:
+    """Immutable snapshot of nlu_config.json and the safety matcher compiled from it"""
+    source: str
+    stamp: FileStamp
+    data: Mapping[str, Any]                        # Whole config file
+    emergency_keywords: Mapping[str, Tuple[str, ...]]
+    safety_matcher: SafetyMatcher
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class IntentModel:
+    """The local intent classifier loaded from its artifact (None if it could not be loaded)"""
+    source: str
+    stamp: FileStamp
+    classifier: Optional[IntentClassifier]
+    error: Optional[str] = None
+
+
+def _read_json(filepath: str) -> Tuple[Any, Optional[str]]:
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f), None
+    except FileNotFoundError:
+        return None, f"file not found at {filepath}"
+    except json.JSONDecodeError as e:
+        return None, f"could not decode JSON from {filepath}: {e}"
+    except OSError as e:
+        return None, f"could not read {filepath}: {e}"
+
+
+def build_kb_keyword_matcher(symptoms: Iterable[Mapping[str, Any]]) -> PhraseMatcher:
+    """
+    Compile every KB symptom name, keyword and native-script keyword alias into one
+    matcher mapping hits to the symptom name. Romanized aliases ("ulti") are left to
+    the whole-word SymptomIndex: as substrings they would fire inside English words.
+    """
+    pairs = []
+    for symptom in symptoms:
+        symptom_name = symptom["symptom_name"]
+        pairs.append((symptom_name, symptom_name))
+        pairs.extend((keyword, symptom_name) for keyword in symptom.get("keywords", ()))
+        for aliases in symptom.get("keyword_aliases", {}).values():
+            pairs.extend((alias, symptom_name) for alias in aliases if not alias.isascii())
+    return PhraseMatcher.from_pairs(pairs)
+
+
+def kb_fingerprint(symptoms: Iterable[Mapping[str, Any]]) -> str:
+    """Hash of the localizable KB strings; a localization build is only used for the KB it was built from"""
+    source = [[symptom.get(field) for field in LOCALIZED_KB_FIELDS] for symptom in symptoms]
+    return hashlib.sha256(json.dumps(source, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def load_symptom_knowledge(filepath: str, stamp: FileStamp = None) -> SymptomKnowledge:
+    """Parse a symptom knowledge base file; an unreadable or malformed file yields an empty snapshot"""
+    data, error = _read_json(filepath)
+    symptoms: Tuple[Mapping[str, Any], ...] = ()
+    if error is None:
+        raw_symptoms = data.get("symptoms") if isinstance(data, dict) else None
+        if not isinstance(raw_symptoms, list):
+            error = f"'symptoms' key not found or not a list in {filepath}"
+        else:
+            symptoms = tuple(freeze(symptom) for symptom in raw_symptoms
+                             if isinstance(symptom, dict) and symptom.get("symptom_name"))
+    if error:
+        print(f"⚠️ Symptom knowledge base: {error}. Keyword matching will be limited.")
+    else:
+        print(f"✅ Symptom knowledge base loaded successfully from {filepath}. {len(symptoms)} symptoms processed.")
+
+    return SymptomKnowledge(
+        source=filepath,
+        stamp=stamp,
+        symptoms=symptoms,
+        by_name=types.MappingProxyType({symptom["symptom_name"].lower(): symptom for symptom in symptoms}),
+        keyword_matcher=build_kb_keyword_matcher(symptoms),
+        index=SymptomIndex(symptoms),
+        semantic=SemanticSymptomMatcher(symptoms, cache_dir=os.getenv("HEALHUB_SEMANTIC_INDEX_DIR") or None),
+        error=error,
+        fingerprint=kb_fingerprint(symptoms),
+    )
+
+
+def load_kb_localization(filepath: str, stamp: FileStamp = None) -> KBLocalization:
+    """Parse a KB localization build; a missing or malformed file yields an empty snapshot (strings are translated live)"""
+    data, error = _read_json(filepath)
+    languages = {}
+    version = {}
+    if error is None:
+        if not isinstance(data, dict) or not isinstance(data.get("languages"), dict):
+            error = f"'languages' key not found or not an object in {filepath}"
+        else:
+            languages = data["languages"]
+            version = data.get("version") or {}
+    if stamp is None and not os.path.exists(filepath):
+        print(f"ℹ️ No pre-localized KB strings at {filepath}; they will be translated live. "
+              f"Build them with: python src/kb_build.py localize")
+    elif error:
+        print(f"⚠️ KB localization: {error}. KB strings will be translated live.")
+    else:
+        print(f"✅ KB localization loaded from {filepath}: {len(languages)} languages, built {version.get('built_at', 'unknown')}.")
+
+    return KBLocalization(
+        source=filepath,
+        stamp=stamp,
+        version=freeze(version),
+        languages=freeze(languages),
+        error=error,
+    )
+
+
+def load_nlu_config(filepath: str, stamp: FileStamp = None) -> NLUConfig:
+    """Parse nlu_config.json and compile its emergency keywords; problems yield an empty keyword set"""
+    data, error = _read_json(filepath)
+    if error is None and not isinstance(data, dict):
+        error = f"unexpected structure in {filepath}"
+    data = freeze(data if error is None else {})
+    emergency_keywords = data.get("keyword_lists", {}).get("emergency_keywords", types.MappingProxyType({}))
+    if error:
+        print(f"⚠️ Keyword config: {error}. Emergency keyword detection will be limited.")
+    elif emergency_keywords:
+        print(f"✅ Emergency keywords loaded successfully from {filepath}.")
+    else:
+        print(f"⚠️ No emergency keywords found in {filepath} or structure is incorrect.")
+    return NLUConfig(
+        source=filepath,
+        stamp=stamp,
+        data=data,
+        emergency_keywords=emergency_keywords,
+        safety_matcher=SafetyMatcher(emergency_keywords, DIAGNOSIS_PATTERNS),
+        error=error,
+    )
+
+
+def load_intent_model(filepath: str, stamp: FileStamp = None) -> IntentModel:
+    """Load the intent classifier artifact; a missing or unreadable file disables the local fast path"""
+    try:
+        classifier = IntentClassifier.load(filepath)
+    except FileNotFoundError:
+        print(f"⚠️ Intent classifier not found at {filepath}. All intents will be classified by Sarvam-M.")
+        return IntentModel(filepath, stamp, None, f"file not found at {filepath}")
+    except Exception as e:
+        print(f"⚠️ Could not load intent classifier from {filepath}: {e}. All intents will be classified by Sarvam-M.")
+        return IntentModel(filepath, stamp, None, str(e))
+    print(f"✅ Intent classifier loaded from {filepath} ({len(classifier.labels)} intents).")
+    return IntentModel(filepath, stamp, classifier)
+
+
+@dataclass(frozen=True)
+class _Entry:
+    snapshot: Any
+    stamp: FileStamp       # Stamp of the file when last parsed (may differ from snapshot.stamp after a failed reload)
+    checked_at: float
+
+
+class KnowledgeRegistry:
+    """
+    Process-wide, thread-safe holder of the parsed knowledge files.
+
+    Each file is parsed once into an immutable snapshot (frozen JSON plus the
+    matchers compiled from it). Readers get the current snapshot without locking;
+    at most every `check_interval` seconds an access re-stats the file and, if its
+    mtime, size or inode changed, a new snapshot is built and swapped in. Each file
+    has its own lock, so building one snapshot (e.g. the semantic matrix of a large
+    KB) only blocks readers of that file. Readers holding the old snapshot keep a
+    consistent view until they ask again, so long-lived consumers ask on each use
+    instead of keeping its matchers. If a changed file fails to parse (e.g. caught
+    mid-edit), the last good snapshot is kept.
+
+    Args:
+        check_interval: Seconds between mtime checks (0 checks on every access)
+        clock: Time source, injectable for tests
+    """
+
+    def __init__(self, check_interval: float = DEFAULT_CHECK_INTERVAL, clock: Callable[[], float] = time.monotonic):
+        self.check_interval = check_interval
+        self.clock = clock
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+        self._key_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()  # Guards _key_locks and the counters
+        self.loads = 0
+        self.reloads = 0
+        self.failed_reloads = 0
+
+    def symptom_kb(self, filepath: str = DEFAULT_KB_PATH) -> SymptomKnowledge:
+        return self._get("symptom_kb", filepath, load_symptom_knowledge)
+
+    def kb_localization(self, filepath: str = DEFAULT_KB_LOCALIZATION_PATH) -> KBLocalization:
+        return self._get("kb_localization", filepath, load_kb_localization)
+
+    def nlu_config(self, filepath: str = DEFAULT_NLU_CONFIG_PATH) -> NLUConfig:
+        return self._get("nlu_config", filepath, load_nlu_config)
+
+    def intent_model(self, filepath: str = DEFAULT_MODEL_PATH) -> IntentModel:
+        return self._get("intent_model", filepath, load_intent_model)
+
+    def _get(self, kind: str, filepath: str, loader: Callable[[str, FileStamp], Any]) -> Any:
+        key = (kind, os.path.abspath(filepath))
+        entry = self._entries.get(key)
+        if entry is not None and self.clock() - entry.checked_at < self.check_interval:
+            return entry.snapshot
+
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            now = self.clock()
+            if entry is not None and now - entry.checked_at < self.check_interval:
+                return entry.snapshot  # Another thread refreshed it while we waited
+            stamp = file_stamp(filepath)
+            if entry is not None and stamp == entry.stamp:
+                self._entries[key] = _Entry(entry.snapshot, stamp, now)
+                return entry.snapshot
+
+            snapshot = loader(filepath, stamp)
+            with self._lock:
+                if entry is None:
+                    self.loads += 1
+                elif snapshot.error and not entry.snapshot.error:
+                    print(f"⚠️ Keeping the previously loaded {kind} from {filepath}.")
+                    self.failed_reloads += 1
+                    snapshot = entry.snapshot
+                else:
+                    self.reloads += 1
+            self._entries[key] = _Entry(snapshot, stamp, now)
+            return snapshot
+
+    def _key_lock(self, key: Tuple[str, str]) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def invalidate(self):
+        """Force the next access to every file to re-check its mtime"""
+        for key in list(self._entries):
+            with self._key_lock(key):
+                entry = self._entries[key]
+                self._entries[key] = _Entry(entry.snapshot, entry.stamp, float("-inf"))
+
+    def stats(self) -> Dict[str, int]:
+        return {"files": len(self._entries), "loads": self.loads,
+                "reloads": self.reloads, "failed_reloads": self.failed_reloads}
+
+
+_registry: Optional[KnowledgeRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_knowledge_registry() -> KnowledgeRegistry:
+    """
+    Return the shared registry, creating it on first use.
+
+    HEALHUB_KB_RELOAD_INTERVAL sets the seconds between mtime checks (default 2).
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                try:
+                    interval = float(os.getenv("HEALHUB_KB_RELOAD_INTERVAL", DEFAULT_CHECK_INTERVAL))
+                except ValueError:
+                    interval = DEFAULT_CHECK_INTERVAL
+                _registry = KnowledgeRegistry(check_interval=interval)
+    return _registry
@@ -0,0 +1,193 @@
+import json
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from src.text_features import HashedNgramVectorizer
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.text_features import HashedNgramVectorizer
+
+DEFAULT_SAMPLES_PATH = "src/language_samples.json"
+DEFAULT_LANGUAGE = "en-IN"
+
+# Scripts counted by the histogram, with the language each one identifies.
+# Devanagari is shared by Hindi and Marathi and Latin by English and romanized
+# Hindi; those are told apart by the n-gram models.
+SCRIPTS = ("Latn", "Deva", "Beng", "Taml", "Telu", "Knda", "Mlym")
+SCRIPT_LANGUAGES = {"Beng": "bn-IN", "Taml": "ta-IN", "Telu": "te-IN", "Knda": "kn-IN", "Mlym": "ml-IN"}
+INDIC_SCRIPTS = SCRIPTS[1:]
+
+# Half-open codepoint ranges -> index into SCRIPTS
+_SCRIPT_RANGES = (
+    (0x0041, 0x005B, 0), (0x0061, 0x007B, 0),  # A-Z, a-z
+    (0x0900, 0x0980, 1),
+    (0x0980, 0x0A00, 2),
+    (0x0B80, 0x0C00, 3),
+    (0x0C00, 0x0C80, 4),
+    (0x0C80, 0x0D00, 5),
+    (0x0D00, 0x0D80, 6),
+)
+_EDGES = np.array(sorted({edge for start, end, _ in _SCRIPT_RANGES for edge in (start, end)}), dtype=np.uint32)
+# Script of each interval between consecutive edges (-1: not counted); the extra last slot is for
+# codepoints before the first edge (searchsorted - 1 == -1 wraps to it)
+_INTERVAL_SCRIPT = np.full(len(_EDGES) + 1, -1, dtype=np.int64)
+for _start, _end, _script in _SCRIPT_RANGES:
+    _INTERVAL_SCRIPT[int(np.searchsorted(_EDGES, _start))] = _script
+
+# Which n-gram model decides between the languages sharing a script
+_SCRIPT_MODELS = {"Deva": ("hi-IN", "mr-IN"), "Latn": ("en-IN", "hi-Latn")}
+
+
+def script_histograms(texts: Sequence[str]) -> np.ndarray:
+    """
+    Letter counts per script (columns in SCRIPTS order) for a batch of texts,
+    computed in one vectorized pass over all their codepoints.
+    """
+    histograms = np.zeros((len(texts), len(SCRIPTS)), dtype=np.int64)
+    if not texts:
+        return histograms
+    codepoints = np.frombuffer("".join(texts).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    if not len(codepoints):
+        return histograms
+    rows = np.repeat(np.arange(len(texts)), [len(text) for text in texts])
+    scripts = _INTERVAL_SCRIPT[np.searchsorted(_EDGES, codepoints, side="right") - 1]
+    counted = scripts >= 0
+    np.add.at(histograms, (rows[counted], scripts[counted]), 1)
+    return histograms
+
+
+class NgramLanguageModel:
+    """Multinomial naive Bayes over hashed character/word n-grams, for two or more close languages"""
+
+    def __init__(self, samples: Dict[str, List[str]], vectorizer: Optional[HashedNgramVectorizer] = None,
+                 smoothing: float = 0.5):
+        self.vectorizer = vectorizer or HashedNgramVectorizer(n_features=2 ** 12, char_ngram_range=(1, 3), word_ngrams=1)
+        self.languages = list(samples)
+        counts = np.zeros((len(self.languages), self.vectorizer.n_features), dtype=np.float64)
+        for row, language in enumerate(self.languages):
+            for text in samples[language]:
+                np.add.at(counts[row], self.vectorizer.indices(text), 1.0)
+        counts += smoothing
+        self.log_probs = np.log(counts / counts.sum(axis=1, keepdims=True))
+
+    def scores(self, text: str) -> np.ndarray:
+        """Log-likelihood of `text` under each language (uniform prior)"""
+        indices = self.vectorizer.indices(text)
+        return self.log_probs[:, indices].sum(axis=1)
+
+    def classify(self, text: str) -> Tuple[str, float]:
+        """(language, margin): margin is the log-likelihood lead over the runner-up"""
+        scores = self.scores(text)
+        order = np.argsort(scores)[::-1]
+        margin = float(scores[order[0]] - scores[order[1]]) if len(order) > 1 else float("inf")
+        return self.languages[int(order[0])], margin
+
+
+@dataclass(frozen=True)
+class LanguageGuess:
+    language: str       # One of the supported language codes
+    script: str         # Dominant script counted for the decision ("none" if no letters)
+    confidence: float   # Share of letters in the deciding script
+    romanized: bool     # Indic language written in Latin script (e.g. Hinglish)
+
+
+class LanguageDetector:
+    """
+    Local language detection for the eight supported languages, without network calls.
+
+    A codepoint histogram picks the script: any Indic letters outweigh Latin ones
+    (code-mixed transcripts usually carry English medical terms inside an Indic
+    sentence), and the most frequent Indic script wins. Bengali, Tamil, Telugu,
+    Kannada and Malayalam map directly to a language. Devanagari is split into
+    Hindi and Marathi, and Latin into English and romanized Hindi, by small n-gram
+    models trained at startup from `samples_path`. Romanized Hindi must beat
+    English by `romanized_margin` (log-likelihood) to win, so short or ambiguous
+    Latin text stays English.
+    """
+
+    def __init__(self, samples_path: str = DEFAULT_SAMPLES_PATH, default_language: str = DEFAULT_LANGUAGE,
+                 romanized_margin: float = 2.0):
+        self.default_language = default_language
+        self.romanized_margin = romanized_margin
+        self.models: Dict[str, NgramLanguageModel] = {}
+        try:
+            with open(samples_path, 'r', encoding='utf-8') as f:
+                samples = json.load(f)
+            for script, languages in _SCRIPT_MODELS.items():
+                self.models[script] = NgramLanguageModel({language: samples[language] for language in languages})
+        except (OSError, KeyError, json.JSONDecodeError) as e:
+            print(f"⚠️ Could not load language samples from {samples_path}: {e}. "
+                  f"Devanagari text will be treated as Hindi and Latin text as English.")
+
+    def detect(self, text: str) -> str:
+        return self.guess(text).language
+
+    def detect_batch(self, texts: Sequence[str]) -> List[str]:
+        return [guess.language for guess in self.guess_batch(texts)]
+
+    def guess(self, text: str) -> LanguageGuess:
+        return self.guess_batch([text])[0]
+
+    def guess_batch(self, texts: Sequence[str]) -> List[LanguageGuess]:
+        histograms = script_histograms(texts)
+        return [self._decide(text, histogram) for text, histogram in zip(texts, histograms)]
+
+    def _decide(self, text: str, histogram: np.ndarray) -> LanguageGuess:
+        letters = int(histogram.sum())
+        if letters == 0:
+            return LanguageGuess(self.default_language, "none", 0.0, False)
+        indic = histogram[1:]
+        if indic.any():
+            script = INDIC_SCRIPTS[int(indic.argmax())]
+            confidence = float(indic.max()) / letters
+            if script in SCRIPT_LANGUAGES:
+                return LanguageGuess(SCRIPT_LANGUAGES[script], script, confidence, False)
+            language, _ = self._classify("Deva", text, fallback="hi-IN")
+            return LanguageGuess(language, script, confidence, False)
+
+        confidence = float(histogram[0]) / letters
+        language, margin = self._classify("Latn", text, fallback=self.default_language)
+        if language == "hi-Latn" and margin >= self.romanized_margin:
+            return LanguageGuess("hi-IN", "Latn", confidence, True)
+        return LanguageGuess(self.default_language, "Latn", confidence, False)
+
+    def _classify(self, script: str, text: str, fallback: str) -> Tuple[str, float]:
+        model = self.models.get(script)
+        return model.classify(text) if model else (fallback, 0.0)
+
+
+_detector: Optional[LanguageDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_language_detector() -> LanguageDetector:
+    """Return the shared detector, building its n-gram models on first use."""
+    global _detector
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                _detector = LanguageDetector()
+    return _detector
+
+
+if __name__ == "__main__":
+    # Benchmark: batch detection throughput on mixed-language transcripts
+    import time
+
+    samples = ["मुझे बुखार है और सिर में दर्द है", "मला ताप आहे आणि डोके दुखत आहे", "What are the symptoms of diabetes?",
+               "mujhe bukhar hai aur sir mein dard hai", "আমার জ্বর হয়েছে", "எனக்கு காய்ச்சல் இருக்கிறது",
+               "నాకు జ్వరం ఉంది", "ನನಗೆ ಜ್ವರ ಇದೆ", "എനിക്ക് പനി ഉണ്ട്", "मुझे chest pain हो रहा है"]
+    detector = get_language_detector()
+    for text, language in zip(samples, detector.detect_batch(samples)):
+        print(f"{language}  {text}")
+    batch = samples * 1000
+    start = time.perf_counter()
+    detector.detect_batch(batch)
+    elapsed = time.perf_counter() - start
+    print(f"{len(batch)} texts in {elapsed * 1000:.0f} ms ({elapsed / len(batch) * 1e6:.1f} µs/text)")
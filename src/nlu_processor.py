@@ -2,12 +2,40 @@ import json
 import time
 import re
 import os
+import asyncio
+import concurrent.futures
+import copy
+import random
+import threading
 import requests
 from dotenv import load_dotenv
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+try:
+    from src.http_transport import get_transport
+    from src.request_policy import LATENCY_CRITICAL_POLICY, RequestPolicy
+    from src.cache import TieredCache, canonical_key, get_completion_cache
+    from src.knowledge_registry import DEFAULT_KB_PATH, DEFAULT_NLU_CONFIG_PATH, get_knowledge_registry
+    from src.intent_classifier import DEFAULT_CONFIDENCE_THRESHOLD, DEFAULT_MODEL_PATH, IntentClassifier, log_labeled_query
+    from src.language_detector import get_language_detector
+    from src.phrase_matcher import PhraseMatcher, SpanIndex, normalize_text
+    from src.safety_matcher import SafetyMatcher
+    from src.structured_output import json_start_chars, parse_json_object, parse_json_stream, validate_against_schema
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.http_transport import get_transport
+    from src.request_policy import LATENCY_CRITICAL_POLICY, RequestPolicy
+    from src.cache import TieredCache, canonical_key, get_completion_cache
+    from src.knowledge_registry import DEFAULT_KB_PATH, DEFAULT_NLU_CONFIG_PATH, get_knowledge_registry
+    from src.intent_classifier import DEFAULT_CONFIDENCE_THRESHOLD, DEFAULT_MODEL_PATH, IntentClassifier, log_labeled_query
+    from src.language_detector import get_language_detector
+    from src.phrase_matcher import PhraseMatcher, SpanIndex, normalize_text
+    from src.safety_matcher import SafetyMatcher
+    from src.structured_output import json_start_chars, parse_json_object, parse_json_stream, validate_against_schema
+
 class HealthIntent(Enum):
     """Healthcare-specific intents"""
     SYMPTOM_QUERY = "symptom_query"
@@ -28,6 +56,7 @@ class MedicalEntity:
     confidence: float
     start_pos: int
     end_pos: int
+    canonical_name: Optional[str] = None  # KB symptom_name, set for knowledge-base keyword matches
 
 @dataclass
 class NLUResult:
@@ -39,17 +68,126 @@ class NLUResult:
     is_emergency: bool
     requires_disclaimer: bool
     language_detected: str
+    short_circuited: bool = False  # True when the emergency fast path answered without any LLM call
+
+DEFAULT_SARVAM_BASE_URL = "https://api.sarvam.ai"
+
+# Language codes the application supports end to end (see HealHubUtilities.LANGUAGE_MAP)
+SUPPORTED_LANGUAGE_CODES = ("en-IN", "hi-IN", "bn-IN", "mr-IN", "kn-IN", "ta-IN", "te-IN", "ml-IN")
+
+# Latency budget for the emergency fast path (keyword match to NLUResult), no network involved
+EMERGENCY_LATENCY_SLO_MS = 50.0
+
+# Intent categories offered to Sarvam-M (single and batch classification prompts)
+INTENT_CATEGORIES = """1. symptom_query - User is describing one or more physical symptoms, feelings of illness, or specific pains (e.g., 'I have a headache and fever', 'my throat hurts').
+2. disease_info - Information about diseases/conditions  
+3. medication_info - Medicine-related queries
+4. wellness_tip - Health and wellness advice
+5. emergency - Urgent medical situations
+6. diagnosis_request - Seeking medical diagnosis
+7. prevention_info - Disease prevention information
+8. general_health - General health questions"""
+
+# NLU modes: "split" makes separate intent and entity calls, "fused" asks for both in one call
+NLU_MODES = ("split", "fused")
+
+# JSON schema for the fused single-call NLU output
+FUSED_NLU_SCHEMA = {
+    "type": "object",
+    "required": ["intent", "confidence", "entities", "language"],
+    "properties": {
+        "intent": {"type": "string", "enum": [i.value for i in HealthIntent if i != HealthIntent.UNKNOWN]},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+        "language": {"type": "string"},
+        "entities": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["text", "type"],
+                "properties": {
+                    "text": {"type": "string"},
+                    "type": {"type": "string"},
+                    "start": {"type": "integer", "minimum": 0},
+                    "end": {"type": "integer", "minimum": 0},
+                    "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+                },
+            },
+        },
+    },
+}
+
+# JSON schemas of the split-mode intent and entity replies
+INTENT_RESPONSE_SCHEMA = {
+    "type": "object",
+    "required": ["intent"],
+    "properties": {
+        "intent": {"type": "string"},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+    },
+}
+ENTITY_RESPONSE_SCHEMA = {
+    "type": "object",
+    "required": ["entities"],
+    "properties": {"entities": FUSED_NLU_SCHEMA["properties"]["entities"]},
+}
+
+# Share of confident local intent predictions also sent to Sarvam-M in the background, to measure
+# the fast path's own agreement (fallback agreement only covers the queries the model was unsure of)
+DEFAULT_INTENT_AUDIT_RATE = 0.02
+
+# Batch intent classification for offline analytics: queries per prompt and prompts in flight
+DEFAULT_INTENT_BATCH_SIZE = 20
+DEFAULT_BATCH_CONCURRENCY = 4
+DEFAULT_BATCH_MAX_ATTEMPTS = 3
+DEFAULT_LOCAL_CHUNK_SIZE = 1024  # Rows per local classifier call: each is a dense (rows, n_features) float32 matrix
+
+# JSON schema for one item of the numbered batch classification output
+BATCH_INTENT_ITEM_SCHEMA = {
+    "type": "object",
+    "required": ["id", "intent", "confidence"],
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "intent": {"type": "string", "enum": [i.value for i in HealthIntent if i != HealthIntent.UNKNOWN]},
+        "confidence": {"type": "number", "minimum": 0, "maximum": 1},
+    },
+}
+BATCH_INTENT_RESPONSE_SCHEMA = {"type": "array", "items": BATCH_INTENT_ITEM_SCHEMA}
+
+@dataclass
+class BatchClassification:
+    """Intents for a batch of queries, in input order, with throughput figures"""
+    results: List[Tuple[HealthIntent, float]]
+    languages: List[str]
+    elapsed_seconds: float
+    local: int = 0           # Answered by the local classifier
+    llm_calls: int = 0       # Sarvam-M prompts sent, retries included
+    retried: int = 0         # Item retries after a missing or invalid answer
+    failed: int = 0          # Still unclassified after the last attempt (UNKNOWN, 0.5)
+
+    @property
+    def queries_per_second(self) -> float:
+        return len(self.results) / self.elapsed_seconds if self.elapsed_seconds > 0 else float("inf")
+
+    def format(self) -> str:
+        return (f"{len(self.results)} queries in {self.elapsed_seconds:.1f}s ({self.queries_per_second:.1f} queries/s): "
+                f"{self.local} local, {self.llm_calls} Sarvam-M calls, {self.retried} item retries, {self.failed} failed")
 
 class SarvamAPIClient:
     """Client for Sarvam AI API services"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[TieredCache] = None,
+                 base_url: Optional[str] = None):
         # Get API key from environment variable if not provided
         self.api_key = api_key or os.getenv("SARVAM_API_KEY")
         if not self.api_key:
             raise ValueError("SARVAM_API_KEY environment variable or api_key parameter is required")
         
-        self.base_url = "https://api.sarvam.ai"
+        # SARVAM_BASE_URL points every client at another deployment (e.g. src/stub_server.py)
+        self.base_url = (base_url or os.getenv("SARVAM_BASE_URL") or DEFAULT_SARVAM_BASE_URL).rstrip("/")
+        # Completion cache shared by every client in the process unless one is injected
+        self.cache = cache if cache is not None else get_completion_cache()
+        # Structured (JSON) completions are streamed and cut off once the JSON closes; HEALHUB_STREAM_STRUCTURED_OUTPUT=0 disables
+        self.stream_structured_output = os.getenv("HEALHUB_STREAM_STRUCTURED_OUTPUT", "1") != "0"
         
     def chat_completion(self, messages: List[Dict], model: str = "sarvam-m", **kwargs) -> Dict:
         """
@@ -59,15 +197,144 @@ class SarvamAPIClient:
             messages: List of message objects with role and content
             model: Model name (default: sarvam-m)
             **kwargs: Additional parameters like temperature, max_tokens, etc.
+                use_cache=False bypasses the completion cache (e.g. when a fresh sample is wanted).
+                policy=RequestPolicy(...) overrides the "chat" retry/circuit/hedging policy for this call.
+                structured=True expects a JSON reply: see _structured_completion.
+                schema={...} is the JSON schema of a structured reply (default: any JSON object). Its top-level
+                type decides whether an object or an array is looked for; replies that fail it are not cached.
+                on_field=callable(key, value) receives its top-level fields as they arrive (structured only).
+        """
+        structured = kwargs.pop("structured", False)
+        schema: Optional[Dict] = kwargs.pop("schema", None)
+        on_field = kwargs.pop("on_field", None)
+        if structured and self.stream_structured_output:
+            return self._structured_completion(messages, model, kwargs, on_field, schema)
+        use_cache = kwargs.pop("use_cache", True)
+        policy: Optional[RequestPolicy] = kwargs.pop("policy", None)
+        url = f"{self.base_url}/v1/chat/completions"
+        headers = self._chat_headers()
+        payload = self._chat_payload(messages, model, kwargs)
+        
+        cache_key = self._chat_cache_key(payload) if use_cache else None
+        if cache_key:
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                return copy.deepcopy(cached_response)
+        
+        try:
+            response = get_transport().post("chat", url, policy=policy, headers=headers, json=payload)
+            response.raise_for_status()
+            response_data = response.json()
+            if cache_key and response_data and response_data.get("choices") and (
+                    not structured or self._valid_structured_reply(response_data["choices"][0]["message"]["content"], schema)):
+                self.cache.set(cache_key, copy.deepcopy(response_data))
+            return response_data
+            
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Sarvam API request failed: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                print(f"Response: {e.response.text}")
+            return {}
+
+    def _structured_completion(self, messages: List[Dict], model: str, kwargs: Dict, on_field=None,
+                               schema: Optional[Dict] = None) -> Dict:
         """
+        Stream a completion whose reply is a JSON object (or an array, if `schema` says
+        so) and stop reading as soon as the top-level value closes, skipping any trailing
+        tokens. Brackets of the other kind in leading prose ("Sure [see below]:") are skipped.
+
+        Returns a chat_completion-shaped response whose content is just the JSON text
+        (code fences and prose removed), or the raw text if it never closed; {} if
+        nothing arrived. Only a reply that parses and matches `schema` is cached.
+        Streamed requests are not hedged by the transport.
+        """
+        use_cache = kwargs.get("use_cache", True)
+        parser = parse_json_stream(self.chat_completion_stream(messages, model, **kwargs), on_field=on_field,
+                                   accept=json_start_chars(schema))
+        if not parser.text:
+            return {}
+        response = {"choices": [{"message": {"role": "assistant", "content": parser.json_text or parser.text}}]}
+        if use_cache and parser.done and self._valid_structured_reply(parser.json_text, schema):
+            payload = self._chat_payload(messages, model, {k: v for k, v in kwargs.items() if k not in ("use_cache", "policy")})
+            self.cache.set(self._chat_cache_key(payload), copy.deepcopy(response))
+        return response
+
+    @staticmethod
+    def _valid_structured_reply(content: str, schema: Optional[Dict] = None) -> bool:
+        """Whether a structured reply parses and matches `schema`, i.e. may be cached"""
+        try:
+            value = parse_json_object(content, accept=json_start_chars(schema))
+        except json.JSONDecodeError:
+            print(f"⚠️ Structured reply is not valid JSON, not caching it: {content[:200]}")
+            return False
+        errors = validate_against_schema(value, schema) if schema else []
+        if errors:
+            print(f"⚠️ Structured reply failed schema validation, not caching it: {errors[:3]}")
+        return not errors
+
+    def chat_completion_stream(self, messages: List[Dict], model: str = "sarvam-m", **kwargs) -> Iterator[str]:
+        """
+        Stream a chat completion as server-sent events, yielding content deltas as they arrive.
+        
+        Takes the same arguments as chat_completion. A cached completion for the same
+        payload is yielded in one piece; a finished stream is stored in the cache.
+        Errors end the stream early (callers decide on a fallback if nothing arrived).
+        """
+        use_cache = kwargs.pop("use_cache", True)
+        policy: Optional[RequestPolicy] = kwargs.pop("policy", None)
         url = f"{self.base_url}/v1/chat/completions"
+        payload = self._chat_payload(messages, model, kwargs)
         
-        headers = {
+        cache_key = self._chat_cache_key(payload) if use_cache else None
+        if cache_key:
+            cached_response = self.cache.get(cache_key)
+            if cached_response is not None:
+                yield cached_response["choices"][0]["message"]["content"]
+                return
+        
+        chunks = []
+        finished = False
+        try:
+            response = get_transport().post("chat", url, policy=policy, headers=self._chat_headers(),
+                                            json=dict(payload, stream=True), stream=True)
+            with response:
+                response.raise_for_status()
+                for raw_line in response.iter_lines():
+                    line = raw_line.decode("utf-8").strip() if raw_line else ""
+                    if not line.startswith("data:"):
+                        continue  # Blank separators, comments and event names
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        finished = True
+                        break
+                    event = json.loads(data)
+                    for choice in event.get("choices", []):
+                        delta = (choice.get("delta") or {}).get("content")
+                        if delta:
+                            chunks.append(delta)
+                            yield delta
+                        if choice.get("finish_reason"):
+                            finished = True
+        except (requests.exceptions.RequestException, json.JSONDecodeError, UnicodeDecodeError) as e:
+            print(f"❌ Sarvam API streaming request failed: {e}")
+            return
+        
+        if cache_key and finished and chunks:
+            self.cache.set(cache_key, {"choices": [{"message": {"role": "assistant", "content": "".join(chunks)}}]})
+
+    def _chat_headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
-        payload = {
+
+    def _chat_cache_key(self, payload: Dict) -> str:
+        """Completion cache key; includes the endpoint so a stub server and the live API never share replies"""
+        return canonical_key("chat_completion", self.base_url, payload)
+
+    @staticmethod
+    def _chat_payload(messages: List[Dict], model: str, kwargs: Dict) -> Dict:
+        return {
             "model": model,
             "messages": messages,
             "temperature": kwargs.get("temperature", 0.7),
@@ -75,97 +342,218 @@ class SarvamAPIClient:
             "max_tokens": kwargs.get("max_tokens", 512),
             "n": kwargs.get("n", 1)
         }
-        
-        try:
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Sarvam API request failed: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"Response: {e.response.text}")
-            return {}
+
+class AsyncSarvamAPIClient:
+    """
+    Asyncio-native facade over SarvamAPIClient.
+
+    Requests run on the default executor over the shared pooled transport, so
+    several completions can be awaited concurrently without blocking the event loop.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, client: Optional[SarvamAPIClient] = None):
+        self.client = client or SarvamAPIClient(api_key)
+        self.api_key = self.client.api_key
+
+    async def chat_completion(self, messages: List[Dict], model: str = "sarvam-m", **kwargs) -> Dict:
+        """Async variant of SarvamAPIClient.chat_completion"""
+        return await asyncio.to_thread(self.client.chat_completion, messages, model, **kwargs)
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run() when no loop is running in this thread (CLI, Streamlit script
+    thread); otherwise runs it on a helper thread so callers inside an event loop
+    don't deadlock.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+# Full NLU for short-circuited emergency queries runs here, off the response path, for logging only
+_BACKGROUND_NLU_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="healhub-background-nlu")
 
 class SarvamMNLUProcessor:
     """NLU processor using Sarvam-M for healthcare queries"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, nlu_mode: Optional[str] = None,
+                 intent_threshold: Optional[float] = None, emergency_short_circuit: bool = True,
+                 background_nlu: Optional[bool] = None, intent_audit_rate: Optional[float] = None):
         self.sarvam_client = SarvamAPIClient(api_key)
-        self.symptom_kb = None  # For storing symptom knowledge base
-        self.emergency_keywords = {} # Initialize as empty dict
+        self.async_client = AsyncSarvamAPIClient(client=self.sarvam_client)
+        # NLU mode switch for A/B comparison: constructor argument, then HEALHUB_NLU_MODE, then "split"
+        self.nlu_mode = (nlu_mode or os.getenv("HEALHUB_NLU_MODE") or "split").lower()
+        if self.nlu_mode not in NLU_MODES:
+            print(f"⚠️ Unknown NLU mode '{self.nlu_mode}', using 'split'.")
+            self.nlu_mode = "split"
+        self.nlu_stats = {"split_runs": 0, "fused_runs": 0, "fused_fallbacks": 0,
+                          "intent_fast_path": 0, "intent_llm_calls": 0, "intent_compared": 0, "intent_agreements": 0,
+                          "intent_audited": 0, "intent_audit_agreements": 0,
+                          "emergency_short_circuits": 0, "emergency_slo_misses": 0,
+                          "batch_queries": 0, "batch_llm_calls": 0, "batch_retried_items": 0}
+        # Emergency fast path, and whether it runs the full NLU in the background (HEALHUB_EMERGENCY_BACKGROUND_NLU=0 disables)
+        self.emergency_short_circuit = emergency_short_circuit
+        if background_nlu is None:
+            background_nlu = os.getenv("HEALHUB_EMERGENCY_BACKGROUND_NLU", "1") != "0"
+        self.background_nlu = background_nlu
+        self.last_background_nlu: Optional[concurrent.futures.Future] = None
+        self.last_intent_audit: Optional[concurrent.futures.Future] = None
+        self._audit_lock = threading.Lock()
+        self._audit_random = random.Random()
+        self.knowledge = get_knowledge_registry()
         self._load_keyword_config() # Load keywords from config file
-        
-        # Diagnosis request patterns
-        self.diagnosis_patterns = [
-            r'\b(what.*wrong|diagnose|what.*disease|what.*illness)\b',
-            r'\b(do i have|am i suffering)\b',
-            r'\b(क्या.*बीमारी|निदान)\b',  # Hindi
-            r'\b(என்ன.*நோய்|கண்டறிதல்)\b',  # Tamil
-        ]
         self._load_symptom_kb() # Load symptom knowledge base
+        self._load_intent_classifier(intent_threshold, intent_audit_rate)
+        self.language_detector = get_language_detector()
 
-    def _load_keyword_config(self, config_filepath="src/nlu_config.json"):
-        """Loads keyword configurations from a JSON file."""
-        try:
-            with open(config_filepath, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-                keyword_lists = config_data.get("keyword_lists", {})
-                self.emergency_keywords = keyword_lists.get("emergency_keywords", {})
-                if self.emergency_keywords:
-                    print(f"✅ Emergency keywords loaded successfully from {config_filepath}.")
-                else:
-                    print(f"⚠️ No emergency keywords found in {config_filepath} or structure is incorrect.")
-                    self.emergency_keywords = {} # Ensure it's an empty dict if not found
-        except FileNotFoundError:
-            print(f"⚠️ Keyword config file not found at {config_filepath}. Emergency keyword detection will be limited.")
-            self.emergency_keywords = {}
-        except json.JSONDecodeError:
-            print(f"⚠️ Error decoding JSON from keyword config file at {config_filepath}. Emergency keyword detection will be limited.")
-            self.emergency_keywords = {}
-        except Exception as e: # Catch any other unexpected errors during loading
-            print(f"❌ An unexpected error occurred while loading keyword config from {config_filepath}: {e}")
-            self.emergency_keywords = {}
-
-    def _load_symptom_kb(self, filepath="src/symptom_knowledge_base.json"):
-        """Loads the symptom knowledge base from a JSON file."""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.symptom_kb = data.get("symptoms", [])
-                print(f"✅ Symptom knowledge base loaded successfully from {filepath}.")
-        except FileNotFoundError:
-            print(f"⚠️ Symptom knowledge base file not found at {filepath}. Keyword matching will be limited.")
-            self.symptom_kb = []
-        except json.JSONDecodeError:
-            print(f"⚠️ Error decoding JSON from symptom knowledge base file at {filepath}. Keyword matching will be limited.")
-            self.symptom_kb = []
+    def _load_keyword_config(self, config_filepath=DEFAULT_NLU_CONFIG_PATH):
+        """Reads the emergency keywords and compiled safety matcher from the shared registry."""
+        self.config_filepath = config_filepath
+        self.knowledge.nlu_config(config_filepath)
+
+    def _load_symptom_kb(self, filepath=DEFAULT_KB_PATH):
+        """Reads the symptom knowledge base and its keyword matcher from the shared registry."""
+        self.symptom_kb_filepath = filepath
+        self.knowledge.symptom_kb(filepath)
+
+    # Registry snapshots are looked up on every use (a dict lookup until the check interval
+    # passes), so a reloaded config, KB or intent model reaches long-lived processors too
+    @property
+    def nlu_config(self) -> Mapping[str, Any]:
+        return self.knowledge.nlu_config(self.config_filepath).data
+
+    @property
+    def emergency_keywords(self) -> Mapping[str, Tuple[str, ...]]:
+        return self.knowledge.nlu_config(self.config_filepath).emergency_keywords
+
+    @property
+    def safety_matcher(self) -> SafetyMatcher:
+        """Emergency keywords and diagnosis patterns compiled once per config snapshot"""
+        return self.knowledge.nlu_config(self.config_filepath).safety_matcher
+
+    @property
+    def diagnosis_patterns(self) -> List[str]:
+        return self.safety_matcher.diagnosis_patterns
+
+    @property
+    def symptom_kb(self) -> Tuple[Mapping[str, Any], ...]:
+        return self.knowledge.symptom_kb(self.symptom_kb_filepath).symptoms
+
+    @property
+    def kb_keyword_matcher(self) -> PhraseMatcher:
+        return self.knowledge.symptom_kb(self.symptom_kb_filepath).keyword_matcher
 
-    def process_transcription(self, transcribed_text: str, source_language: str = "hi-IN") -> NLUResult:
+    @property
+    def intent_classifier(self) -> Optional[IntentClassifier]:
+        model_path = self.nlu_config.get("intent_classifier", {}).get("model_path", DEFAULT_MODEL_PATH)
+        return self.knowledge.intent_model(model_path).classifier if model_path else None
+
+    def _load_intent_classifier(self, threshold: Optional[float] = None, audit_rate: Optional[float] = None):
+        """Local intent classifier, its confidence threshold and audit rate, from the "intent_classifier" config section."""
+        settings = self.nlu_config.get("intent_classifier", {})
+        model_path = settings.get("model_path", DEFAULT_MODEL_PATH)
+        if model_path:
+            self.knowledge.intent_model(model_path)  # Load now rather than on the first query
+        if threshold is None:
+            threshold = settings.get("confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD)
+        self.intent_threshold = float(threshold)
+        # Constructor argument, then HEALHUB_INTENT_AUDIT_RATE, then the config file (0 disables)
+        if audit_rate is None:
+            audit_rate = os.getenv("HEALHUB_INTENT_AUDIT_RATE") or settings.get("audit_rate", DEFAULT_INTENT_AUDIT_RATE)
+        self.intent_audit_rate = min(max(float(audit_rate), 0.0), 1.0)
+        # Optional JSONL log of Sarvam-M labelled queries, used to retrain the local model
+        self.intent_log_path = os.getenv("HEALHUB_INTENT_LOG_PATH")
+
+    def process_transcription(self, transcribed_text: str, source_language: str = "hi-IN",
+                              nlu_mode: Optional[str] = None, short_circuit: bool = True) -> NLUResult:
         """
         Process transcribed text through Sarvam-M for NLU
         
+        Synchronous wrapper around process_transcription_async, kept for callers
+        such as main.py and ui.py that are not running an event loop.
+        
         Args:
             transcribed_text: Text from Saarika v2 STT
             source_language: Source language code
+            nlu_mode: Optional per-call override of the processor's NLU mode
+            short_circuit: Answer emergencies from the local keyword match alone
             
         Returns:
             NLUResult with intent, entities, and safety flags
         """
-        print(f"🧠 Processing NLU for: '{transcribed_text}'")
+        # Checked before starting an event loop: the emergency path should cost microseconds
+        if short_circuit:
+            emergency_result = self._short_circuit_emergency(transcribed_text, source_language, nlu_mode)
+            if emergency_result is not None:
+                return emergency_result
+        return run_sync(self.process_transcription_async(transcribed_text, source_language, nlu_mode,
+                                                         short_circuit=False))
+
+    async def process_transcription_async(self, transcribed_text: str, source_language: str = "hi-IN",
+                                          nlu_mode: Optional[str] = None, short_circuit: bool = True) -> NLUResult:
+        """
+        Process transcribed text through Sarvam-M for NLU, running the independent
+        stages concurrently.
         
-        # Step 1: Safety checks first
-        is_emergency = self._detect_emergency(transcribed_text, source_language)
-        requires_disclaimer = self._requires_medical_disclaimer(transcribed_text)
+        Intent classification, entity extraction and the local safety checks do not
+        depend on each other, so the two LLM round trips overlap and NLU wall time
+        is roughly the slower of the two calls rather than their sum.
         
-        # Step 2: Intent classification using Sarvam-M
-        intent, intent_confidence = self._classify_intent(transcribed_text, source_language)
+        Args:
+            transcribed_text: Text from Saarika v2 STT
+            source_language: Source language code
+            nlu_mode: Optional per-call override of the processor's NLU mode
+            short_circuit: Answer emergencies from the local keyword match alone
+            
+        Returns:
+            NLUResult with intent, entities, and safety flags
+        """
+        if short_circuit:
+            emergency_result = self._short_circuit_emergency(transcribed_text, source_language, nlu_mode)
+            if emergency_result is not None:
+                return emergency_result
+        print(f"🧠 Processing NLU for: '{transcribed_text}'")
+        start_time = time.perf_counter()
+        mode = (nlu_mode or self.nlu_mode).lower()
         
-        # Step 3: Entity extraction
-        entities = self._extract_medical_entities(transcribed_text, source_language)
+        fused_output = None
+        if mode == "fused":
+            self.nlu_stats["fused_runs"] += 1
+            (is_emergency, requires_disclaimer), fused_output = await asyncio.gather(
+                # Step 1: Safety checks (local)
+                asyncio.to_thread(self._run_safety_checks, transcribed_text, source_language),
+                # Steps 2-4: Intent, entities and language in a single Sarvam-M call
+                self._fused_nlu_async(transcribed_text, source_language),
+            )
+            if fused_output is None:
+                print("⚠️ Fused NLU output invalid, falling back to separate intent and entity calls.")
+                self.nlu_stats["fused_fallbacks"] += 1
         
-        # Step 4: Language detection refinement
-        detected_language = self._detect_language(transcribed_text)
+        if fused_output is not None:
+            intent, intent_confidence, entities, detected_language = fused_output
+        else:
+            if mode != "fused":
+                self.nlu_stats["split_runs"] += 1
+                (is_emergency, requires_disclaimer), (intent, intent_confidence), entities = await asyncio.gather(
+                    # Step 1: Safety checks (local)
+                    asyncio.to_thread(self._run_safety_checks, transcribed_text, source_language),
+                    # Step 2: Intent classification using Sarvam-M
+                    self._classify_intent_async(transcribed_text, source_language),
+                    # Step 3: Entity extraction
+                    self._extract_medical_entities_async(transcribed_text, source_language),
+                )
+            else:
+                (intent, intent_confidence), entities = await asyncio.gather(
+                    self._classify_intent_async(transcribed_text, source_language),
+                    self._extract_medical_entities_async(transcribed_text, source_language),
+                )
+            
+            # Step 4: Language detection refinement
+            detected_language = self._detect_language(transcribed_text)
         
         result = NLUResult(
             original_text=transcribed_text,
@@ -177,32 +565,62 @@ class SarvamMNLUProcessor:
             language_detected=detected_language
         )
         
-        print(f"✅ NLU Result - Intent: {intent.value}, Confidence: {intent_confidence:.2%}")
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        print(f"✅ NLU Result - Intent: {intent.value}, Confidence: {intent_confidence:.2%} ({mode} mode, {elapsed_ms:.0f} ms)")
         print(f"🚨 Emergency: {is_emergency}, Disclaimer: {requires_disclaimer}")
         
         return result
     
+    def _short_circuit_emergency(self, text: str, language: str, nlu_mode: Optional[str] = None) -> Optional[NLUResult]:
+        """
+        Early exit for emergencies: when the compiled emergency matcher fires, return an
+        EMERGENCY result at once, skipping intent classification and entity extraction
+        (entities come from the local KB matcher only). The full NLU then runs in the
+        background for logging, so nothing on the response path waits for the network.
+        """
+        if not self.emergency_short_circuit:
+            return None
+        start_time = time.perf_counter()
+        if not self._detect_emergency(text, language):
+            return None
+        result = NLUResult(
+            original_text=text,
+            intent=HealthIntent.EMERGENCY,
+            confidence=1.0,
+            entities=self._augment_with_kb_entities(text, []),
+            is_emergency=True,
+            requires_disclaimer=self._requires_medical_disclaimer(text),
+            language_detected=self._detect_language(text),
+            short_circuited=True
+        )
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        self.nlu_stats["emergency_short_circuits"] += 1
+        print(f"🚨 Emergency detected, skipping LLM calls ({elapsed_ms:.1f} ms)")
+        if elapsed_ms > EMERGENCY_LATENCY_SLO_MS:
+            self.nlu_stats["emergency_slo_misses"] += 1
+            print(f"⚠️ Emergency fast path took {elapsed_ms:.1f} ms (SLO {EMERGENCY_LATENCY_SLO_MS:.0f} ms)")
+        if self.background_nlu:
+            self.last_background_nlu = _BACKGROUND_NLU_EXECUTOR.submit(self._log_background_nlu, text, language, nlu_mode)
+        return result
+
+    def _log_background_nlu(self, text: str, language: str, nlu_mode: Optional[str]) -> Optional[NLUResult]:
+        """Full NLU of a short-circuited emergency query, for the logs only"""
+        try:
+            result = self.process_transcription(text, language, nlu_mode, short_circuit=False)
+            print(f"📝 Background NLU for emergency query - Intent: {result.intent.value}, "
+                  f"Entities: {[entity.text for entity in result.entities]}")
+            return result
+        except Exception as e:
+            print(f"⚠️ Background NLU for emergency query failed: {e}")
+            return None
+
+    def _run_safety_checks(self, text: str, language: str) -> Tuple[bool, bool]:
+        """Local (non-LLM) safety checks: emergency keywords and disclaimer requirement"""
+        return self._detect_emergency(text, language), self._requires_medical_disclaimer(text)
+    
     def _detect_emergency(self, text: str, language: str) -> bool:
-        """Detect emergency situations"""
-        text_lower = text.lower()
-        
-        lang_code = language.split('-')[0] if '-' in language else language
-        
-        # Safely get default English keywords
-        default_emergency_words = self.emergency_keywords.get('en', [])
-        # Get language-specific keywords, falling back to default (English) ones
-        emergency_words = self.emergency_keywords.get(lang_code, default_emergency_words)
-        
-        # If no keywords are available (neither for the specific language nor for English fallback),
-        # then no detection can occur.
-        if not emergency_words:
-            return False
-            
-        for keyword in emergency_words:
-            if keyword.lower() in text_lower: # Ensure keyword itself is also lowercased for comparison
-                return True
-                
-        return False
+        """Detect emergency situations (keywords for the query language plus English)"""
+        return self.safety_matcher.is_emergency(text, language)
     
     def _requires_medical_disclaimer(self, text: str) -> bool:
         """Check if query requires medical disclaimer"""
@@ -211,81 +629,442 @@ class SarvamMNLUProcessor:
         return True
     
     def _classify_intent(self, text: str, language: str) -> Tuple[HealthIntent, float]:
-        """Classify intent using real Sarvam-M API"""
-        
-        messages = [
+        """Synchronous wrapper around _classify_intent_async"""
+        return run_sync(self._classify_intent_async(text, language))
+    
+    async def _classify_intent_async(self, text: str, language: str) -> Tuple[HealthIntent, float]:
+        """Classify intent locally if confident enough, otherwise using real Sarvam-M API"""
+        local = self._classify_intent_locally(text)
+        if local is not None and local[1] >= self.intent_threshold:
+            self._maybe_audit_intent(text, language, local)
+            return local
+        try:
+            print(f"🔄 Calling Sarvam-M for intent classification...")
+            self.nlu_stats["intent_llm_calls"] += 1
+            response = await self.async_client.chat_completion(
+                messages=self._build_intent_messages(text, language),
+                temperature=0.3,
+                max_tokens=100,
+                policy=LATENCY_CRITICAL_POLICY,
+                structured=True,
+                schema=INTENT_RESPONSE_SCHEMA
+            )
+            return self._record_llm_intent(text, language, local, self._parse_intent_response(response, text))
+        except Exception as e:
+            print(f"⚠️ Error in intent classification: {e}")
+            
+        return HealthIntent.UNKNOWN, 0.5
+    
+    def _classify_intent_locally(self, text: str) -> Optional[Tuple[HealthIntent, float]]:
+        """(intent, confidence) from the local classifier, or None if it is unavailable"""
+        classifier = self.intent_classifier
+        if classifier is None:
+            return None
+        try:
+            label, confidence = classifier.predict(text)
+        except Exception as e:
+            print(f"⚠️ Error in local intent classification: {e}")
+            return None
+        intent = self._map_intent(label, text)
+        if confidence >= self.intent_threshold:
+            self.nlu_stats["intent_fast_path"] += 1
+            print(f"⚡ Local intent classifier: {intent.value} ({confidence:.0%}), skipping Sarvam-M")
+        return intent, confidence
+
+    def _record_llm_intent(self, text: str, language: str, local: Optional[Tuple[HealthIntent, float]],
+                           result: Tuple[HealthIntent, float]) -> Tuple[HealthIntent, float]:
+        """Track agreement of the (unconfident) local prediction with Sarvam-M and log the label for retraining"""
+        intent, confidence = result
+        if local is not None and intent != HealthIntent.UNKNOWN:
+            self.nlu_stats["intent_compared"] += 1
+            self.nlu_stats["intent_agreements"] += local[0] == intent
+        if self.intent_log_path and intent != HealthIntent.UNKNOWN:
+            log_labeled_query(self.intent_log_path, text, intent.value, language, confidence)
+        return result
+
+    def _maybe_audit_intent(self, text: str, language: str, local: Tuple[HealthIntent, float]):
+        """Send a sampled fast-path query to Sarvam-M too, off the response path"""
+        if self.intent_audit_rate > 0 and self._audit_random.random() < self.intent_audit_rate:
+            self.last_intent_audit = _BACKGROUND_NLU_EXECUTOR.submit(self._audit_intent, text, language, local)
+
+    def _audit_intent(self, text: str, language: str, local: Tuple[HealthIntent, float]) -> Optional[Tuple[HealthIntent, float]]:
+        """Sarvam-M label for a query the local classifier answered confidently, for the agreement report only"""
+        try:
+            response = self.sarvam_client.chat_completion(
+                messages=self._build_intent_messages(text, language),
+                temperature=0.3,
+                max_tokens=100,
+                structured=True,
+                schema=INTENT_RESPONSE_SCHEMA
+            )
+            intent, confidence = self._parse_intent_response(response, text)
+        except Exception as e:
+            print(f"⚠️ Intent audit call failed: {e}")
+            return None
+        if intent == HealthIntent.UNKNOWN:
+            return None
+        with self._audit_lock:
+            self.nlu_stats["intent_audited"] += 1
+            self.nlu_stats["intent_audit_agreements"] += local[0] == intent
+        if local[0] != intent:
+            print(f"📝 Intent audit: local classifier said {local[0].value} ({local[1]:.0%}), Sarvam-M says {intent.value}")
+        if self.intent_log_path:
+            log_labeled_query(self.intent_log_path, text, intent.value, language, confidence)
+        return intent, confidence
+
+    def intent_fast_path_report(self) -> Dict[str, Optional[float]]:
+        """
+        How often the local classifier answered, and how often it agreed with Sarvam-M: on
+        fallback calls (queries it was unsure of) and, separately, on the sampled confident
+        queries audited in the background (the fast path's own accuracy).
+        """
+        stats = self.nlu_stats
+        classified = stats["intent_fast_path"] + stats["intent_llm_calls"]
+        return {
+            "classified": classified,
+            "fast_path_rate": stats["intent_fast_path"] / classified if classified else None,
+            "compared": stats["intent_compared"],
+            "agreement_rate": stats["intent_agreements"] / stats["intent_compared"] if stats["intent_compared"] else None,
+            "audited": stats["intent_audited"],
+            "audit_agreement_rate": stats["intent_audit_agreements"] / stats["intent_audited"] if stats["intent_audited"] else None,
+        }
+
+    def classify_batch(self, texts: List[str], batch_size: int = DEFAULT_INTENT_BATCH_SIZE,
+                       max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                       max_attempts: int = DEFAULT_BATCH_MAX_ATTEMPTS, use_local: bool = True,
+                       local_chunk_size: int = DEFAULT_LOCAL_CHUNK_SIZE) -> BatchClassification:
+        """Synchronous wrapper around classify_batch_async"""
+        return run_sync(self.classify_batch_async(texts, batch_size, max_concurrency, max_attempts, use_local,
+                                                  local_chunk_size))
+
+    async def classify_batch_async(self, texts: List[str], batch_size: int = DEFAULT_INTENT_BATCH_SIZE,
+                                   max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                                   max_attempts: int = DEFAULT_BATCH_MAX_ATTEMPTS,
+                                   use_local: bool = True,
+                                   local_chunk_size: int = DEFAULT_LOCAL_CHUNK_SIZE) -> BatchClassification:
+        """
+        Classify many queries (e.g. logged conversations) with few Sarvam-M calls.
+
+        Queries the local classifier is confident about are answered locally (in a
+        worker thread, `local_chunk_size` queries per call, so memory stays bounded
+        and the event loop is not blocked); the rest are packed `batch_size` at a time into one numbered prompt whose JSON
+        array output is validated item by item. Items that are missing or invalid
+        are re-sent on their own, up to `max_attempts` times, and then left as
+        (UNKNOWN, 0.5). Up to `max_concurrency` prompts are in flight at once, all
+        admitted by the transport's shared "chat" rate limiter.
+        """
+        start_time = time.perf_counter()
+        classifier = self.intent_classifier if use_local else None
+        languages, local = await asyncio.to_thread(self._pre_classify_batch, texts, classifier, local_chunk_size)
+        results: List[Optional[Tuple[HealthIntent, float]]] = [
+            result if result is not None and result[1] >= self.intent_threshold else None for result in local]
+        report = BatchClassification(results=[], languages=languages, elapsed_seconds=0.0,
+                                     local=sum(result is not None for result in results))
+
+        pending = [index for index, result in enumerate(results) if result is None]
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), max(1, batch_size))]
+        answers = await asyncio.gather(*(self._classify_batch_with_retries(texts, batch, semaphore, max_attempts, report)
+                                         for batch in batches))
+        for answered in answers:
+            for index, result in answered.items():
+                results[index] = self._record_llm_intent(texts[index], languages[index], local[index], result)
+
+        report.failed = sum(result is None for result in results)
+        report.results = [result or (HealthIntent.UNKNOWN, 0.5) for result in results]
+        report.elapsed_seconds = time.perf_counter() - start_time
+        self.nlu_stats["batch_queries"] += len(texts)
+        self.nlu_stats["batch_llm_calls"] += report.llm_calls
+        self.nlu_stats["batch_retried_items"] += report.retried
+        print(f"📦 Batch intent classification: {report.format()}")
+        return report
+
+    def _pre_classify_batch(self, texts: List[str], classifier: Optional[IntentClassifier],
+                            chunk_size: int) -> Tuple[List[str], List[Optional[Tuple[HealthIntent, float]]]]:
+        """Languages and local (intent, confidence) of every text, computed `chunk_size` texts at a time"""
+        chunk_size = max(1, chunk_size)
+        languages: List[str] = []
+        local: List[Optional[Tuple[HealthIntent, float]]] = []
+        for start in range(0, len(texts), chunk_size):
+            chunk = texts[start:start + chunk_size]
+            languages.extend(self.language_detector.detect_batch(chunk))
+            if classifier is None:
+                local.extend([None] * len(chunk))
+                continue
+            local.extend((self._map_intent(label, text), confidence)
+                         for text, (label, confidence) in zip(chunk, classifier.predict_batch(chunk)))
+        return languages, local
+
+    async def _classify_batch_with_retries(self, texts: List[str], indices: List[int], semaphore: asyncio.Semaphore,
+                                           max_attempts: int, report: BatchClassification) -> Dict[int, Tuple[HealthIntent, float]]:
+        """Classify one batch, re-sending only the items without a valid answer; returns {text index: result}"""
+        answered: Dict[int, Tuple[HealthIntent, float]] = {}
+        remaining = indices
+        for attempt in range(1, max(1, max_attempts) + 1):
+            if attempt > 1:
+                report.retried += len(remaining)
+            batch_texts = [texts[index] for index in remaining]
+            report.llm_calls += 1
+            try:
+                async with semaphore:
+                    response = await self.async_client.chat_completion(
+                        messages=self._build_batch_intent_messages(batch_texts),
+                        temperature=0.3,
+                        max_tokens=50 + 40 * len(batch_texts),
+                        # A re-sent identical prompt must not be answered from the completion cache
+                        use_cache=attempt == 1,
+                        structured=True,
+                        schema=BATCH_INTENT_RESPONSE_SCHEMA
+                    )
+                parsed = self._parse_batch_intent_response(response, batch_texts)
+            except Exception as e:
+                print(f"⚠️ Error in batch intent classification: {e}")
+                parsed = {}
+            for position, result in parsed.items():
+                answered[remaining[position]] = result
+            remaining = [index for position, index in enumerate(remaining) if position not in parsed]
+            if not remaining:
+                break
+            if attempt < max_attempts:
+                print(f"🔁 Retrying {len(remaining)} of {len(batch_texts)} batch items (missing or invalid, attempt {attempt}/{max_attempts})")
+        if remaining:
+            print(f"⚠️ Gave up on {len(remaining)} batch items after {max_attempts} attempts")
+        return answered
+
+    def _build_batch_intent_messages(self, texts: List[str]) -> List[Dict]:
+        """Prompt messages classifying several numbered queries at once"""
+        # Queries are JSON-quoted so that quotes and newlines inside a query cannot break the numbering
+        numbered = "\n".join(f"{number}. {json.dumps(text, ensure_ascii=False)}" for number, text in enumerate(texts, 1))
+        return [
+            {
+                "role": "system",
+                "content": f"""You are a healthcare intent classifier for batches of numbered queries. Classify each query into one of these categories:
+
+{INTENT_CATEGORIES}
+
+Respond ONLY with a JSON array holding one object per query, using the query's number as its id:
+[{{"id": 1, "intent": "category_name", "confidence": 0.95}}, {{"id": 2, "intent": "category_name", "confidence": 0.8}}]"""
+            },
+            {
+                "role": "user",
+                "content": f"Classify these {len(texts)} healthcare queries:\n{numbered}"
+            }
+        ]
+
+    def _parse_batch_intent_response(self, response: Dict, texts: List[str]) -> Dict[int, Tuple[HealthIntent, float]]:
+        """
+        {position in `texts`: (intent, confidence)} for every valid item of a batch response.
+
+        Items failing BATCH_INTENT_ITEM_SCHEMA, with an id outside the batch, or repeating
+        an id are skipped, so only they are retried. Raises on a response that is not JSON.
+        """
+        if not response or "choices" not in response:
+            return {}
+        items = parse_json_object(response["choices"][0]["message"]["content"], accept="{[")
+        if isinstance(items, dict):
+            # Tolerate the array being wrapped in an object, e.g. {"results": [...]}
+            items = next((value for value in items.values() if isinstance(value, list)), [])
+        if not isinstance(items, list):
+            return {}
+
+        parsed = {}
+        for item in items:
+            errors = validate_against_schema(item, BATCH_INTENT_ITEM_SCHEMA)
+            position = item["id"] - 1 if not errors else -1
+            if errors or position >= len(texts) or position in parsed:
+                continue
+            parsed[position] = (self._map_intent(item["intent"], texts[position]), item["confidence"])
+        return parsed
+
+    def process_batch(self, texts: List[str], batch_size: int = DEFAULT_INTENT_BATCH_SIZE,
+                      max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                      max_attempts: int = DEFAULT_BATCH_MAX_ATTEMPTS) -> List[NLUResult]:
+        """
+        NLUResults for many historical queries, for analytics.
+
+        Intents come from classify_batch; safety flags, language and symptom entities
+        are computed locally (KB keyword matches only, no per-query entity call).
+        """
+        batch = self.classify_batch(texts, batch_size, max_concurrency, max_attempts)
+        results = []
+        for text, language, (intent, confidence) in zip(texts, batch.languages, batch.results):
+            is_emergency, requires_disclaimer = self._run_safety_checks(text, language)
+            results.append(NLUResult(
+                original_text=text,
+                intent=intent,
+                confidence=confidence,
+                entities=self._augment_with_kb_entities(text, []),
+                is_emergency=is_emergency,
+                requires_disclaimer=requires_disclaimer,
+                language_detected=language
+            ))
+        return results
+
+    def _build_intent_messages(self, text: str, language: str) -> List[Dict]:
+        """Prompt messages for intent classification"""
+        return [
             {
                 "role": "system",
-                "content": """You are a healthcare intent classifier. Classify user queries into these categories:
+                "content": f"""You are a healthcare intent classifier. Classify user queries into these categories:
                 
-1. symptom_query - User is describing one or more physical symptoms, feelings of illness, or specific pains (e.g., 'I have a headache and fever', 'my throat hurts').
-2. disease_info - Information about diseases/conditions  
-3. medication_info - Medicine-related queries
-4. wellness_tip - Health and wellness advice
-5. emergency - Urgent medical situations
-6. diagnosis_request - Seeking medical diagnosis
-7. prevention_info - Disease prevention information
-8. general_health - General health questions
+{INTENT_CATEGORIES}
 
-Respond ONLY with JSON format: {"intent": "category_name", "confidence": 0.95}"""
+Respond ONLY with JSON format: {{"intent": "category_name", "confidence": 0.95}}"""
             },
             {
                 "role": "user", 
                 "content": f"Classify this healthcare query: '{text}'\nLanguage: {language}"
             }
         ]
+    
+    def _parse_intent_response(self, response: Dict, text: str) -> Tuple[HealthIntent, float]:
+        """Map a chat completion response to (intent, confidence). Raises on malformed JSON."""
+        if response and "choices" in response:
+            # The first JSON object in the reply, ignoring code fences and surrounding prose
+            result = parse_json_object(response["choices"][0]["message"]["content"])
+            
+            intent_str = result.get("intent", "unknown")
+            confidence = result.get("confidence", 0.5)
+            
+            return self._map_intent(intent_str, text), confidence
+        
+        return HealthIntent.UNKNOWN, 0.5
+    
+    def _map_intent(self, intent_str: str, text: str) -> HealthIntent:
+        """Map an LLM intent label to HealthIntent, applying the diagnosis-pattern backup check"""
+        intent_mapping = {
+            "symptom_query": HealthIntent.SYMPTOM_QUERY,
+            "disease_info": HealthIntent.DISEASE_INFO,
+            "medication_info": HealthIntent.MEDICATION_INFO,
+            "wellness_tip": HealthIntent.WELLNESS_TIP,
+            "emergency": HealthIntent.EMERGENCY,
+            "diagnosis_request": HealthIntent.DIAGNOSIS_REQUEST,
+            "prevention_info": HealthIntent.PREVENTION_INFO,
+            "general_health": HealthIntent.GENERAL_HEALTH,
+        }
         
+        intent = intent_mapping.get(intent_str, HealthIntent.UNKNOWN)
+        
+        # Check for diagnosis request patterns as backup
+        if self._is_diagnosis_request(text):
+            intent = HealthIntent.DIAGNOSIS_REQUEST
+            
+        return intent
+    
+    async def _fused_nlu_async(self, text: str, language: str) -> Optional[Tuple[HealthIntent, float, List[MedicalEntity], str]]:
+        """
+        Intent, entities and language from a single Sarvam-M call.
+        
+        Returns (intent, confidence, entities, language) or None if the response is
+        missing, not JSON, or does not match FUSED_NLU_SCHEMA.
+        """
         try:
-            print(f"🔄 Calling Sarvam-M for intent classification...")
-            response = self.sarvam_client.chat_completion(
-                messages=messages,
-                temperature=0.3,
-                max_tokens=100
+            print(f"🔄 Calling Sarvam-M for fused NLU (intent + entities + language)...")
+            response = await self.async_client.chat_completion(
+                messages=self._build_fused_messages(text, language),
+                temperature=0.1,
+                max_tokens=300,
+                policy=LATENCY_CRITICAL_POLICY,
+                structured=True,
+                schema=FUSED_NLU_SCHEMA
             )
-            
-            if response and "choices" in response:
-                content = response["choices"][0]["message"]["content"]
-                # Clean the response to extract JSON
-                content = content.strip()
-                if '```json' in content:
-                    content = content.split('```json')[1].split('```')[0].strip()
-                elif '```' in content:
-                    content = content.split('```')[1].strip()
-                
-                result = json.loads(content)
-                
-                intent_str = result.get("intent", "unknown")
-                confidence = result.get("confidence", 0.5)
-                
-                # Map to enum
-                intent_mapping = {
-                    "symptom_query": HealthIntent.SYMPTOM_QUERY,
-                    "disease_info": HealthIntent.DISEASE_INFO,
-                    "medication_info": HealthIntent.MEDICATION_INFO,
-                    "wellness_tip": HealthIntent.WELLNESS_TIP,
-                    "emergency": HealthIntent.EMERGENCY,
-                    "diagnosis_request": HealthIntent.DIAGNOSIS_REQUEST,
-                    "prevention_info": HealthIntent.PREVENTION_INFO,
-                    "general_health": HealthIntent.GENERAL_HEALTH,
-                }
-                
-                intent = intent_mapping.get(intent_str, HealthIntent.UNKNOWN)
-                
-                # Check for diagnosis request patterns as backup
-                if self._is_diagnosis_request(text):
-                    intent = HealthIntent.DIAGNOSIS_REQUEST
-                    
-                return intent, confidence
-                
+            return self._parse_fused_response(response, text)
         except Exception as e:
-            print(f"⚠️ Error in intent classification: {e}")
-            
-        return HealthIntent.UNKNOWN, 0.5
+            print(f"⚠️ Error in fused NLU: {e}")
+        return None
+    
+    def _build_fused_messages(self, text: str, language: str) -> List[Dict]:
+        """Prompt messages for fused intent + entity + language extraction"""
+        return [
+            {
+                "role": "system",
+                "content": """You are a healthcare query analyzer. For the user's query, return the intent, the medical entities and the language in ONE JSON object.
+
+intent - one of:
+- symptom_query: User is describing one or more physical symptoms, feelings of illness, or specific pains
+- disease_info: Information about diseases/conditions
+- medication_info: Medicine-related queries
+- wellness_tip: Health and wellness advice
+- emergency: Urgent medical situations
+- diagnosis_request: Seeking medical diagnosis
+- prevention_info: Disease prevention information
+- general_health: General health questions
+
+entities - each with "text" (exact substring of the query), "type" (symptom, disease, medication, body_part or medical_term), "start" and "end" character offsets, and "confidence".
+
+language - BCP-47 code of the query language, one of: en-IN, hi-IN, bn-IN, mr-IN, kn-IN, ta-IN, te-IN, ml-IN.
+
+Respond ONLY with JSON format:
+{"intent": "symptom_query", "confidence": 0.95, "entities": [{"text": "fever", "type": "symptom", "start": 7, "end": 12, "confidence": 0.95}], "language": "en-IN"}"""
+            },
+            {
+                "role": "user",
+                "content": f"Analyze this healthcare query: '{text}'\nLanguage hint: {language}"
+            }
+        ]
+    
+    def _parse_fused_response(self, response: Dict, text: str) -> Optional[Tuple[HealthIntent, float, List[MedicalEntity], str]]:
+        """Validate and map a fused NLU response. Returns None on any schema violation."""
+        if not response or "choices" not in response:
+            return None
+        
+        content = response["choices"][0]["message"]["content"]
+        try:
+            result = parse_json_object(content)
+        except json.JSONDecodeError:
+            print(f"⚠️ Fused NLU response is not valid JSON: {content[:200]}")
+            return None
+        
+        errors = validate_against_schema(result, FUSED_NLU_SCHEMA)
+        if errors:
+            print(f"⚠️ Fused NLU response failed schema validation: {errors[:3]}")
+            return None
+        
+        entities = [
+            MedicalEntity(
+                text=entity_data["text"],
+                entity_type=entity_data["type"],
+                confidence=entity_data.get("confidence", 0.5),
+                start_pos=entity_data.get("start", 0),
+                end_pos=entity_data.get("end", 0)
+            )
+            for entity_data in result["entities"]
+        ]
+        entities = self._augment_with_kb_entities(text, entities)
+        
+        language = result["language"]
+        if language not in SUPPORTED_LANGUAGE_CODES:
+            language = self._detect_language(text)
+        
+        return self._map_intent(result["intent"], text), float(result["confidence"]), entities, language
     
     def _extract_medical_entities(self, text: str, language: str) -> List[MedicalEntity]:
+        """Synchronous wrapper around _extract_medical_entities_async"""
+        return run_sync(self._extract_medical_entities_async(text, language))
+    
+    async def _extract_medical_entities_async(self, text: str, language: str) -> List[MedicalEntity]:
         """Extract medical entities using real Sarvam-M API"""
+        entities = []
         
-        messages = [
+        try:
+            print(f"🔄 Calling Sarvam-M for entity extraction...")
+            response = await self.async_client.chat_completion(
+                messages=self._build_entity_messages(text, language),
+                temperature=0.1,
+                max_tokens=200,
+                policy=LATENCY_CRITICAL_POLICY,
+                structured=True,
+                schema=ENTITY_RESPONSE_SCHEMA
+            )
+            entities = self._parse_entity_response(response)
+        except Exception as e:
+            print(f"⚠️ Error in entity extraction: {e}")
+
+        return self._augment_with_kb_entities(text, entities)
+    
+    def _build_entity_messages(self, text: str, language: str) -> List[Dict]:
+        """Prompt messages for medical entity extraction"""
+        return [
             {
                 "role": "system",
                 "content": """You are a medical entity extractor. Extract these entity types from healthcare queries:
@@ -304,76 +1083,51 @@ Respond ONLY with JSON format:
                 "content": f"Extract medical entities from: '{text}'\nLanguage: {language}"
             }
         ]
-        
+    
+    def _parse_entity_response(self, response: Dict) -> List[MedicalEntity]:
+        """Map a chat completion response to MedicalEntity objects. Raises on malformed JSON."""
         entities = []
         
-        try:
-            print(f"🔄 Calling Sarvam-M for entity extraction...")
-            response = self.sarvam_client.chat_completion(
-                messages=messages,
-                temperature=0.1,
-                max_tokens=200
-            )
+        if response and "choices" in response:
+            # The first JSON object in the reply, ignoring code fences and surrounding prose
+            result = parse_json_object(response["choices"][0]["message"]["content"])
             
-            if response and "choices" in response:
-                content = response["choices"][0]["message"]["content"]
-                # Clean the response to extract JSON
-                content = content.strip()
-                if '```json' in content:
-                    content = content.split('```json')[1].split('```')[0].strip()
-                elif '```' in content:
-                    content = content.split('```')[1].strip()
-                
-                result = json.loads(content)
-                
-                entity_list = result.get("entities", [])
-                
-                for entity_data in entity_list:
-                    entity = MedicalEntity(
-                        text=entity_data.get("text", ""),
-                        entity_type=entity_data.get("type", "unknown"),
-                        confidence=entity_data.get("confidence", 0.5),
-                        start_pos=entity_data.get("start", 0),
-                        end_pos=entity_data.get("end", 0)
-                    )
-                    entities.append(entity)
-                    
-        except Exception as e:
-            print(f"⚠️ Error in entity extraction: {e}")
+            entity_list = result.get("entities", [])
+            
+            for entity_data in entity_list:
+                entity = MedicalEntity(
+                    text=entity_data.get("text", ""),
+                    entity_type=entity_data.get("type", "unknown"),
+                    confidence=entity_data.get("confidence", 0.5),
+                    start_pos=entity_data.get("start", 0),
+                    end_pos=entity_data.get("end", 0)
+                )
+                entities.append(entity)
+        
+        return entities
+    
+    def _augment_with_kb_entities(self, text: str, entities: List[MedicalEntity]) -> List[MedicalEntity]:
+        """Augment LLM entities with keyword matches from the symptom knowledge base"""
+        kb = self.knowledge.symptom_kb(self.symptom_kb_filepath)
+        if kb.symptoms:
+            llm_symptoms = [entity for entity in entities if entity.entity_type == "symptom"]
+            covered_spans = SpanIndex((entity.start_pos, entity.end_pos) for entity in llm_symptoms)
+            # A keyword is also covered if an LLM symptom's text contains it (partial spans from the LLM)
+            covered_texts = "\x00".join(normalize_text(entity.text) for entity in llm_symptoms)
 
-        # Augment with keyword matching from symptom knowledge base
-        if self.symptom_kb:
             augmented_count = 0
-            text_lower = text.lower()
-            for symptom_data in self.symptom_kb:
-                keywords_to_check = [symptom_data["symptom_name"].lower()] + [kw.lower() for kw in symptom_data.get("keywords", [])]
-
-                for keyword in keywords_to_check:
-                    for match in re.finditer(re.escape(keyword), text_lower):
-                        start_pos, end_pos = match.span()
-
-                        # Check for overlap with existing LLM-found entities
-                        is_covered = False
-                        for existing_entity in entities:
-                            if existing_entity.entity_type == "symptom":
-                                # Simple overlap check: if keyword is within an existing symptom entity's text span
-                                if max(start_pos, existing_entity.start_pos) < min(end_pos, existing_entity.end_pos):
-                                    is_covered = True
-                                    break
-                                # Check if the existing entity text contains the keyword (more robust for partial matches by LLM)
-                                if keyword in existing_entity.text.lower():
-                                    is_covered = True
-                                    break
-
-                        if not is_covered:
-                            entities.append(MedicalEntity(
-                                text=text[start_pos:end_pos], # Use original casing from text
-                                entity_type="symptom",
-                                confidence=0.75, # Default confidence for keyword match
-                                start_pos=start_pos,
-                                end_pos=end_pos
-                            ))
-                            augmented_count += 1
+            for match in kb.keyword_matcher.find_all(text):
+                if covered_spans.overlaps(match.start, match.end) or match.phrase in covered_texts:
+                    continue
+                entities.append(MedicalEntity(
+                    text=match.text, # Use original casing from text
+                    entity_type="symptom",
+                    confidence=0.75, # Default confidence for keyword match
+                    start_pos=match.start,
+                    end_pos=match.end,
+                    canonical_name=match.payloads[0]
+                ))
+                augmented_count += 1
             if augmented_count > 0:
                 print(f"ℹ️ Augmented entities with {augmented_count} symptoms from keyword matching.")
             
@@ -381,31 +1135,11 @@ Respond ONLY with JSON format:
     
     def _is_diagnosis_request(self, text: str) -> bool:
         """Check if text contains diagnosis request patterns"""
-        text_lower = text.lower()
-        
-        for pattern in self.diagnosis_patterns:
-            if re.search(pattern, text_lower, re.IGNORECASE):
-                return True
-                
-        return False
+        return self.safety_matcher.is_diagnosis_request(text)
     
     def _detect_language(self, text: str) -> str:
-        """Detect language of the text"""
-        # Simplified language detection
-        # In practice, use Sarvam-M's language detection capabilities
-        
-        hindi_chars = bool(re.search(r'[\u0900-\u097F]', text))
-        tamil_chars = bool(re.search(r'[\u0B80-\u0BFF]', text))
-        telugu_chars = bool(re.search(r'[\u0C00-\u0C7F]', text))
-        
-        if hindi_chars:
-            return "hi-IN"
-        elif tamil_chars:
-            return "ta-IN"
-        elif telugu_chars:
-            return "te-IN"
-        else:
-            return "en-IN"
+        """Detect language of the text locally (script histogram plus n-gram models, no API call)"""
+        return self.language_detector.detect(text)
             
 # Integration with audio capture
 def integrate_stt_nlu_pipeline():
@@ -0,0 +1,191 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+
+@dataclass(frozen=True)
+class PhraseMatch:
+    """One phrase occurrence; start/end index the original (un-normalized) text"""
+    phrase: str              # Normalized phrase that matched
+    start: int
+    end: int
+    text: str                # Matched span of the original text
+    payloads: Tuple[Any, ...]  # Values registered for the phrase
+
+
+class NormalizedText(NamedTuple):
+    """Normalized form of a text; normalized[i] came from original[starts[i]:ends[i]]"""
+    normalized: str
+    starts: Optional[List[int]]  # None when the mapping is the identity
+    ends: Optional[List[int]]
+
+    def span(self, start: int, end: int) -> Tuple[int, int]:
+        """Map a [start, end) span of the normalized text back to the original"""
+        if self.starts is None:
+            return start, end
+        return self.starts[start], self.ends[end - 1]
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize and casefold, the canonical form phrases and texts are matched in"""
+    return unicodedata.normalize("NFC", text).casefold()
+
+
+def _composes(previous: str, char: str) -> bool:
+    """True if NFC would merge `char` into the preceding character"""
+    return unicodedata.normalize("NFC", previous + char) != (
+        unicodedata.normalize("NFC", previous) + unicodedata.normalize("NFC", char))
+
+
+def normalize_with_offsets(text: str) -> NormalizedText:
+    """
+    Normalize `text` and map every normalized character back to the original.
+
+    starts/ends of the result are None when the mapping is the identity,
+    which is the common case (input already NFC, casefold keeps length) and costs a
+    single C-level pass.
+    """
+    # ASCII is always NFC; otherwise normalize and compare (cheaper than is_normalized for Indic text)
+    if text.isascii() or unicodedata.normalize("NFC", text) == text:
+        folded = text.casefold()
+        if len(folded) == len(text):
+            return NormalizedText(folded, None, None)
+        segments = [(i, i + 1) for i in range(len(text))]
+    else:
+        # Split into runs NFC can normalize independently: a new run starts at a
+        # starter that does not compose with the previous character.
+        segments, start = [], 0
+        for i in range(1, len(text) + 1):
+            if i == len(text) or (unicodedata.combining(text[i]) == 0 and not _composes(text[i - 1], text[i])):
+                segments.append((start, i))
+                start = i
+
+    normalized_parts, starts, ends = [], [], []
+    for start, end in segments:
+        part = unicodedata.normalize("NFC", text[start:end]).casefold()
+        normalized_parts.append(part)
+        starts.extend([start] * len(part))
+        ends.extend([end] * len(part))
+    return NormalizedText("".join(normalized_parts), starts, ends)
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Regex for a set of literal phrases, factored as a trie so the engine walks
+    shared prefixes once. Optional suffixes are greedy, so the longest phrase
+    starting at a position wins.
+    """
+    trie: Dict[str, dict] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> Optional[str]:
+        if "" in node and len(node) == 1:
+            return None
+        branches, leaf_chars = [], []
+        for char in sorted(key for key in node if key):
+            child = build(node[char])
+            if child is None:
+                leaf_chars.append(re.escape(char))
+            else:
+                branches.append(re.escape(char) + child)
+        if leaf_chars:
+            branches.append(leaf_chars[0] if len(leaf_chars) == 1 else "[" + "".join(leaf_chars) + "]")
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            pattern = "(?:" + pattern + ")?"
+        return pattern
+
+    return build(trie) or ""
+
+
+class PhraseMatcher:
+    """
+    Finds many literal phrases in one regex pass.
+
+    Phrases and input are compared after NFC normalization and casefolding; hits are
+    reported with offsets into the original text. Matches are non-overlapping,
+    scanning left to right and preferring the longest phrase at each position.
+
+    Args:
+        phrases: Phrases to find, or a mapping of phrase -> payload (e.g. keyword -> symptom)
+        word_boundaries: Only match phrases that are not inside a longer word
+    """
+
+    def __init__(self, phrases: Union[Iterable[str], Mapping[str, Any]], word_boundaries: bool = False):
+        items = phrases.items() if isinstance(phrases, Mapping) else ((phrase, phrase) for phrase in phrases)
+        self._compile(items, word_boundaries)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[str, Any]], word_boundaries: bool = False) -> "PhraseMatcher":
+        """Build from (phrase, payload) pairs; a phrase listed several times keeps every payload"""
+        matcher = cls.__new__(cls)
+        matcher._compile(pairs, word_boundaries)
+        return matcher
+
+    def _compile(self, items: Iterable[Tuple[str, Any]], word_boundaries: bool):
+        self.payloads: Dict[str, Tuple[Any, ...]] = {}
+        for phrase, payload in items:
+            key = normalize_text(phrase.strip())
+            if key:
+                self.payloads[key] = self.payloads.get(key, ()) + (payload,)
+        self.word_boundaries = word_boundaries
+
+        pattern = _trie_pattern(self.payloads)
+        if word_boundaries:
+            pattern = r"(?<!\w)(?:" + pattern + r")(?!\w)"
+        self._regex = re.compile(pattern) if self.payloads else None
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+    def find_all(self, text: str, normalized: Optional[NormalizedText] = None) -> List[PhraseMatch]:
+        """
+        All non-overlapping matches in `text`. Pass `normalized` (from
+        normalize_with_offsets) to reuse a normalization across matchers.
+        """
+        if self._regex is None or not text:
+            return []
+        normalized = normalized or normalize_with_offsets(text)
+        return [self._to_match(text, normalized, match) for match in self._regex.finditer(normalized.normalized)]
+
+    def search(self, text: str, normalized: Optional[NormalizedText] = None) -> Optional[PhraseMatch]:
+        """First match, stopping the scan as soon as one is found"""
+        if self._regex is None or not text:
+            return None
+        normalized = normalized or normalize_with_offsets(text)
+        match = self._regex.search(normalized.normalized)
+        return self._to_match(text, normalized, match) if match else None
+
+    def _to_match(self, text: str, normalized: NormalizedText, match: "re.Match") -> PhraseMatch:
+        start, end = normalized.span(*match.span())
+        phrase = match.group(0)
+        return PhraseMatch(phrase, start, end, text[start:end], self.payloads[phrase])
+
+
+class SpanIndex:
+    """
+    Static set of [start, end) spans answering "does this span overlap any of them?"
+    with a binary search: spans sorted by start plus a running maximum of ends.
+    """
+
+    def __init__(self, spans: Iterable[Tuple[int, int]]):
+        ordered = sorted(spans)
+        self._starts = [start for start, _ in ordered]
+        self._max_ends: List[int] = []
+        running_max = -1
+        for _, end in ordered:
+            running_max = max(running_max, end)
+            self._max_ends.append(running_max)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        candidates = bisect_left(self._starts, end)  # Spans starting before `end`
+        return candidates > 0 and self._max_ends[candidates - 1] > start
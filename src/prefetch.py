@@ -0,0 +1,181 @@
+import concurrent.futures
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from src.symptom_checker import SymptomChecker
+    from src.utils import HealHubUtilities
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.symptom_checker import SymptomChecker
+    from src.utils import HealHubUtilities
+
+# Section labels of the assessment message, translated with the assessment strings
+ASSESSMENT_LABELS = (
+    'Preliminary Health Assessment', 'Summary', 'Suggested Severity', 'Recommended Next Steps',
+    'Potential Warnings', 'Relevant Triage Points from Knowledge Base', 'Disclaimer',
+)
+
+# Shared by every session; prefetch jobs are short (one /translate batch or one Sarvam-M call)
+_PREFETCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="healhub-prefetch")
+
+
+def assessment_display_parts(assessment: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The strings the assessment message is built from, and the ones that need translating.
+
+    Returns summary, severity, next_steps (as returned by the LLM), step_texts, warnings,
+    kb_points, localized_kb_points ({English point: pre-localized point}), disclaimer and
+    texts_to_translate (labels first, then every assessment string without a localization).
+    """
+    summary = assessment.get('assessment_summary', 'N/A')
+    severity = assessment.get('suggested_severity', 'N/A')
+    next_steps = assessment.get('recommended_next_steps', 'N/A')
+    if isinstance(next_steps, list):
+        step_texts = list(next_steps)
+    elif isinstance(next_steps, str):
+        # Split on punctuation marks (., !, ?) followed by whitespace
+        sentences = re.split(r'(?<=[.!?])\s+', next_steps.strip())
+        # Add bullet to each sentence
+        temp_steps = '\n- '.join(sentences).strip()
+        # remove leading bullet if present (e.g. if next_steps started with punctuation)
+        temp_steps = temp_steps.lstrip('- ')
+        step_texts = [temp_steps]
+    else:
+        step_texts = ['N/A']
+    warnings = assessment.get('potential_warnings')
+    warnings = warnings if warnings and isinstance(warnings, list) else []
+    kb_points = assessment.get('relevant_kb_triage_points')
+    kb_points = kb_points if kb_points and isinstance(kb_points, list) else []
+    localized_kb_points = dict(zip(kb_points, assessment.get('localized_kb_triage_points') or []))
+    disclaimer = assessment.get('disclaimer', 'Always consult a doctor for medical advice.')
+    texts_to_translate = [
+        *ASSESSMENT_LABELS, summary, severity, *step_texts, *warnings,
+        *[point for point in kb_points if not localized_kb_points.get(point)], disclaimer,
+    ]
+    return {
+        "summary": summary, "severity": severity, "next_steps": next_steps, "step_texts": step_texts,
+        "warnings": warnings, "kb_points": kb_points, "localized_kb_points": localized_kb_points,
+        "disclaimer": disclaimer, "texts_to_translate": texts_to_translate,
+    }
+
+
+class FollowUpPrefetcher:
+    """
+    Speculative background work for one symptom checker conversation.
+
+    While a follow-up question is on screen, prefetch_next() translates the question
+    after it (or, while the last question is shown, the assessment labels and the KB
+    triage points of every symptom in the session, the unanswered one included) into
+    the shared translation cache, so the next turn renders without waiting on
+    /translate. The assessment prompt contains the last answer, so its Sarvam-M call
+    cannot start earlier than start_assessment(), called as soon as that answer is
+    recorded; the UI then renders the answer while the call and its translation batch
+    run, and assessment() collects the result (running it inline only if nothing was
+    started or the background job failed). cancel() drops queued work and stops a
+    running assessment between the LLM call and the translation batch, for when the
+    user abandons the flow (new query, language change); a cancelled conversation
+    gets no assessment.
+    """
+
+    def __init__(self, utils: HealHubUtilities, language: str,
+                 executor: concurrent.futures.Executor = _PREFETCH_EXECUTOR):
+        self.utils = utils
+        self.language = language
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._futures: List[concurrent.futures.Future] = []
+        self._assessment: Optional[concurrent.futures.Future] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _submit(self, fn, *args) -> Optional[concurrent.futures.Future]:
+        with self._lock:
+            if self.cancelled:
+                return None
+            future = self.executor.submit(fn, *args)
+            self._futures = [f for f in self._futures if not f.done()] + [future]
+            return future
+
+    def _warm(self, texts: List[str]):
+        texts = [text for text in texts if text]
+        if texts and not self.cancelled and not self.language.startswith("en"):
+            self.utils.translate_many(texts, self.language)
+
+    def prefetch_next(self, checker: SymptomChecker) -> Optional[concurrent.futures.Future]:
+        """Warm the translation cache for whatever the user sees after answering the current question"""
+        question = checker.peek_next_question()
+        if question is not None:
+            texts = [question['question'] if not question.get('localized_question') else None,
+                     question['symptom_name'] if not question.get('localized_symptom_name') else None]
+        else:
+            # The current question is the last one: the assessment's fixed strings are known already. Every
+            # session symptom is asked about, so its triage points will be in the assessment, answered yet or not
+            triage_points = checker.relevant_kb_triage_points([*checker.collected_symptom_details, *checker.state.symptom_ids])
+            texts = [*ASSESSMENT_LABELS, SymptomChecker.DEFAULT_ASSESSMENT_ERROR["disclaimer"],
+                     *[point for point, localized in triage_points.items() if not localized]]
+        if not any(texts) or self.language.startswith("en"):
+            return None
+        return self._submit(self._warm, texts)
+
+    def question_texts(self, question: Dict[str, str]) -> Tuple[str, str]:
+        """(symptom name, question) in the user's language; prefetched translations come from the cache"""
+        symptom_name = question.get('localized_symptom_name') or self.utils.translate_text(question['symptom_name'], self.language)
+        question_text = question.get('localized_question') or self.utils.translate_text(question['question'], self.language)
+        return symptom_name, question_text
+
+    def _run_assessment(self, checker: SymptomChecker,
+                        warming: List[concurrent.futures.Future]) -> Tuple[Dict[str, Any], Optional[Dict[str, str]]]:
+        assessment = checker.generate_preliminary_assessment()
+        if self.cancelled:
+            return assessment, None
+        # Labels and triage points warmed on the previous turn are then cache hits, not duplicate requests
+        concurrent.futures.wait(warming)
+        texts = assessment_display_parts(assessment)["texts_to_translate"]
+        return assessment, dict(zip(texts, self.utils.translate_many(texts, self.language)))
+
+    def start_assessment(self, checker: SymptomChecker) -> Optional[concurrent.futures.Future]:
+        """Start the assessment LLM call and its translation batch; call once the last answer is recorded"""
+        with self._lock:
+            if self._assessment is not None:
+                return self._assessment
+            warming = list(self._futures)
+        future = self._submit(self._run_assessment, checker, warming)
+        with self._lock:
+            self._assessment = future
+        return future
+
+    def assessment(self, checker: SymptomChecker) -> Optional[Tuple[Dict[str, Any], Dict[str, str]]]:
+        """(assessment, {text: translation}), from the background job if one was started; None once cancelled"""
+        if self.cancelled:
+            print("ℹ️ Symptom checker conversation was cancelled; not generating its assessment.")
+            return None
+        future = self._assessment
+        if future is not None:
+            try:
+                assessment, translated = future.result()
+                if translated is not None:
+                    return assessment, translated
+            except concurrent.futures.CancelledError:
+                print("ℹ️ Prefetched assessment was cancelled; not generating it again.")
+                return None
+            except Exception as e:
+                print(f"⚠️ Prefetched assessment failed: {e}. Generating it now.")
+        assessment = checker.generate_preliminary_assessment()
+        texts = assessment_display_parts(assessment)["texts_to_translate"]
+        return assessment, dict(zip(texts, self.utils.translate_many(texts, self.language)))
+
+    def cancel(self):
+        """Abandon all prefetch work for this conversation; queued jobs never start"""
+        with self._lock:
+            self._cancelled.set()
+            pending = sum(future.cancel() for future in self._futures)
+            self._futures = []
+        if pending:
+            print(f"ℹ️ Cancelled {pending} prefetch jobs.")
@@ -93,3 +93,16 @@ Correct Response (English):
 "I understand you're looking for answers about feeling tired and having a persistent cough. However, I cannot provide a medical diagnosis. For any health concerns or to get a diagnosis, it's very important to consult a qualified healthcare professional. They will be able to properly assess your symptoms and provide appropriate guidance."
 (No general disclaimer 3.3.d needed here as the primary response is a safety redirection).
 """
+
+# Pre-localized reply for emergencies, keyed by language code. Served without any
+# LLM or translation call so the most urgent users get an answer immediately.
+EMERGENCY_RESPONSES = {
+    "en": "The symptoms you're describing sound serious and may require immediate medical attention. Please consult a doctor or go to the nearest hospital right away. I am not equipped to provide emergency medical assistance. In an emergency, call 112 (or 108 for an ambulance).",
+    "hi": "आपके द्वारा बताए गए लक्षण गंभीर लग रहे हैं और इसके लिए तत्काल चिकित्सा ध्यान देने की आवश्यकता हो सकती है। कृपया तुरंत डॉक्टर से सलाह लें या नजदीकी अस्पताल जाएँ। मैं आपातकालीन चिकित्सा सहायता प्रदान करने के लिए सुसज्जित नहीं हूँ। आपात स्थिति में 112 (एम्बुलेंस के लिए 108) पर कॉल करें।",
+    "bn": "আপনি যে লক্ষণগুলির কথা বলছেন তা গুরুতর মনে হচ্ছে এবং এর জন্য অবিলম্বে চিকিৎসার প্রয়োজন হতে পারে। অনুগ্রহ করে এখনই একজন ডাক্তারের পরামর্শ নিন বা নিকটতম হাসপাতালে যান। আমি জরুরি চিকিৎসা সহায়তা দিতে পারি না। জরুরি অবস্থায় 112 নম্বরে (অ্যাম্বুলেন্সের জন্য 108) ফোন করুন।",
+    "mr": "तुम्ही सांगितलेली लक्षणे गंभीर वाटतात आणि त्यासाठी तात्काळ वैद्यकीय मदतीची गरज असू शकते. कृपया लगेच डॉक्टरांचा सल्ला घ्या किंवा जवळच्या रुग्णालयात जा. मी आपत्कालीन वैद्यकीय मदत देऊ शकत नाही. आपत्कालीन परिस्थितीत 112 (रुग्णवाहिकेसाठी 108) वर कॉल करा.",
+    "ta": "நீங்கள் விவரிக்கும் அறிகுறிகள் தீவிரமாகத் தெரிகின்றன, உடனடி மருத்துவ கவனிப்பு தேவைப்படலாம். தயவுசெய்து உடனே ஒரு மருத்துவரை அணுகவும் அல்லது அருகிலுள்ள மருத்துவமனைக்குச் செல்லவும். அவசர மருத்துவ உதவியை என்னால் வழங்க முடியாது. அவசரநிலையில் 112 (ஆம்புலன்ஸுக்கு 108) ஐ அழைக்கவும்.",
+    "te": "మీరు చెబుతున్న లక్షణాలు తీవ్రంగా అనిపిస్తున్నాయి, వెంటనే వైద్య సహాయం అవసరం కావచ్చు. దయచేసి వెంటనే డాక్టర్‌ను సంప్రదించండి లేదా దగ్గరలోని ఆసుపత్రికి వెళ్లండి. నేను అత్యవసర వైద్య సహాయం అందించలేను. అత్యవసర పరిస్థితిలో 112 (అంబులెన్స్ కోసం 108) కు కాల్ చేయండి.",
+    "kn": "ನೀವು ವಿವರಿಸುತ್ತಿರುವ ಲಕ್ಷಣಗಳು ಗಂಭೀರವಾಗಿವೆ ಮತ್ತು ತಕ್ಷಣದ ವೈದ್ಯಕೀಯ ಗಮನ ಬೇಕಾಗಬಹುದು. ದಯವಿಟ್ಟು ತಕ್ಷಣ ವೈದ್ಯರನ್ನು ಸಂಪರ್ಕಿಸಿ ಅಥವಾ ಹತ್ತಿರದ ಆಸ್ಪತ್ರೆಗೆ ಹೋಗಿ. ತುರ್ತು ವೈದ್ಯಕೀಯ ಸಹಾಯವನ್ನು ನಾನು ಒದಗಿಸಲು ಸಾಧ್ಯವಿಲ್ಲ. ತುರ್ತು ಸಂದರ್ಭದಲ್ಲಿ 112 (ಆಂಬ್ಯುಲೆನ್ಸ್‌ಗಾಗಿ 108) ಗೆ ಕರೆ ಮಾಡಿ.",
+    "ml": "നിങ്ങൾ പറയുന്ന ലക്ഷണങ്ങൾ ഗുരുതരമാണെന്ന് തോന്നുന്നു, ഉടൻ വൈദ്യസഹായം ആവശ്യമായേക്കാം. ദയവായി ഉടൻ ഒരു ഡോക്ടറെ കാണുക അല്ലെങ്കിൽ അടുത്തുള്ള ആശുപത്രിയിലേക്ക് പോകുക. അടിയന്തര വൈദ്യസഹായം നൽകാൻ എനിക്ക് കഴിയില്ല. അടിയന്തര സാഹചര്യത്തിൽ 112 (ആംബുലൻസിന് 108) വിളിക്കുക.",
+}
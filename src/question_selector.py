@@ -0,0 +1,400 @@
+import argparse
+import itertools
+import json
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    from src.symptom_index import stem
+    from src.text_features import tokenize
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.symptom_index import stem
+    from src.text_features import tokenize
+
+# Triage severity of the assessment, lowest first. A KB triage point's level comes from its
+# wording; the session's severity is the highest level among the points that apply.
+SEVERITY_LEVELS = ("self-care", "see a doctor", "prompt attention", "emergency")
+_LEVEL_CUES = (
+    (3, ("emergency", "immediate", "urgent", "call for help")),
+    (2, ("prompt", "serious", "significant concern")),
+    (1, ("doctor", "dentist", "medical", "evaluat", "consult", "attention", "checked", "seen", "advice", "testing",
+         "discuss", "healthcare provider")),
+)
+# Prior probability that a point applies before anything is known, by level (rarer when more severe)
+PRIOR_BY_LEVEL = {1: 0.3, 2: 0.2, 3: 0.1}
+P_REPORTED = 0.95   # A point whose red-flag terms (or duration / temperature) the user reported
+P_DENIED = 0.05     # A point a question asked about, answered without any of its red flags
+
+RED_FLAG_LEVEL = 2             # Points at this level or above ("prompt attention", "emergency") are always asked about
+DEFAULT_QUESTION_BUDGET = 4
+DEFAULT_VIGNETTES_PATH = os.path.join(os.path.dirname(__file__), "triage_vignettes.json")
+DEFAULT_CONFIDENCE = 0.8      # Stop once the most likely severity has this probability
+DEFAULT_MIN_GAIN = 0.02       # Bits; questions expected to tell less than this are skipped as redundant
+_MAX_OUTCOME_POINTS = 8       # Expected gain enumerates 2^n outcomes of a question's unresolved points
+
+# Stems that name the same finding ("bloody", "bleeding" -> "blood"); applied after stemming
+_SYNONYMS = {
+    "bloody": "blood", "bleed": "blood", "bled": "blood", "abdomen": "abdominal", "belly": "abdominal",
+    "stomach": "abdominal", "tummy": "abdominal", "bowel": "stool", "motion": "stool", "breathless": "breath",
+    "breathlessness": "breath", "swollen": "swell", "dizziness": "dizz", "wors": "worsen", "severit": "sever",
+    "puk": "vomit", "throwing": "vomit", "perspir": "sweat", "faint": "dizz", "drenched": "drench",
+}
+
+
+def concepts(text: str) -> Tuple[str, ...]:
+    """English tokens of `text` reduced to comparable stems: "-ly" dropped, then stemmed, then synonyms merged"""
+    result = []
+    for token in tokenize(text):
+        if token.endswith("ly") and len(token) > 5:
+            token = token[:-2]  # "suddenly" -> "sudden"
+        token = stem(token, "en")
+        result.append(_SYNONYMS.get(token, token))
+    return tuple(result)
+
+
+# Words in triage points that say how serious a point is, not what to look for
+_GENERIC_WORDS = frozenset(concepts(
+    "a an and are as at be by can could do does e g for from if in into is it its of on or that the this to was "
+    "were what when where which while who will with you your yours any other some such like also even most many "
+    "more than less very often especially always usually certain describe described include including "
+    "accompanied sign signs symptom symptoms indicative need needs needed require requires required warrant "
+    "warrants should may might must help see seen check checked consult consultation doctor dentist healthcare "
+    "provider medical attention evaluation evaluated evaluate investigation care urgent urgently immediate "
+    "immediately prompt promptly emergency serious significant concern call discuss discussed advice rule out "
+    "underlying conditions condition problem problems get better own home but they their them due cause lead "
+    "look looks feel come comes one keep down cannot stay try important new change changes despite occur "
+    "last lasts lasting longer persist persists persistent minute minutes hour hours day days week weeks month "
+    "months few couple pain ache body above doesn't per consider"))
+_NEGATIONS = frozenset(("no", "not", "never", "without", "none", "nahi", "nahin", "dont", "didnt", "doesnt", "isnt", "havent"))
+_NEGATION_WINDOW = 3
+_LIST_CONJUNCTIONS = frozenset(("or", "nor", "and"))
+_CLAUSE_BREAK = re.compile(r"[,;!?]|\.(?!\d)|\bbut\b", re.IGNORECASE)
+
+_DURATION_UNITS_IN_DAYS = {"minute": 1 / 1440, "min": 1 / 1440, "hour": 1 / 24, "hr": 1 / 24, "day": 1, "week": 7,
+                           "month": 30, "year": 365}
+_COUNT_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+                "few": 3, "a few": 3, "couple": 2, "a couple": 2, "a couple of": 2, "several": 4}
+_COUNT = r"(\d+(?:\.\d+)?|a couple of|a couple|a few|couple|few|several|one|two|three|four|five|six|seven|an|a)"
+_UNIT = r"(minute|min|hour|hr|day|week|month|year)s?"
+_DURATION_THRESHOLD_PATTERN = re.compile(
+    r"(?:more|longer) than\s+" + _COUNT + r"(?:\s*-\s*\d+)?\s+" + _UNIT, re.IGNORECASE)
+_DURATION_PATTERN = re.compile(r"\b" + _COUNT + r"\s*" + _UNIT + r"\b", re.IGNORECASE)
+_TEMPERATURE_THRESHOLD_PATTERN = re.compile(r"above\s+(\d+(?:\.\d+)?)\s*°?\s*([FC])", re.IGNORECASE)
+_TEMPERATURE_PATTERN = re.compile(r"(\d{2,3}(?:\.\d+)?)\s*°?\s*([FC])?\b", re.IGNORECASE)
+_DURATION_QUESTION_CUES = ("how long", "how many days", "since when", "when did", "long time", "what period", "lasted")
+_TEMPERATURE_QUESTION_CUES = ("temperature",)
+_COMORBID_PATTERN = re.compile(r"accompan|\bwith\s+(?!a |an |your |you )", re.IGNORECASE)
+_OTHER_SYMPTOMS_CUES = ("other symptom", "along with", "accompanying")
+# Questions that ask how the symptom feels or how it began, and the red-flag stems their answers reveal
+_CHARACTER_QUESTION_CUES = ("describe", "type of pain", "how severe", "how bad", "what does")
+_CHARACTER_TERMS = frozenset(concepts("severe worst pressure squeezing"))
+_ONSET_QUESTION_CUES = ("sudden", "start", "first notice", "begin", "began", "how long")
+_ONSET_TERMS = frozenset(concepts("sudden"))
+# Questions about what something looks like or where it is felt
+_APPEARANCE_QUESTION_CUES = ("color", "colour", "look like")
+_APPEARANCE_TERMS = frozenset(concepts("blood black"))
+_LOCATION_QUESTION_CUES = ("where", "which")
+_LOCATION_TERMS = frozenset(concepts("spreads whole radiating arm jaw localized limb side"))
+# Questions asking for an amount, which answer points with a numeric limit ("more than 5% ... in 6-12 months")
+_QUANTITY_QUESTION_CUES = ("how much", "how many")
+
+
+@dataclass(frozen=True)
+class TriagePoint:
+    symptom_id: str
+    text: str
+    level: int                        # Index into SEVERITY_LEVELS
+    terms: FrozenSet[str]             # Stemmed red-flag terms ("blood", "stiff", "neck")
+    min_days: Optional[float] = None  # "lasting more than 3 days" -> 3.0
+    min_temperature_f: Optional[float] = None
+    comorbid: bool = False            # An "accompanied by ..." / "with ..." point, informed by other-symptom questions
+    quantified: bool = False          # Mentions a number the answer to a "how much / how many" question can be set against
+
+
+def _count_value(count: str) -> float:
+    return float(count) if count[0].isdigit() else float(_COUNT_WORDS[count.lower()])
+
+
+def _fahrenheit(value: float, unit: Optional[str]) -> float:
+    unit = (unit or ("F" if value > 45 else "C")).upper()
+    return value if unit == "F" else value * 9 / 5 + 32
+
+
+def parse_triage_point(symptom_id: str, text: str) -> TriagePoint:
+    """Severity level, red-flag terms and numeric thresholds of one KB triage point"""
+    lowered = text.lower()
+    level = next((level for level, cues in _LEVEL_CUES if any(cue in lowered for cue in cues)), 0)
+    symptom_terms = set(concepts(symptom_id))
+    terms = frozenset(token for token in concepts(text)
+                      if token not in _GENERIC_WORDS and token not in symptom_terms and len(token) > 2 and not token.isdigit())
+    duration = _DURATION_THRESHOLD_PATTERN.search(text)
+    temperature = _TEMPERATURE_THRESHOLD_PATTERN.search(text)
+    return TriagePoint(
+        symptom_id=symptom_id, text=text, level=level, terms=terms,
+        min_days=_count_value(duration.group(1)) * _DURATION_UNITS_IN_DAYS[duration.group(2).lower()] if duration else None,
+        min_temperature_f=_fahrenheit(float(temperature.group(1)), temperature.group(2)) if temperature else None,
+        comorbid=bool(_COMORBID_PATTERN.search(text)),
+        quantified=any(character.isdigit() for character in text),
+    )
+
+
+def question_covers(symptom_id: str, question: str, point: TriagePoint) -> bool:
+    """Whether the answer to `question` (asked about `symptom_id`) can tell if `point` applies"""
+    lowered = question.lower()
+    if point.symptom_id == symptom_id:
+        if point.min_days is not None and any(cue in lowered for cue in _DURATION_QUESTION_CUES):
+            return True
+        if point.min_temperature_f is not None and any(cue in lowered for cue in _TEMPERATURE_QUESTION_CUES):
+            return True
+        if point.comorbid and any(cue in lowered for cue in _OTHER_SYMPTOMS_CUES):
+            return True
+        if point.terms & _CHARACTER_TERMS and any(cue in lowered for cue in _CHARACTER_QUESTION_CUES):
+            return True
+        if point.terms & _ONSET_TERMS and any(cue in lowered for cue in _ONSET_QUESTION_CUES):
+            return True
+        if point.terms & _APPEARANCE_TERMS and any(cue in lowered for cue in _APPEARANCE_QUESTION_CUES):
+            return True
+        if point.terms & _LOCATION_TERMS and any(cue in lowered for cue in _LOCATION_QUESTION_CUES):
+            return True
+        if point.quantified and any(cue in lowered for cue in _QUANTITY_QUESTION_CUES):
+            return True
+    return bool(point.terms & set(concepts(question)))
+
+
+def _reported_terms(text: str) -> FrozenSet[str]:
+    """Stemmed terms of `text`, minus those within a few words after a negation ("no blood", "not dizzy")"""
+    reported = set()
+    # A negation does not reach past its clause: "no, but my ankles are swollen"
+    for clause in _CLAUSE_BREAK.split(text):
+        tokens = [token.replace("'", "") for token in concepts(clause)]
+        negated_until = -1
+        for position, token in enumerate(tokens):
+            if token in _NEGATIONS or (token in _LIST_CONJUNCTIONS and position <= negated_until):
+                negated_until = position + _NEGATION_WINDOW  # "no stiff neck or confusion" negates the whole list
+            elif position > negated_until:
+                reported.add(token)
+    return frozenset(reported)
+
+
+def _longest_duration_days(text: str) -> Optional[float]:
+    durations = [_count_value(count) * _DURATION_UNITS_IN_DAYS[unit.lower()] for count, unit in _DURATION_PATTERN.findall(text)]
+    return max(durations) if durations else None
+
+
+def _highest_temperature_f(text: str) -> Optional[float]:
+    temperatures = [_fahrenheit(float(value), unit) for value, unit in _TEMPERATURE_PATTERN.findall(text)]
+    temperatures = [temperature for temperature in temperatures if 90 <= temperature <= 110]
+    return max(temperatures) if temperatures else None
+
+
+def _entropy(distribution: Sequence[float]) -> float:
+    return -sum(p * math.log2(p) for p in distribution if p > 0)
+
+
+def severity_distribution(points: Sequence[TriagePoint], probabilities: Sequence[float]) -> List[float]:
+    """P(severity == level) for each level, treating points as independent"""
+    at_least = []  # P(severity >= level)
+    for level in range(len(SEVERITY_LEVELS)):
+        none_apply = 1.0
+        for point, probability in zip(points, probabilities):
+            if point.level >= level:
+                none_apply *= 1 - probability
+        at_least.append(1.0 if level == 0 else 1 - none_apply)
+    return [at_least[level] - (at_least[level + 1] if level + 1 < len(at_least) else 0.0)
+            for level in range(len(SEVERITY_LEVELS))]
+
+
+class AdaptiveQuestioner:
+    """
+    Picks follow-up questions by expected information gain about triage severity.
+
+    Each KB triage point of the session's symptoms is an independent yes/no variable
+    with a level (self-care .. emergency, from its wording) and a prior; the session's
+    severity is the highest level that applies. Prior answers and the original query
+    update the points: red-flag terms, a duration or a temperature over the point's
+    threshold make it likely; an answer to a question that covers it, without any of
+    those, makes it unlikely (English sessions only, since other languages cannot be
+    read for denials yet; there, answers only ever raise a point).
+
+    next_question() first asks, regardless of budget and confidence, at least one
+    question per symptom and every question that covers a prompt-attention or
+    emergency point not reported yet. After that it returns the pending question
+    whose answer is expected to reduce the severity entropy most, skipping those
+    below `min_gain` (nothing left for them to tell), or None to stop: once the most
+    likely severity reaches `confidence`, no question is informative enough, or
+    `budget` questions have been asked.
+    """
+
+    def __init__(self, budget: int = DEFAULT_QUESTION_BUDGET, confidence: float = DEFAULT_CONFIDENCE,
+                 min_gain: float = DEFAULT_MIN_GAIN):
+        self.budget = budget
+        self.confidence = confidence
+        self.min_gain = min_gain
+
+    @classmethod
+    def from_env(cls) -> Optional["AdaptiveQuestioner"]:
+        """The questioner HEALHUB_ADAPTIVE_QUESTIONS=1 enables (None: ask every question in KB order)"""
+        if os.getenv("HEALHUB_ADAPTIVE_QUESTIONS", "0") != "1":
+            return None
+        return cls(budget=int(os.getenv("HEALHUB_QUESTION_BUDGET", DEFAULT_QUESTION_BUDGET)),
+                   confidence=float(os.getenv("HEALHUB_QUESTION_CONFIDENCE", DEFAULT_CONFIDENCE)))
+
+    def triage_points(self, symptoms: Mapping[str, Mapping[str, Any]]) -> List[TriagePoint]:
+        """Parsed triage points of the session's symptoms (symptom_id -> KB entry) that call for care"""
+        points = [parse_triage_point(symptom_id, text) for symptom_id, symptom in symptoms.items()
+                  for text in symptom.get("basic_triage_points", [])]
+        return [point for point in points if point.level > 0]
+
+    def point_probabilities(self, points: Sequence[TriagePoint], answers: Mapping[str, Mapping[str, str]],
+                            original_text: str = "", language: str = "en-IN") -> List[float]:
+        """P(point applies) given the original query and the answers so far"""
+        texts = [original_text, *(answer for by_question in answers.values() for answer in by_question.values())]
+        reported_terms = frozenset().union(*map(_reported_terms, texts))  # Per text: "no" to one question negates nothing else
+        evidence = "\n".join(texts)
+        days, temperature = _longest_duration_days(evidence), _highest_temperature_f(evidence)
+        answered = [(symptom_id, question) for symptom_id, by_question in answers.items() for question in by_question]
+        can_deny = language.startswith("en")
+
+        probabilities = []
+        for point in points:
+            if (point.terms & reported_terms
+                    or (point.min_days is not None and days is not None and days > point.min_days)
+                    or (point.min_temperature_f is not None and temperature is not None and temperature > point.min_temperature_f)):
+                probabilities.append(P_REPORTED)
+            elif can_deny and any(question_covers(symptom_id, question, point) for symptom_id, question in answered):
+                probabilities.append(P_DENIED)
+            else:
+                probabilities.append(PRIOR_BY_LEVEL[point.level])
+        return probabilities
+
+    def expected_gain(self, points: Sequence[TriagePoint], probabilities: Sequence[float], covered: Sequence[int]) -> float:
+        """Expected entropy reduction (bits) of severity from learning whether each `covered` point applies"""
+        unresolved = [index for index in covered if probabilities[index] not in (P_REPORTED, P_DENIED)][:_MAX_OUTCOME_POINTS]
+        if not unresolved:
+            return 0.0
+        prior_entropy = _entropy(severity_distribution(points, probabilities))
+        expected_entropy = 0.0
+        for outcome in itertools.product((False, True), repeat=len(unresolved)):
+            conditioned = list(probabilities)
+            likelihood = 1.0
+            for index, applies in zip(unresolved, outcome):
+                likelihood *= probabilities[index] if applies else 1 - probabilities[index]
+                conditioned[index] = 1.0 if applies else 0.0
+            expected_entropy += likelihood * _entropy(severity_distribution(points, conditioned))
+        return prior_entropy - expected_entropy
+
+    def next_question(self, symptoms: Mapping[str, Mapping[str, Any]], pending: Sequence[Tuple[str, int]],
+                      answers: Mapping[str, Mapping[str, str]], original_text: str = "",
+                      language: str = "en-IN") -> Optional[int]:
+        """Position in `pending` of the question to ask next, or None to go to the assessment"""
+        questions = {(symptom_id, position): symptoms[symptom_id]["follow_up_questions"][position]
+                     for symptom_id, position in pending
+                     if symptom_id in symptoms and position < len(symptoms[symptom_id].get("follow_up_questions", []))}
+        if not questions:
+            return None
+        points = self.triage_points(symptoms)
+        probabilities = self.point_probabilities(points, answers, original_text, language)
+        answered_symptoms = {symptom_id for symptom_id, by_question in answers.items() if by_question}
+
+        scored = []  # (position in pending, expected gain, required)
+        for index, key in enumerate(pending):
+            if key not in questions:
+                continue
+            covered = [point_index for point_index, point in enumerate(points) if question_covers(key[0], questions[key], point)]
+            required = key[0] not in answered_symptoms or any(
+                points[point_index].level >= RED_FLAG_LEVEL and probabilities[point_index] != P_REPORTED
+                for point_index in covered)
+            scored.append((index, self.expected_gain(points, probabilities, covered), required))
+
+        # Safety floor, asked whatever the budget and confidence: one question per symptom, and every
+        # question about a prompt-attention or emergency point not reported yet. A denial does not
+        # settle such a point, since it may have been read off a question about another of its signs
+        required = [(index, gain) for index, gain, is_required in scored if is_required]
+        if required:
+            return max(required, key=lambda item: (item[1], -item[0]))[0]  # Ties keep KB order
+
+        asked = sum(len(by_question) for by_question in answers.values())
+        if asked >= self.budget or max(severity_distribution(points, probabilities)) >= self.confidence:
+            return None
+        best, best_gain = None, self.min_gain
+        for index, gain, _ in scored:
+            if gain > best_gain + 1e-9:  # Ties keep KB order
+                best, best_gain = index, gain
+        return best
+
+    def assess(self, symptoms: Mapping[str, Mapping[str, Any]], answers: Mapping[str, Mapping[str, str]],
+               original_text: str = "", language: str = "en-IN") -> Tuple[str, float]:
+        """(most likely severity, its probability) given what is known"""
+        points = self.triage_points(symptoms)
+        distribution = severity_distribution(points, self.point_probabilities(points, answers, original_text, language))
+        level = max(range(len(distribution)), key=distribution.__getitem__)
+        return SEVERITY_LEVELS[level], distribution[level]
+
+
+def evaluate(kb_symptoms: Sequence[Mapping[str, Any]], vignettes: Sequence[Mapping[str, Any]],
+             questioner: Optional[AdaptiveQuestioner]) -> Dict[str, Any]:
+    """
+    Replay hand-labelled vignettes: average turns-to-assessment, how often the severity
+    read off the answers matches the vignette's label, and the ids of vignettes assessed
+    below their label (under-triaged).
+
+    A vignette holds the patient's complaint, a free-text answer to every KB follow-up
+    question of its symptoms (by position) and a severity label. The answers and labels
+    are written from the KB triage points alone, so they do not share the coverage model
+    the selector optimizes against. `questioner=None` asks every question in KB order,
+    like prepare_follow_up_questions.
+    """
+    by_name = {symptom["symptom_name"].lower(): symptom for symptom in kb_symptoms}
+    reader = questioner or AdaptiveQuestioner()
+    turns, correct, under_triaged = 0, 0, []
+    for vignette in vignettes:
+        symptoms = {symptom_id: by_name[symptom_id] for symptom_id in vignette["answers"]}
+        pending = [(symptom_id, position) for symptom_id, symptom in symptoms.items()
+                   for position in range(len(symptom.get("follow_up_questions", [])))]
+        answers: Dict[str, Dict[str, str]] = {}
+        while pending:
+            index = 0 if questioner is None else questioner.next_question(symptoms, pending, answers, vignette["complaint"])
+            if index is None:
+                break
+            symptom_id, position = pending.pop(index)
+            question = symptoms[symptom_id]["follow_up_questions"][position]
+            answers.setdefault(symptom_id, {})[question] = vignette["answers"][symptom_id][position]
+            turns += 1
+        severity, _ = reader.assess(symptoms, answers, vignette["complaint"])
+        correct += severity == vignette["severity"]
+        if SEVERITY_LEVELS.index(severity) < SEVERITY_LEVELS.index(vignette["severity"]):
+            under_triaged.append(vignette["id"])
+    return {"average_turns": turns / len(vignettes), "severity_agreement": correct / len(vignettes),
+            "under_triaged": under_triaged}
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="Offline evaluation of adaptive follow-up question selection "
+                                                 "on hand-labelled triage vignettes.")
+    parser.add_argument("--kb", default="src/symptom_knowledge_base.json")
+    parser.add_argument("--vignettes", default=DEFAULT_VIGNETTES_PATH)
+    parser.add_argument("--budget", type=int, nargs="+", default=[DEFAULT_QUESTION_BUDGET])
+    parser.add_argument("--confidence", type=float, default=DEFAULT_CONFIDENCE)
+    args = parser.parse_args(argv)
+
+    with open(args.kb, 'r', encoding='utf-8') as f:
+        symptoms = json.load(f)["symptoms"]
+    with open(args.vignettes, 'r', encoding='utf-8') as f:
+        vignettes = json.load(f)["vignettes"]
+    runs = [("sequential (all questions)", None)] + [
+        (f"adaptive, budget {budget}", AdaptiveQuestioner(budget=budget, confidence=args.confidence)) for budget in args.budget]
+    print(f"{len(vignettes)} labelled vignettes")
+    for label, questioner in runs:
+        result = evaluate(symptoms, vignettes, questioner)
+        print(f"{label:28s} {result['average_turns']:5.2f} turns to assessment, "
+              f"severity agreement {result['severity_agreement']:.1%}, "
+              f"under-triaged: {', '.join(result['under_triaged']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
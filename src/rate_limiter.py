@@ -0,0 +1,210 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+import requests
+
+
+@dataclass(frozen=True)
+class EndpointLimit:
+    """
+    Admission limits for one logical Sarvam endpoint, shared across the process.
+
+    Attributes:
+        rate_per_second: Sustained request rate (token bucket refill rate)
+        burst: Bucket capacity, i.e. requests that may start back to back after idling
+        max_in_flight: Requests to the endpoint allowed to be outstanding at once
+        max_queue_wait: Seconds a caller may wait for admission before RateLimitTimeout
+    """
+    rate_per_second: float = 10.0
+    burst: int = 20
+    max_in_flight: int = 8
+    max_queue_wait: float = 10.0
+
+
+DEFAULT_LIMIT = EndpointLimit()
+
+DEFAULT_LIMITS: Dict[str, EndpointLimit] = {
+    "chat": EndpointLimit(rate_per_second=10, burst=20, max_in_flight=8),
+    "translate": EndpointLimit(rate_per_second=20, burst=40, max_in_flight=8),
+    "tts": EndpointLimit(rate_per_second=5, burst=10, max_in_flight=4),
+    "stt": EndpointLimit(rate_per_second=5, burst=10, max_in_flight=4),
+    "detect_language": EndpointLimit(rate_per_second=10, burst=20, max_in_flight=4),
+}
+
+
+class RateLimitTimeout(requests.exceptions.RequestException):
+    """Raised when a request could not be admitted within the endpoint's max_queue_wait"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is available or the deadline passes"""
+
+    def __init__(self, rate_per_second: float, burst: int, clock=time.monotonic):
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self._clock = clock
+        self._updated_at = clock()
+        self._condition = threading.Condition()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def acquire(self, deadline: float) -> bool:
+        with self._condition:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+                remaining = deadline - self._clock()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(min(wait, remaining))
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class EndpointGovernor:
+    """Token bucket plus in-flight semaphore for one endpoint, with queue-wait metrics"""
+
+    def __init__(self, name: str, limit: EndpointLimit, clock=time.monotonic):
+        self.name = name
+        self.limit = limit
+        self._clock = clock
+        self._bucket = TokenBucket(limit.rate_per_second, limit.burst, clock)
+        self._slots = threading.BoundedSemaphore(limit.max_in_flight)
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=500)
+        self.admitted = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.queued = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """
+        Wait for a free slot and a rate token. Returns the time spent queueing.
+        Raises RateLimitTimeout if admission takes longer than the allowed wait.
+        """
+        timeout = self.limit.max_queue_wait if timeout is None else timeout
+        start = self._clock()
+        deadline = start + timeout
+        with self._lock:
+            self.queued += 1
+        try:
+            if not self._slots.acquire(timeout=max(0.0, timeout)):
+                self._record_timeout()
+            if not self._bucket.acquire(deadline):
+                self._slots.release()
+                self._record_timeout()
+        finally:
+            with self._lock:
+                self.queued -= 1
+
+        waited = self._clock() - start
+        with self._lock:
+            self.admitted += 1
+            self.in_flight += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            self._waits.append(waited)
+        if waited >= 0.5:
+            print(f"⏳ '{self.name}' request queued {waited * 1000:.0f} ms by the rate limiter.")
+        return waited
+
+    def try_acquire(self) -> bool:
+        """Admit a request only if it can start right now (used for optional hedged requests)"""
+        if not self._slots.acquire(blocking=False):
+            return False
+        if not self._bucket.try_acquire():
+            self._slots.release()
+            return False
+        with self._lock:
+            self.admitted += 1
+            self.in_flight += 1
+            self._waits.append(0.0)
+        return True
+
+    def release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+        raise RateLimitTimeout(f"'{self.name}' request not admitted within {self.limit.max_queue_wait}s; endpoint overloaded.")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "admitted": self.admitted,
+                "timeouts": self.timeouts,
+                "in_flight": self.in_flight,
+                "queued": self.queued,
+                "avg_wait_ms": (self.total_wait / self.admitted * 1000) if self.admitted else 0.0,
+                "p95_wait_ms": waits[int(0.95 * (len(waits) - 1))] * 1000 if waits else 0.0,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+
+class RateLimiter:
+    """Per-endpoint governors, created lazily from the configured limits"""
+
+    def __init__(self, limits: Optional[Dict[str, EndpointLimit]] = None):
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self._governors: Dict[str, EndpointGovernor] = {}
+        self._lock = threading.Lock()
+
+    def governor(self, endpoint: str) -> EndpointGovernor:
+        with self._lock:
+            governor = self._governors.get(endpoint)
+            if governor is None:
+                governor = EndpointGovernor(endpoint, self.limits.get(endpoint, DEFAULT_LIMIT))
+                self._governors[endpoint] = governor
+            return governor
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            governors = dict(self._governors)
+        return {name: governor.stats() for name, governor in governors.items()}
+
+
+def limits_from_env(prefix: str = "HEALHUB_RATE_LIMIT") -> Dict[str, EndpointLimit]:
+    """
+    Read per-endpoint overrides such as HEALHUB_RATE_LIMIT_CHAT_RPS, _BURST,
+    _CONCURRENCY and _QUEUE_WAIT on top of DEFAULT_LIMITS.
+    """
+    fields = {"RPS": ("rate_per_second", float), "BURST": ("burst", int),
+              "CONCURRENCY": ("max_in_flight", int), "QUEUE_WAIT": ("max_queue_wait", float)}
+    limits = {}
+    for endpoint, limit in DEFAULT_LIMITS.items():
+        overrides = {}
+        for suffix, (field_name, cast) in fields.items():
+            raw_value = os.getenv(f"{prefix}_{endpoint.upper()}_{suffix}")
+            if raw_value is None:
+                continue
+            try:
+                overrides[field_name] = cast(raw_value)
+            except ValueError:
+                print(f"⚠️ Ignoring invalid {prefix}_{endpoint.upper()}_{suffix}={raw_value!r}")
+        limits[endpoint] = replace(limit, **overrides) if overrides else limit
+    return limits
@@ -0,0 +1,182 @@
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import requests
+
+
+@dataclass(frozen=True)
+class RequestPolicy:
+    """
+    How a call site talks to a Sarvam endpoint when things go wrong.
+
+    Attributes:
+        max_retries: Retries after the first attempt (0 disables retrying)
+        backoff_base: First backoff ceiling in seconds; doubles per retry ("full jitter")
+        backoff_max: Upper bound for any single backoff
+        retry_on_status: HTTP status codes that are retried
+        respect_retry_after: Honour a Retry-After header on retryable responses
+        max_retry_after: Cap on how long a Retry-After header may make us wait
+        hedge: Send a duplicate request if the first is slower than the endpoint's p95
+        hedge_min_delay: Never hedge earlier than this many seconds
+        hedge_default_delay: Hedge delay used until enough latency samples exist
+        failure_threshold: Consecutive failures that open the endpoint's circuit
+        reset_timeout: Seconds an open circuit waits before letting a probe through
+        deadline: Total seconds for one call across all attempts and backoff; each attempt's
+            timeout is cut to what is left (None: attempts x timeout, plus backoff)
+    """
+    max_retries: int = 2
+    backoff_base: float = 0.2
+    backoff_max: float = 5.0
+    retry_on_status: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    respect_retry_after: bool = True
+    max_retry_after: float = 10.0
+    hedge: bool = False
+    hedge_min_delay: float = 0.2
+    hedge_default_delay: float = 2.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    deadline: Optional[float] = 45.0
+
+    def backoff(self, attempt: int) -> float:
+        """Jittered exponential backoff for the given retry attempt (0-based)"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+
+DEFAULT_POLICY = RequestPolicy()
+
+# Policy for latency-critical calls (e.g. NLU stages) that may hedge
+LATENCY_CRITICAL_POLICY = RequestPolicy(hedge=True)
+
+# Default policy per logical endpoint; call sites can pass their own
+DEFAULT_POLICIES: Dict[str, RequestPolicy] = {
+    "chat": RequestPolicy(max_retries=2),
+    "translate": RequestPolicy(max_retries=2),
+    "tts": RequestPolicy(max_retries=1),
+    "stt": RequestPolicy(max_retries=1, deadline=90.0),
+    "detect_language": RequestPolicy(max_retries=1, deadline=20.0),
+}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without sending a request while an endpoint's circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    closed: requests flow normally. After failure_threshold consecutive failures the
+    circuit opens and requests fail fast. After reset_timeout one probe request is let
+    through (half-open); its success closes the circuit, its failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"⚠️ Circuit opened after {self.consecutive_failures} consecutive failures.")
+                self.state = self.OPEN
+                self.opened_at = self._clock()
+                self._probe_in_flight = False
+
+
+class LatencyTracker:
+    """Rolling window of successful request latencies for one endpoint"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))
+        return ordered[index]
+
+
+@dataclass
+class PolicyCounters:
+    """Thread-safe counters for retries, hedges and circuit breaker rejections"""
+    retries: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    circuit_rejections: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def increment(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "circuit_rejections": self.circuit_rejections,
+            }
+
+
+def retry_after_seconds(response: requests.Response, cap: float) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date), capped at `cap`"""
+    header = response.headers.get("Retry-After")
+    if not header:
+        return None
+    try:
+        seconds = float(header)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(header)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        seconds = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    return max(0.0, min(seconds, cap))
@@ -1,12 +1,23 @@
 import json
-from typing import Optional
+import time
+from typing import Dict, Iterator, List, Optional
 
 from src.nlu_processor import NLUResult, HealthIntent, SarvamAPIClient
-from src.prompts import HEALTHCARE_SYSTEM_PROMPT
+from src.prompts import EMERGENCY_RESPONSES, HEALTHCARE_SYSTEM_PROMPT
+from src.request_policy import RequestPolicy
+
+
+def get_emergency_response(language_code: Optional[str]) -> str:
+    """Pre-localized emergency reply for a language code such as "ta-IN" (English if unsupported)"""
+    lang = language_code.split('-')[0] if language_code else "en"
+    return EMERGENCY_RESPONSES.get(lang, EMERGENCY_RESPONSES["en"])
+
 
 class HealHubResponseGenerator:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, request_policy: Optional[RequestPolicy] = None):
         self.sarvam_client = SarvamAPIClient(api_key=api_key)
+        self.request_policy = request_policy  # None uses the transport's default "chat" policy
+        self.last_stream_metrics = {"ttft_ms": None, "total_ms": None, "chunks": 0}
 
     def _get_hardcoded_safety_response(self, nlu_result: NLUResult) -> Optional[str]:
         """
@@ -17,10 +28,7 @@ class HealHubResponseGenerator:
         lang = nlu_result.language_detected.split('-')[0] if nlu_result.language_detected else "en"
 
         if nlu_result.is_emergency:
-            if lang == "hi":
-                return "आपके द्वारा बताए गए लक्षण गंभीर लग रहे हैं और इसके लिए तत्काल चिकित्सा ध्यान देने की आवश्यकता हो सकती है। कृपया तुरंत डॉक्टर से सलाह लें या नजदीकी अस्पताल जाएँ। मैं आपातकालीन चिकित्सा सहायता प्रदान करने के लिए सुसज्जित नहीं हूँ।"
-            else: # Default to English
-                return "The symptoms you're describing sound serious and may require immediate medical attention. Please consult a doctor or go to the nearest hospital right away. I am not equipped to provide emergency medical assistance."
+            return get_emergency_response(nlu_result.language_detected)
 
         if nlu_result.intent == HealthIntent.DIAGNOSIS_REQUEST:
             if lang == "hi":
@@ -36,6 +44,17 @@ class HealHubResponseGenerator:
                 return "I am unable to offer treatment advice or suggest specific medications. Please consult with your doctor or a qualified healthcare provider for any questions about treatments, medications, or managing your health condition."
         return None
 
+    def _build_messages(self, user_query: str, nlu_result: NLUResult) -> List[Dict]:
+        # Construct messages for the LLM
+        # The NLU result can be passed to the LLM for more context if needed,
+        # but the system prompt already guides it extensively.
+        # For now, we'll just pass the user query.
+        # You could enhance this by adding a summary of NLU findings to the user message.
+        return [
+            {"role": "system", "content": HEALTHCARE_SYSTEM_PROMPT},
+            {"role": "user", "content": f"User query: \"{user_query}\"\nDetected language: {nlu_result.language_detected}\nNLU Intent: {nlu_result.intent.value}\nNLU Entities: {[e.text for e in nlu_result.entities]}"}
+        ]
+
     def generate_response(self, user_query: str, nlu_result: NLUResult) -> str:
         """
         Generates a response based on the user query and NLU result.
@@ -49,22 +68,15 @@ class HealHubResponseGenerator:
 
         # Layer 2: LLM-level response generation with comprehensive system prompt
         print(f"💬 Generating response for query: '{user_query}' using LLM.")
-        
-        # Construct messages for the LLM
-        # The NLU result can be passed to the LLM for more context if needed,
-        # but the system prompt already guides it extensively.
-        # For now, we'll just pass the user query.
-        # You could enhance this by adding a summary of NLU findings to the user message.
-        messages = [
-            {"role": "system", "content": HEALTHCARE_SYSTEM_PROMPT},
-            {"role": "user", "content": f"User query: \"{user_query}\"\nDetected language: {nlu_result.language_detected}\nNLU Intent: {nlu_result.intent.value}\nNLU Entities: {[e.text for e in nlu_result.entities]}"}
-        ]
+        messages = self._build_messages(user_query, nlu_result)
 
         try:
             llm_response_data = self.sarvam_client.chat_completion(
                 messages=messages,
                 temperature=0.5, # Adjust for desired creativity/factuality
-                max_tokens=500  # Adjust as needed
+                max_tokens=500,  # Adjust as needed
+                policy=self.request_policy,
+                use_cache=False  # Replies are generated fresh, never replayed from the completion cache
             )
 
             if llm_response_data and "choices" in llm_response_data and llm_response_data["choices"]:
@@ -82,4 +94,60 @@ class HealHubResponseGenerator:
             print(f"❌ Error during LLM call: {e}")
             if nlu_result.language_detected.startswith("hi"):
                 return "क्षमा करें, प्रतिक्रिया उत्पन्न करते समय एक त्रुटि हुई।"
-            return "Sorry, an error occurred while generating the response."
\ No newline at end of file
+            return "Sorry, an error occurred while generating the response."
+
+    def generate_response_stream(self, user_query: str, nlu_result: NLUResult) -> Iterator[str]:
+        """
+        Streaming variant of generate_response: yields the reply piece by piece as the
+        LLM produces it, with the same safety layer and fallbacks.
+
+        Time-to-first-token (the perceived latency) and total time are recorded in
+        self.last_stream_metrics once the stream is exhausted.
+        """
+        start = time.perf_counter()
+        self.last_stream_metrics = {"ttft_ms": None, "total_ms": None, "chunks": 0}
+
+        safety_response = self._get_hardcoded_safety_response(nlu_result)
+        if safety_response:
+            print("ℹ️ Applying hardcoded safety response.")
+            self._record_first_token(start)
+            yield safety_response
+            self._record_stream_end(start)
+            return
+
+        print(f"💬 Streaming response for query: '{user_query}' using LLM.")
+        leading = True
+        try:
+            for delta in self.sarvam_client.chat_completion_stream(
+                messages=self._build_messages(user_query, nlu_result),
+                temperature=0.5,
+                max_tokens=500,
+                policy=self.request_policy,
+                use_cache=False
+            ):
+                if leading:
+                    delta = delta.lstrip()  # generate_response strips the reply; match it
+                    if not delta:
+                        continue
+                    leading = False
+                    self._record_first_token(start)
+                self.last_stream_metrics["chunks"] += 1
+                yield delta
+        except Exception as e:
+            print(f"❌ Error during streaming LLM call: {e}")
+
+        if self.last_stream_metrics["chunks"] == 0:
+            print("⚠️ LLM stream was empty or failed.")
+            self._record_first_token(start)
+            if nlu_result.language_detected.startswith("hi"):
+                yield "माफ़ कीजिए, मैं अभी आपकी मदद नहीं कर सकता। कृपया बाद में प्रयास करें।"
+            else:
+                yield "Sorry, I am unable to assist you at the moment. Please try again later."
+        self._record_stream_end(start)
+
+    def _record_first_token(self, start: float):
+        self.last_stream_metrics["ttft_ms"] = (time.perf_counter() - start) * 1000
+        print(f"⏱️ Time to first token: {self.last_stream_metrics['ttft_ms']:.0f} ms")
+
+    def _record_stream_end(self, start: float):
+        self.last_stream_metrics["total_ms"] = (time.perf_counter() - start) * 1000
@@ -0,0 +1,235 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    from src.phrase_matcher import NormalizedText, PhraseMatcher, normalize_with_offsets
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.phrase_matcher import NormalizedText, PhraseMatcher, normalize_with_offsets
+
+# Phrases asking the assistant for a diagnosis, matched against casefolded queries
+DIAGNOSIS_PATTERNS = (
+    r'\b(what.*wrong|diagnose|what.*disease|what.*illness)\b',
+    r'\b(do i have|am i suffering)\b',
+    r'\b(क्या.*बीमारी|निदान)\b',  # Hindi
+    r'\b(என்ன.*நோய்|கண்டறிதல்)\b',  # Tamil
+)
+
+_REGEX_SPECIAL = set("\\.^$*+?{}[]()|")
+
+
+def _group_end(pattern: str, start: int) -> Optional[int]:
+    """Index of the parenthesis closing the group opened at pattern[start], or None"""
+    depth, i, in_class = 0, start, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 1
+        elif in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return None
+
+
+def _alternatives(pattern: str) -> List[str]:
+    """Split `pattern` at its top-level | operators"""
+    parts, depth, start, i, in_class = [], 0, 0, 0, False
+    while i < len(pattern):
+        c = pattern[i]
+        if c == "\\":
+            i += 1
+        elif in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            parts.append(pattern[start:i])
+            start = i + 1
+        i += 1
+    return parts + [pattern[start:]]
+
+
+def _leading_chars(pattern: str) -> Optional[Set[str]]:
+    """
+    The characters every match of `pattern` must start with, or None if that cannot
+    be read off the pattern: each alternative has to open with a required literal
+    character or a group of such alternatives (leading word boundaries are skipped).
+    """
+    chars: Set[str] = set()
+    for alternative in _alternatives(pattern):
+        while alternative.startswith(r"\b"):
+            alternative = alternative[2:]
+        if alternative.startswith("("):
+            inner_start = 3 if alternative.startswith("(?:") else 1
+            if alternative.startswith("(?") and inner_start == 1:
+                return None  # Lookarounds, flags, named groups
+            end = _group_end(alternative, 0)
+            if end is None or alternative[end + 1:end + 2] in ("*", "?", "{"):
+                return None
+            inner = _leading_chars(alternative[inner_start:end])
+            if inner is None:
+                return None
+            chars |= inner
+        elif alternative and alternative[0] not in _REGEX_SPECIAL and alternative[1:2] not in ("*", "?", "{"):
+            chars.add(alternative[0])
+        else:
+            return None
+    return chars
+
+
+@dataclass(frozen=True)
+class SafetyHit:
+    """An emergency keyword or diagnosis-request pattern found in a query"""
+    kind: str      # "emergency" or "diagnosis"
+    start: int
+    end: int
+    text: str      # Matched span of the original query
+    rule: str      # Normalized keyword, or the diagnosis pattern that matched
+
+
+class SafetyMatcher:
+    """
+    Precompiled matcher for the life-safety checks of the NLU pipeline.
+
+    Emergency keywords are compiled once per language into a single trie regex that
+    also contains the English keywords (code-mixed transcripts often carry English
+    emergency terms). Keywords match as substrings, as the per-keyword scan did.
+    Diagnosis patterns are combined into one alternation with a named group per
+    pattern and matched against the casefolded text, so they should be written in
+    lowercase. The two sets are scanned separately so a greedy diagnosis pattern
+    such as "what.*wrong" can never consume an emergency keyword. When every pattern
+    starts with a literal character, the diagnosis regex skips every position that
+    does not start with one of them.
+    """
+
+    def __init__(self, emergency_keywords: Dict[str, List[str]], diagnosis_patterns: Iterable[str],
+                 fallback_language: str = "en"):
+        self.fallback_language = fallback_language
+        self.diagnosis_patterns = list(diagnosis_patterns)
+        fallback_keywords = emergency_keywords.get(fallback_language, [])
+        self._emergency: Dict[str, PhraseMatcher] = {
+            language: PhraseMatcher(list(keywords) + list(fallback_keywords))
+            for language, keywords in emergency_keywords.items()
+        }
+        self._fallback = self._emergency.get(fallback_language, PhraseMatcher(fallback_keywords))
+        self._diagnosis = self._compile_diagnosis(self.diagnosis_patterns)
+        self._last_normalized: Tuple[str, NormalizedText] = ("", normalize_with_offsets(""))
+
+    @staticmethod
+    def _compile_diagnosis(patterns: List[str]) -> Optional["re.Pattern"]:
+        if not patterns:
+            return None
+        # A word boundary shared by every pattern is tested once instead of per branch
+        prefix = r"\b" if all(pattern.startswith(r"\b") for pattern in patterns) else ""
+        branches = "|".join(f"(?P<d{index}>{pattern[len(prefix):]})" for index, pattern in enumerate(patterns))
+        # Let the engine skip positions no pattern can start at; no guard if any pattern's start is unknown
+        leading = [_leading_chars(pattern) for pattern in patterns]
+        first_chars = sorted(set().union(*leading)) if all(chars is not None for chars in leading) else []
+        guard = "(?=[" + "".join(re.escape(char) for char in first_chars) + "])" if first_chars else ""
+        return re.compile(f"{guard}{prefix}(?:{branches})")
+
+    def _normalize(self, text: str) -> NormalizedText:
+        """Normalize once per query: the emergency and diagnosis checks see the same text"""
+        last_text, last_normalized = self._last_normalized
+        if text == last_text:
+            return last_normalized
+        normalized = normalize_with_offsets(text)
+        self._last_normalized = (text, normalized)
+        return normalized
+
+    def _emergency_matcher(self, language: str) -> PhraseMatcher:
+        lang_code = language.split('-')[0] if language else self.fallback_language
+        return self._emergency.get(lang_code, self._fallback)
+
+    def emergency_hits(self, text: str, language: str) -> List[SafetyHit]:
+        return [SafetyHit("emergency", match.start, match.end, match.text, match.phrase)
+                for match in self._emergency_matcher(language).find_all(text, self._normalize(text))]
+
+    def diagnosis_hits(self, text: str) -> List[SafetyHit]:
+        if self._diagnosis is None or not text:
+            return []
+        normalized = self._normalize(text)
+        hits = []
+        for match in self._diagnosis.finditer(normalized.normalized):
+            start, end = normalized.span(*match.span())
+            pattern = self.diagnosis_patterns[int(match.lastgroup[1:])]
+            hits.append(SafetyHit("diagnosis", start, end, text[start:end], pattern))
+        return hits
+
+    def scan(self, text: str, language: str) -> List[SafetyHit]:
+        """All emergency and diagnosis hits, ordered by position"""
+        return sorted(self.emergency_hits(text, language) + self.diagnosis_hits(text), key=lambda hit: hit.start)
+
+    def is_emergency(self, text: str, language: str) -> bool:
+        if not text:
+            return False
+        return self._emergency_matcher(language).search(text, self._normalize(text)) is not None
+
+    def is_diagnosis_request(self, text: str) -> bool:
+        if self._diagnosis is None or not text:
+            return False
+        return self._diagnosis.search(self._normalize(text).normalized) is not None
+
+
+if __name__ == "__main__":
+    # Benchmark: the per-query safety checks, compiled matcher vs. the loops it replaced
+    import json
+    import statistics
+    import time
+
+    with open("src/nlu_config.json", 'r', encoding='utf-8') as f:
+        emergency_keywords = json.load(f)["keyword_lists"]["emergency_keywords"]
+    diagnosis_patterns = list(DIAGNOSIS_PATTERNS)
+    matcher = SafetyMatcher(emergency_keywords, diagnosis_patterns)
+
+    def previous_checks(text, language):
+        text_lower = text.lower()
+        keywords = emergency_keywords.get(language.split('-')[0], emergency_keywords.get('en', []))
+        is_emergency = any(keyword.lower() in text_lower for keyword in keywords)
+        is_diagnosis = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in diagnosis_patterns)
+        return is_emergency, is_diagnosis
+
+    def matcher_checks(text, language):
+        return matcher.is_emergency(text, language), matcher.is_diagnosis_request(text)
+
+    filler = ("I have had a mild headache and some tiredness since last week, mostly in the evenings. "
+              "मुझे कल से हल्का बुखार है और थोड़ी खांसी भी है। ")
+    transcripts = {
+        "short (55 chars)": "I have a mild fever and a slight cough since yesterday",
+        "long, no hit (5k chars)": (filler * 40)[:5000],
+        "long, hit at end (5k chars)": (filler * 40)[:4980] + " chest pain",
+    }
+
+    def bench(fn, text, runs=2000):
+        variants = (text, text + " ")  # Alternate so per-query normalization is measured too
+        samples = []
+        for run in range(runs):
+            start = time.perf_counter()
+            fn(variants[run % 2], "hi-IN")
+            samples.append((time.perf_counter() - start) * 1e6)
+        samples.sort()
+        return statistics.median(samples), samples[int(0.99 * (len(samples) - 1))]
+
+    print(f"{len(matcher._emergency)} languages, {sum(map(len, emergency_keywords.values()))} emergency keywords, "
+          f"{len(diagnosis_patterns)} diagnosis patterns")
+    for name, text in transcripts.items():
+        for label, fn in (("previous loops ", previous_checks),
+                          ("SafetyMatcher  ", matcher_checks),
+                          ("scan (all hits)", matcher.scan)):
+            p50, p99 = bench(fn, text)
+            print(f"{name:28s} {label} p50 {p50:8.1f} µs   p99 {p99:8.1f} µs")
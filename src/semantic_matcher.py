@@ -0,0 +1,233 @@
+import argparse
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from src.symptom_index import stemmed_tokens
+    from src.text_features import HashedNgramVectorizer
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.symptom_index import stemmed_tokens
+    from src.text_features import HashedNgramVectorizer
+
+DEFAULT_SEMANTIC_THRESHOLD = 0.3   # Minimum cosine similarity between an entity and a KB phrase
+DEFAULT_SEMANTIC_MARGIN = 0.1      # Lead the best symptom needs over the runner-up ("back pain": gum/head/chest pain tie)
+DEFAULT_SEMANTIC_TOP_K = 3         # Candidate symptoms returned per entity
+SEMANTIC_VECTORIZER = HashedNgramVectorizer(n_features=2 ** 12, char_ngram_range=(3, 5), word_ngrams=1)
+
+# Words with opposite meanings: an entity using one side never matches a KB phrase using the
+# other, however many n-grams they share ("weight gain" is not "sudden weight loss")
+CONTRASTING_TERMS = (
+    (("gain", "gaining", "gained", "increase", "increased"), ("loss", "lose", "losing", "lost")),
+    (("increase", "increased", "increasing"), ("decrease", "decreased", "decreasing")),
+    (("loose", "watery"), ("hard",)),
+)
+# A negated entity ("no fever") only matches KB phrases that are themselves negated ("no energy")
+NEGATION_TERMS = ("no", "not", "never", "without", "nahi", "nahin")
+
+
+def _stems(terms: Iterable[str]) -> frozenset:
+    return frozenset(token for term in terms for token in stemmed_tokens(term))
+
+
+_CONTRASTING_STEMS = tuple((_stems(side), _stems(other)) for pair in CONTRASTING_TERMS
+                           for side, other in (pair, pair[::-1]))
+_NEGATION_STEMS = _stems(NEGATION_TERMS)
+
+
+def kb_phrases(symptoms: Sequence[Mapping[str, Any]]) -> Tuple[List[str], List[int]]:
+    """Every symptom name, keyword and keyword alias with the position of its symptom, grouped by symptom"""
+    phrases, owners = [], []
+    for symptom_id, symptom in enumerate(symptoms):
+        terms = [symptom["symptom_name"], *symptom.get("keywords", ())]
+        for aliases in symptom.get("keyword_aliases", {}).values():
+            terms.extend(aliases)
+        for term in dict.fromkeys(term for term in terms if term and term.strip()):
+            phrases.append(term)
+            owners.append(symptom_id)
+    return phrases, owners
+
+
+@dataclass(frozen=True)
+class SemanticMatch:
+    symptom_name: str
+    entry: Mapping[str, Any]      # The KB entry
+    score: float                  # Cosine similarity of the entity and `phrase`
+    phrase: str                   # The KB name, keyword or alias nearest to the entity
+
+
+class SemanticSymptomMatcher:
+    """
+    Fuzzy entity -> KB symptom resolution without a network call.
+
+    Every KB symptom name, keyword and alias is embedded once as a TF-IDF weighted,
+    L2-normalized vector of hashed character n-grams (so "feverish" lands near
+    "fever" and "pounding head" near "head pain"), stacked into one dense float32
+    matrix. match() embeds all entities and scores them against the whole KB with a
+    single matrix product, keeping each symptom's best phrase and the top-k symptoms
+    above `threshold`. An entity whose best symptom does not lead the runner-up by
+    `margin` is ambiguous and gets no match.
+
+    Shared n-grams cannot tell a symptom from its opposite, so before pooling an
+    entity's scores, phrases it contradicts are dropped: the other side of a
+    CONTRASTING_TERMS pair, un-negated phrases for a negated entity, and every phrase
+    of a symptom whose `excluded_terms` (KB field, e.g. "eyes" for fatigue) it uses.
+
+    With `cache_dir` (or HEALHUB_SEMANTIC_INDEX_DIR for the shared KB snapshot) the
+    matrix is saved as .npy, named by a fingerprint of the phrases and vectorizer,
+    and memory-mapped read-only on later loads instead of being rebuilt.
+    """
+
+    def __init__(self, symptoms: Sequence[Mapping[str, Any]], vectorizer: HashedNgramVectorizer = SEMANTIC_VECTORIZER,
+                 threshold: float = DEFAULT_SEMANTIC_THRESHOLD, margin: float = DEFAULT_SEMANTIC_MARGIN,
+                 top_k: int = DEFAULT_SEMANTIC_TOP_K, cache_dir: Optional[str] = None):
+        self.symptoms = tuple(symptoms)
+        self.vectorizer = vectorizer
+        self.threshold = threshold
+        self.margin = margin
+        self.top_k = top_k
+        self.phrases, owners = kb_phrases(self.symptoms)
+        self.phrase_symptoms = np.array(owners, dtype=np.int64)
+        # Phrases are grouped by symptom: the first row of each group, for per-symptom max-pooling
+        self.group_symptoms, self.group_starts = np.unique(self.phrase_symptoms, return_index=True)
+        self.phrase_stems = [frozenset(stemmed_tokens(phrase)) for phrase in self.phrases]
+        self.negated_phrases = np.array([bool(stems & _NEGATION_STEMS) for stems in self.phrase_stems], dtype=bool)
+        self.excluded_stems = [_stems(symptom.get("excluded_terms", ())) for symptom in self.symptoms]
+        self.fingerprint = hashlib.sha256(json.dumps([self.phrases, owners, vectorizer.to_dict()],
+                                                     ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+        self.memory_mapped = False
+
+        loaded = self._load(cache_dir) if cache_dir else None
+        if loaded is not None:
+            self.matrix, self.idf = loaded
+            self.memory_mapped = True
+        else:
+            self.idf = self._fit_idf()
+            self.matrix = self.embed(self.phrases)
+            if cache_dir:
+                self._save(cache_dir)
+
+    def _counts(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.vectorizer.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(matrix[row], self.vectorizer.indices(text), 1.0)
+        return matrix
+
+    def _fit_idf(self) -> np.ndarray:
+        document_frequency = (self._counts(self.phrases) > 0).sum(axis=0)
+        return (np.log((1 + len(self.phrases)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), n_features) float32 matrix of L2-normalized TF-IDF vectors"""
+        matrix = self._counts(texts)
+        np.log1p(matrix, out=matrix)
+        matrix *= self.idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def contradicted(self, text: str) -> np.ndarray:
+        """Boolean mask of the KB phrases `text` contradicts (opposite term, missing negation, excluded term)"""
+        stems = frozenset(stemmed_tokens(text))
+        blocked = np.zeros(len(self.phrases), dtype=bool)
+        if stems & _NEGATION_STEMS:
+            blocked |= ~self.negated_phrases
+        opposites = frozenset().union(*(other for side, other in _CONTRASTING_STEMS if stems & side))
+        if opposites:
+            blocked |= np.array([bool(phrase_stems & opposites) for phrase_stems in self.phrase_stems], dtype=bool)
+        for symptom_id, excluded in enumerate(self.excluded_stems):
+            if stems & excluded:
+                blocked |= self.phrase_symptoms == symptom_id
+        return blocked
+
+    def match(self, texts: Sequence[str]) -> List[List[SemanticMatch]]:
+        """For each text, up to top_k KB symptoms whose nearest phrase scores at least `threshold`, best first"""
+        if not texts or not self.phrases:
+            return [[] for _ in texts]
+        scores = self.embed(texts) @ self.matrix.T                                    # (texts, phrases)
+        for row, text in enumerate(texts):
+            scores[row, self.contradicted(text)] = 0.0
+        symptom_scores = np.maximum.reduceat(scores, self.group_starts, axis=1)       # (texts, symptoms)
+        group_ends = np.append(self.group_starts[1:], len(self.phrases))
+
+        results = []
+        for row in range(len(texts)):
+            ranked = np.argsort(-symptom_scores[row], kind="stable")[:max(self.top_k, 2)]
+            if len(ranked) > 1 and symptom_scores[row, ranked[0]] - symptom_scores[row, ranked[1]] < self.margin:
+                results.append([])
+                continue
+            matches = []
+            for group in ranked[:self.top_k]:
+                score = float(symptom_scores[row, group])
+                if score < self.threshold:
+                    break
+                start, end = self.group_starts[group], group_ends[group]
+                phrase = self.phrases[start + int(scores[row, start:end].argmax())]
+                entry = self.symptoms[self.group_symptoms[group]]
+                matches.append(SemanticMatch(entry["symptom_name"], entry, score, phrase))
+            results.append(matches)
+        return results
+
+    def best(self, text: str) -> Optional[SemanticMatch]:
+        matches = self.match([text])[0]
+        return matches[0] if matches else None
+
+    def _paths(self, cache_dir: str) -> Tuple[str, str]:
+        stem = os.path.join(cache_dir, f"semantic_kb_{self.fingerprint}")
+        return stem + ".npy", stem + ".idf.npy"
+
+    def _load(self, cache_dir: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        matrix_path, idf_path = self._paths(cache_dir)
+        if not (os.path.exists(matrix_path) and os.path.exists(idf_path)):
+            return None
+        try:
+            matrix = np.load(matrix_path, mmap_mode="r")
+            idf = np.load(idf_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load semantic symptom index from {matrix_path}: {e}. Rebuilding.")
+            return None
+        if matrix.shape != (len(self.phrases), self.vectorizer.n_features) or idf.shape != (self.vectorizer.n_features,):
+            return None
+        return matrix, idf
+
+    def _save(self, cache_dir: str):
+        matrix_path, idf_path = self._paths(cache_dir)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write then rename, so a concurrent reader never maps a half-written file
+            for path, array in ((idf_path, self.idf), (matrix_path, self.matrix)):
+                with open(path + ".tmp", "wb") as f:
+                    np.save(f, array)
+                os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"⚠️ Could not save semantic symptom index to {cache_dir}: {e}")
+
+
+def main(argv: Optional[Iterable[str]] = None):
+    parser = argparse.ArgumentParser(description="Semantic (n-gram TF-IDF) symptom matching against the knowledge base.")
+    parser.add_argument("texts", nargs="*", help="Entity texts to resolve (default: a few paraphrases)")
+    parser.add_argument("--kb", default="src/symptom_knowledge_base.json")
+    parser.add_argument("--cache-dir", help="Save / memory-map the KB matrix here")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_SEMANTIC_THRESHOLD)
+    parser.add_argument("--margin", type=float, default=DEFAULT_SEMANTIC_MARGIN)
+    args = parser.parse_args(argv)
+
+    with open(args.kb, 'r', encoding='utf-8') as f:
+        symptoms = json.load(f)["symptoms"]
+    matcher = SemanticSymptomMatcher(symptoms, threshold=args.threshold, margin=args.margin, cache_dir=args.cache_dir)
+    print(f"{len(matcher.phrases)} KB phrases x {matcher.vectorizer.n_features} features"
+          f"{' (memory-mapped)' if matcher.memory_mapped else ''}")
+    texts = args.texts or ["my head is pounding", "feeling feverish", "loose stools since morning", "I sprained my ankle"]
+    for text, matches in zip(texts, matcher.match(texts)):
+        found = ", ".join(f"{match.symptom_name} ({match.score:.2f} via '{match.phrase}')" for match in matches) or "-"
+        print(f"{text!r:40s} -> {found}")
+
+
+if __name__ == "__main__":
+    main()
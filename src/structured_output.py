@@ -0,0 +1,219 @@
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+# Called with (key, value) for each completed field of a top-level object,
+# or (index, value) for each completed item of a top-level array
+FieldCallback = Callable[[Union[str, int], Any], None]
+
+
+class IncrementalJSONParser:
+    """
+    Finds and parses the first top-level JSON object or array in LLM output fed
+    chunk by chunk, e.g. from a streaming completion.
+
+    Anything before the opening brace (code fences, "Here is the JSON:") and after
+    the matching close (closing fences, explanations) is ignored. feed() returns
+    True as soon as the top-level value has closed, so the caller can stop reading
+    the stream there. Top-level fields are parsed as each one completes and are
+    available in `fields` (or `items` for an array) before the value is finished,
+    e.g. "intent" before "confidence".
+    """
+
+    def __init__(self, on_field: Optional[FieldCallback] = None, accept: str = "{["):
+        self.on_field = on_field
+        self.accept = accept              # Characters that may open the top-level value
+        self.text = ""                    # Everything fed so far
+        self.start: Optional[int] = None  # Offset of the top-level opening brace
+        self.end: Optional[int] = None    # Offset just past its closing brace
+        self.fields: Dict[str, Any] = {}
+        self.items: List[Any] = []
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._is_object = False
+        self._expect = None               # At depth 1: "key", "colon", "value" or "comma"
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self.end is not None
+
+    @property
+    def json_text(self) -> Optional[str]:
+        """The top-level JSON text once it has closed, without surrounding fences or prose"""
+        return self.text[self.start:self.end] if self.done else None
+
+    @property
+    def value(self) -> Any:
+        """The parsed top-level value. Raises json.JSONDecodeError if it is incomplete or malformed."""
+        if not self.done:
+            raise json.JSONDecodeError("No complete JSON value", self.text, len(self.text))
+        return json.loads(self.json_text)
+
+    def feed(self, chunk: str) -> bool:
+        """Consume the next chunk; returns True once the top-level value has closed"""
+        if self.done:
+            return True
+        self.text += chunk
+        text = self.text
+        i, n = self._pos, len(text)
+        while i < n:
+            c = text[i]
+            if self.start is None:
+                if c in self.accept:
+                    self.start, self._depth, self._is_object = i, 1, c == "{"
+                    self._expect = "key" if self._is_object else "value"
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._string_closed(i)
+            elif c == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._token_start(i, c)
+            elif c in "{[":
+                if self._depth == 1:
+                    self._token_start(i, c)
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 1:
+                    self._value_done(i + 1)   # A nested object/array field just closed
+                elif self._depth == 0:
+                    self._value_done(i)       # Pending number/literal before the closing brace
+                    self.end = self._pos = i + 1
+                    return True
+            elif self._depth == 1:
+                if c == ",":
+                    self._value_done(i)
+                    self._expect = "key" if self._is_object else "value"
+                elif c == ":":
+                    self._expect = "value"
+                elif not c.isspace():
+                    self._token_start(i, c)
+            i += 1
+        self._pos = n
+        return False
+
+    def _token_start(self, i: int, c: str):
+        if self._expect == "key" and c == '"':
+            self._key_start = i
+        elif self._expect == "value" and self._value_start is None:
+            self._value_start = i
+
+    def _string_closed(self, i: int):
+        if self._key_start is not None:
+            try:
+                self._key = json.loads(self.text[self._key_start:i + 1])
+            except ValueError:
+                self._key = None
+            self._key_start = None
+            self._expect = "colon"
+        elif self._value_start is not None and self.text[self._value_start] == '"':
+            self._value_done(i + 1)
+
+    def _value_done(self, end: int):
+        if self._value_start is None:
+            return
+        raw = self.text[self._value_start:end].strip()
+        self._value_start = None
+        self._expect = "comma"
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return  # Left for the final parse to report
+        if self._is_object:
+            if self._key is None:
+                return
+            key = self._key
+            self.fields[key] = value
+        else:
+            key = len(self.items)
+            self.items.append(value)
+        if self.on_field:
+            self.on_field(key, value)
+
+
+def parse_json_object(text: str, accept: str = "{") -> Any:
+    """
+    Parse the first JSON object in `text`, ignoring code fences and surrounding prose.
+    Pass accept="{[" to also take a top-level array. Raises json.JSONDecodeError.
+    """
+    parser = IncrementalJSONParser(accept=accept)
+    parser.feed(text or "")
+    return parser.value
+
+
+def json_start_chars(schema: Optional[Dict] = None) -> str:
+    """The `accept` characters for a reply described by `schema`: an object unless its top-level type is array"""
+    return "[" if schema and schema.get("type") == "array" else "{"
+
+
+def parse_json_stream(chunks: Iterable[str], on_field: Optional[FieldCallback] = None, accept: str = "{[") -> IncrementalJSONParser:
+    """
+    Feed a stream of text chunks to a parser until the top-level value closes, then
+    stop reading (generators are closed, which ends a streaming HTTP response).
+    """
+    parser = IncrementalJSONParser(on_field=on_field, accept=accept)
+    iterator = iter(chunks)
+    try:
+        for chunk in iterator:
+            if parser.feed(chunk):
+                break
+    finally:
+        close = getattr(iterator, "close", None)
+        if close:
+            close()
+    return parser
+
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+}
+
+def validate_against_schema(value, schema: Dict, path: str = "$") -> List[str]:
+    """
+    Validate a parsed JSON value against the small JSON-schema subset used here
+    (type, required, properties, items, enum, minimum, maximum).
+
+    Returns a list of error messages; an empty list means the value is valid.
+    """
+    errors = []
+    expected_type = schema.get("type")
+    if expected_type:
+        python_type = _JSON_TYPES[expected_type]
+        # bool is a subclass of int but is never a valid number here
+        if isinstance(value, bool) or not isinstance(value, python_type):
+            return [f"{path}: expected {expected_type}, got {type(value).__name__}"]
+
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+    if "minimum" in schema and value < schema["minimum"]:
+        errors.append(f"{path}: {value} is below minimum {schema['minimum']}")
+    if "maximum" in schema and value > schema["maximum"]:
+        errors.append(f"{path}: {value} is above maximum {schema['maximum']}")
+
+    if expected_type == "object":
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}: missing required key '{key}'")
+        for key, sub_schema in schema.get("properties", {}).items():
+            if key in value:
+                errors.extend(validate_against_schema(value[key], sub_schema, f"{path}.{key}"))
+    elif expected_type == "array" and "items" in schema:
+        for index, item in enumerate(value):
+            errors.extend(validate_against_schema(item, schema["items"], f"{path}[{index}]"))
+
+    return errors
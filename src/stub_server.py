@@ -0,0 +1,394 @@
+"""
+Local stand-in for the Sarvam AI endpoints HealHub uses, for offline runs and benchmarks.
+
+Implements /v1/chat/completions (including SSE streaming), /translate, /text-to-speech,
+/speech-to-text and /detect-language with deterministic canned outputs, plus per-route
+latency injection (lognormal, given as median and p99), error injection and rate limits.
+
+Usage:
+    python src/stub_server.py --port 8765 --latency chat=800:2500 --error-rate chat=0.05 --rps translate=5
+    export SARVAM_BASE_URL=http://127.0.0.1:8765   # picked up by SarvamAPIClient and HealHubUtilities
+"""
+import argparse
+import base64
+import io
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import wave
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+try:
+    from src.rate_limiter import TokenBucket
+except ImportError:
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.rate_limiter import TokenBucket
+
+ROUTES = {
+    "/v1/chat/completions": "chat",
+    "/translate": "translate",
+    "/text-to-speech": "tts",
+    "/speech-to-text": "stt",
+    "/detect-language": "detect_language",
+}
+
+# Keyword heuristics for canned intents, checked in order
+INTENT_KEYWORDS = [
+    ("emergency", ["chest pain", "can't breathe", "cannot breathe", "unconscious", "heavy bleeding", "heart attack", "stroke"]),
+    ("diagnosis_request", ["diagnose", "what disease", "what illness", "do i have", "what is wrong"]),
+    ("medication_info", ["medicine", "medication", "tablet", "dose", "dosage", "paracetamol"]),
+    ("prevention_info", ["prevent", "avoid getting", "vaccine"]),
+    ("wellness_tip", ["tip", "healthy", "sleep better", "diet", "exercise"]),
+    ("disease_info", ["what is diabetes", "what is malaria", "what is dengue", "symptoms of"]),
+]
+
+CANNED_REPLY = ("Rest well, drink plenty of fluids and keep track of how you feel. "
+                "If your symptoms get worse or do not improve in a few days, please consult a doctor.\n"
+                "This is general information, not medical advice.")
+
+CANNED_ASSESSMENT = {
+    "assessment_summary": "Your symptoms are commonly associated with a mild viral illness.",
+    "suggested_severity": "Likely mild, monitor symptoms",
+    "recommended_next_steps": "Rest, stay hydrated and monitor your temperature.\nConsult a doctor if symptoms persist beyond 3 days.",
+    "potential_warnings": ["Difficulty breathing", "Fever above 103°F (39.4°C)"],
+    "disclaimer": "This is not a medical diagnosis. Please consult a healthcare professional.",
+}
+
+
+@dataclass
+class RouteConfig:
+    """
+    Behaviour of one stub route.
+
+    Attributes:
+        latency_median_ms: Median injected latency (0 disables latency injection)
+        latency_p99_ms: 99th percentile latency; latencies are lognormal between the two
+        error_rate: Fraction of requests answered with error_status
+        error_status: Status code for injected errors
+        rate_limit_rps: If set, requests above this rate get 429 with Retry-After
+    """
+    latency_median_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    rate_limit_rps: Optional[float] = None
+
+
+@dataclass
+class StubConfig:
+    routes: Dict[str, RouteConfig] = field(default_factory=dict)
+    seed: int = 0
+    transcript: str = "I have had a fever and headache since yesterday"
+    detected_language: str = "en-IN"
+    stream_chunk_delay_ms: float = 20.0
+    kb_filepath: str = "src/symptom_knowledge_base.json"
+
+    def route(self, name: str) -> RouteConfig:
+        return self.routes.setdefault(name, RouteConfig())
+
+
+def _load_symptom_keywords(kb_filepath: str) -> List[str]:
+    try:
+        with open(kb_filepath, 'r', encoding='utf-8') as f:
+            kb = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+    keywords = set()
+    for symptom in kb.get("symptoms", []):
+        keywords.add(symptom.get("symptom_name", "").lower())
+        keywords.update(keyword.lower() for keyword in symptom.get("keywords", []))
+    keywords.discard("")
+    return sorted(keywords, key=len, reverse=True)
+
+
+def _silent_wav(seconds: float = 0.1, sample_rate: int = 22050) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(b"\x00\x00" * int(seconds * sample_rate))
+    return buffer.getvalue()
+
+
+class CannedResponder:
+    """Deterministic outputs for each route, shaped like the real API responses"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.symptom_keywords = _load_symptom_keywords(config.kb_filepath)
+        self.tts_audio = base64.b64encode(_silent_wav()).decode("ascii")
+
+    @staticmethod
+    def _quoted_query(content: str) -> str:
+        match = re.search(r"'(.*)'", content, re.DOTALL)
+        return match.group(1) if match else content
+
+    def _intent(self, text: str) -> str:
+        lowered = text.lower()
+        for intent, keywords in INTENT_KEYWORDS:
+            if any(keyword in lowered for keyword in keywords):
+                return intent
+        if self._entities(text):
+            return "symptom_query"
+        return "general_health"
+
+    def _entities(self, text: str) -> List[Dict]:
+        lowered = text.lower()
+        entities, taken = [], []
+        for keyword in self.symptom_keywords:
+            for match in re.finditer(r"\b" + re.escape(keyword) + r"\b", lowered):
+                if any(match.start() < end and start < match.end() for start, end in taken):
+                    continue
+                taken.append((match.start(), match.end()))
+                entities.append({"text": text[match.start():match.end()], "type": "symptom",
+                                 "start": match.start(), "end": match.end(), "confidence": 0.9})
+        return sorted(entities, key=lambda entity: entity["start"])
+
+    def chat_content(self, messages: List[Dict]) -> str:
+        system_prompt = messages[0].get("content", "") if messages else ""
+        user_content = messages[-1].get("content", "") if messages else ""
+        query = self._quoted_query(user_content)
+        if "healthcare query analyzer" in system_prompt:
+            return json.dumps({"intent": self._intent(query), "confidence": 0.9,
+                               "entities": self._entities(query), "language": self.config.detected_language})
+        if "batches of numbered queries" in system_prompt:
+            # One answer per `N. "query"` line of the batch prompt
+            numbered = re.findall(r'^(\d+)\. (".*")$', user_content, re.MULTILINE)
+            return json.dumps([{"id": int(number), "intent": self._intent(json.loads(quoted)), "confidence": 0.9}
+                               for number, quoted in numbered], ensure_ascii=False)
+        if "intent classifier" in system_prompt:
+            return json.dumps({"intent": self._intent(query), "confidence": 0.9})
+        if "entity extractor" in system_prompt:
+            return json.dumps({"entities": self._entities(query)})
+        if '"assessment_summary"' in system_prompt:
+            return json.dumps(CANNED_ASSESSMENT, ensure_ascii=False)
+        return CANNED_REPLY
+
+    @staticmethod
+    def translate(payload: Dict) -> Dict:
+        target = payload.get("target_language_code", "en-IN")
+        text = payload.get("input", "")
+        if target.startswith("en"):
+            return {"translated_text": text}
+        prefix = f"[{target.split('-')[0]}] "
+        return {"translated_text": "\n".join(prefix + line if line else line for line in text.split("\n"))}
+
+    def tts(self, payload: Dict) -> Dict:
+        return {"audios": [self.tts_audio]}
+
+    def stt(self, form_body: bytes) -> Dict:
+        match = re.search(rb'name="language_code"\r\n\r\n([^\r]+)', form_body)
+        language = match.group(1).decode("utf-8") if match else self.config.detected_language
+        return {"transcript": self.config.transcript, "language_code": language}
+
+    def detect_language(self, payload: Dict) -> Dict:
+        return {"language": self.config.detected_language}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.server.stub.stats())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        route = ROUTES.get(self.path.split("?")[0])
+        if route is None:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        stub = self.server.stub
+        outcome = stub.admit(route)
+        if outcome == "rate_limited":
+            self._send_json(429, {"error": "rate limit exceeded"}, {"Retry-After": "1"})
+            return
+        time.sleep(stub.sample_latency(route))
+        if outcome == "error":
+            self._send_json(stub.config.route(route).error_status, {"error": "injected failure"})
+            return
+
+        responder = stub.responder
+        if route == "stt":
+            self._send_json(200, responder.stt(body))
+            return
+        payload = json.loads(body or b"{}")
+        if route == "chat":
+            content = responder.chat_content(payload.get("messages", []))
+            if payload.get("stream"):
+                self._stream_chat(content, payload)
+            else:
+                self._send_json(200, {"id": "stub-completion", "model": payload.get("model"),
+                                      "choices": [{"index": 0, "finish_reason": "stop",
+                                                   "message": {"role": "assistant", "content": content}}]})
+        elif route == "translate":
+            self._send_json(200, responder.translate(payload))
+        elif route == "tts":
+            self._send_json(200, responder.tts(payload))
+        else:
+            self._send_json(200, responder.detect_language(payload))
+
+    def _send_json(self, status: int, data: Dict, headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream_chat(self, content: str, payload: Dict):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        delay = self.server.stub.config.stream_chunk_delay_ms / 1000
+        for piece in re.findall(r"\s*\S+\s*", content):
+            event = {"id": "stub-completion", "model": payload.get("model"),
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+
+class StubSarvamServer:
+    """
+    Threaded local stand-in for the Sarvam API.
+
+    Example:
+        with StubSarvamServer(StubConfig(routes={"chat": RouteConfig(latency_median_ms=300, latency_p99_ms=900)})) as stub:
+            client = SarvamAPIClient(api_key="test", base_url=stub.base_url)
+    """
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.responder = CannedResponder(self.config)
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._httpd = ThreadingHTTPServer((host, port), _StubHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stub = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubSarvamServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _count(self, route: str, name: str):
+        counters = self._counters.setdefault(route, {"requests": 0, "errors_injected": 0, "rate_limited": 0})
+        counters[name] += 1
+
+    def admit(self, route: str) -> str:
+        """Decide the fate of a request: "ok", "error" or "rate_limited" """
+        route_config = self.config.route(route)
+        with self._lock:
+            self._count(route, "requests")
+            if route_config.rate_limit_rps:
+                bucket = self._buckets.get(route)
+                if bucket is None:
+                    bucket = TokenBucket(route_config.rate_limit_rps, max(1, int(route_config.rate_limit_rps)))
+                    self._buckets[route] = bucket
+                if not bucket.try_acquire():
+                    self._count(route, "rate_limited")
+                    return "rate_limited"
+            if route_config.error_rate and self._rng.random() < route_config.error_rate:
+                self._count(route, "errors_injected")
+                return "error"
+        return "ok"
+
+    def sample_latency(self, route: str) -> float:
+        """Injected latency in seconds (lognormal fitted to the configured median and p99)"""
+        route_config = self.config.route(route)
+        if route_config.latency_median_ms <= 0:
+            return 0.0
+        mu = math.log(route_config.latency_median_ms)
+        p99 = max(route_config.latency_p99_ms, route_config.latency_median_ms)
+        sigma = (math.log(p99) - mu) / 2.326
+        with self._lock:
+            return self._rng.lognormvariate(mu, sigma) / 1000
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {route: dict(counters) for route, counters in self._counters.items()}
+
+
+def _parse_route_values(values: List[str], option: str) -> Dict[str, str]:
+    parsed = {}
+    for value in values or []:
+        route, _, setting = value.partition("=")
+        if route not in ROUTES.values() or not setting:
+            raise SystemExit(f"Invalid {option} '{value}'; expected ROUTE=VALUE with ROUTE in {sorted(ROUTES.values())}")
+        parsed[route] = setting
+    return parsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Sarvam API stand-in for HealHub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", action="append", help="ROUTE=MEDIAN_MS[:P99_MS], e.g. chat=800:2500")
+    parser.add_argument("--error-rate", action="append", help="ROUTE=FRACTION, e.g. chat=0.05")
+    parser.add_argument("--rps", action="append", help="ROUTE=REQUESTS_PER_SECOND before answering 429")
+    parser.add_argument("--transcript", default=StubConfig.transcript, help="Canned speech-to-text transcript")
+    args = parser.parse_args()
+
+    config = StubConfig(seed=args.seed, transcript=args.transcript)
+    for route, setting in _parse_route_values(args.latency, "--latency").items():
+        median, _, p99 = setting.partition(":")
+        config.route(route).latency_median_ms = float(median)
+        config.route(route).latency_p99_ms = float(p99 or median)
+    for route, setting in _parse_route_values(args.error_rate, "--error-rate").items():
+        config.route(route).error_rate = float(setting)
+    for route, setting in _parse_route_values(args.rps, "--rps").items():
+        config.route(route).rate_limit_rps = float(setting)
+
+    server = StubSarvamServer(config, host=args.host, port=args.port)
+    print(f"✅ Sarvam stub listening on {server.base_url}")
+    print(f"   export SARVAM_BASE_URL={server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping stub server.")
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
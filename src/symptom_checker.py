@@ -2,16 +2,28 @@ from dotenv import load_dotenv
 load_dotenv() # Load environment variables at the very beginning
 import json
 import os
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterable, Mapping, Optional, Any, Tuple
 from enum import Enum # Required for HealthIntent placeholder
 
 
 try:
     from src.utils import HealHubUtilities
+    from src.request_policy import RequestPolicy
+    from src.knowledge_registry import DEFAULT_KB_LOCALIZATION_PATH, DEFAULT_KB_PATH, SymptomKnowledge, get_knowledge_registry
+    from src.structured_output import parse_json_object
+    from src.symptom_index import SymptomIndex
+    from src.semantic_matcher import SemanticSymptomMatcher
+    from src.question_selector import AdaptiveQuestioner
 except ImportError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     from src.utils import HealHubUtilities
+    from src.request_policy import RequestPolicy
+    from src.knowledge_registry import DEFAULT_KB_LOCALIZATION_PATH, DEFAULT_KB_PATH, SymptomKnowledge, get_knowledge_registry
+    from src.structured_output import parse_json_object
+    from src.symptom_index import SymptomIndex
+    from src.semantic_matcher import SemanticSymptomMatcher
+    from src.question_selector import AdaptiveQuestioner
 
 # Attempt to import NLUResult from the existing nlu_processor.
 # If running this subtask in isolation and that file isn't in the same root,
@@ -62,6 +74,53 @@ except ImportError:
             return { "choices": [{ "message": { "content": mock_json_content } }] }
 
 
+class SymptomSessionState:
+    """
+    What a symptom-checker conversation has to remember between turns, and nothing else:
+    the NLU summary, the relevant KB symptom ids (symptom_name.lower()), pending
+    follow-ups as (symptom id, question index) and the answers so far. KB entries come
+    from the shared knowledge registry and the API client and utilities are injected
+    when a SymptomChecker is rebuilt around the state, so a session costs a few hundred
+    bytes (see to_dict) and can be persisted or handed to another worker.
+    """
+    __slots__ = ("original_text", "intent", "detected_language", "language",
+                 "entities", "symptom_ids", "pending", "answers")
+
+    def __init__(self, original_text: str = "", intent: str = "symptom_query", detected_language: str = "en-IN",
+                 language: Optional[str] = None, entities: Optional[List[Tuple[str, Optional[str]]]] = None,
+                 symptom_ids: Optional[List[str]] = None, pending: Optional[List[Tuple[str, int]]] = None,
+                 answers: Optional[Dict[str, Dict[str, str]]] = None):
+        self.original_text = original_text
+        self.intent = intent
+        self.detected_language = detected_language
+        self.language = language or detected_language # Language questions are asked in
+        self.entities = [tuple(entity) for entity in entities or []] # Symptom entities: (text, KB symptom_name or None)
+        self.symptom_ids = list(symptom_ids or []) # Relevant KB symptoms, in the order found
+        self.pending = [tuple(question) for question in pending or []] # Follow-ups still to ask: (symptom id, question index)
+        self.answers = {symptom: dict(qa_pairs) for symptom, qa_pairs in (answers or {}).items()} # symptom id -> {question: answer}
+
+    @classmethod
+    def from_nlu_result(cls, nlu_result: NLUResult, language: Optional[str] = None) -> "SymptomSessionState":
+        intent = getattr(nlu_result.intent, "value", nlu_result.intent)
+        entities = [(entity.text, getattr(entity, "canonical_name", None))
+                    for entity in nlu_result.entities if entity.entity_type == "symptom"]
+        return cls(nlu_result.original_text, intent, nlu_result.language_detected or "en-IN", language, entities)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form (lists, strings and ints only)"""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SymptomSessionState":
+        return cls(**{slot: data[slot] for slot in cls.__slots__ if slot in data})
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SymptomSessionState) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"SymptomSessionState({self.to_dict()!r})"
+
+
 class SymptomChecker:
     DEFAULT_ASSESSMENT_ERROR = {
         "assessment_summary": "Could not generate a preliminary assessment at this time.",
@@ -72,93 +131,154 @@ class SymptomChecker:
         "disclaimer": "This information is for general guidance only and is not a medical diagnosis. Please consult a qualified healthcare professional for any health concerns or before making any decisions related to your health."
     }
 
-    def __init__(self, nlu_result: NLUResult, api_key: Optional[str] = None, symptom_kb_path="src/symptom_knowledge_base.json"):
+    def __init__(self, nlu_result: Optional[NLUResult] = None, api_key: Optional[str] = None, symptom_kb_path=DEFAULT_KB_PATH,
+                 request_policy: Optional[RequestPolicy] = None, language: Optional[str] = None,
+                 localization_path=DEFAULT_KB_LOCALIZATION_PATH, state: Optional[SymptomSessionState] = None,
+                 sarvam_client: Optional[SarvamAPIClient] = None, utils: Optional[HealHubUtilities] = None,
+                 questioner: Optional[AdaptiveQuestioner] = None):
         self.nlu_result = nlu_result
-        self.sarvam_client = SarvamAPIClient(api_key=api_key)
-        self.utils = HealHubUtilities(api_key=api_key)
-        self.symptom_kb: Optional[Dict[str, Dict]] = None # Stores symptom_name.lower() -> symptom_data
-        self.collected_symptom_details: Dict[str, Dict[str, str]] = {} # symptom_name.lower() -> {question: answer}
-        self.pending_follow_up_questions: List[Dict[str, str]] = [] # List of {"symptom_name": str, "question": str}
+        # Per-session state; everything else on the checker is shared or injected
+        self.state = state if state is not None else SymptomSessionState.from_nlu_result(nlu_result, language)
+        self.language = self.state.language # Language questions are asked in
+        self.sarvam_client = sarvam_client if sarvam_client is not None else SarvamAPIClient(api_key=api_key)
+        self.request_policy = request_policy  # None uses the transport's default "chat" policy
+        self.utils = utils if utils is not None else HealHubUtilities(api_key=api_key)
+        self._localization_mismatch_warned: Optional[Tuple[str, str]] = None
+        # Information-gain question selection (HEALHUB_ADAPTIVE_QUESTIONS=1); None asks every question in KB order
+        self.questioner = questioner if questioner is not None else AdaptiveQuestioner.from_env()
         self._load_symptom_kb(symptom_kb_path)
+        self._load_localization(localization_path)
+
+    @classmethod
+    def from_state(cls, state: SymptomSessionState, **kwargs) -> "SymptomChecker":
+        """Rebuild a checker around a saved session (services can be passed as sarvam_client=/utils=)"""
+        return cls(state=state, **kwargs)
+
+    @property
+    def collected_symptom_details(self) -> Dict[str, Dict[str, str]]:
+        # symptom_name.lower() -> {question: answer}
+        return self.state.answers
+
+    @property
+    def pending_follow_up_questions(self) -> List[Dict[str, str]]:
+        # List of {"symptom_name": str, "question": str, + localized}
+        return [question for question in (self._question_data(*pending) for pending in self.state.pending) if question]
 
     def _load_symptom_kb(self, filepath: str):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                kb = json.load(f)
-                if "symptoms" in kb and isinstance(kb["symptoms"], list):
-                    self.symptom_kb = {s['symptom_name'].lower(): s for s in kb['symptoms']}
-                    print(f"✅ Symptom knowledge base loaded successfully from {filepath}. {len(self.symptom_kb)} symptoms processed.")
-                else:
-                    print(f"⚠️ Warning: 'symptoms' key not found or not a list in {filepath}. Symptom checker may not function correctly.")
-                    self.symptom_kb = {}
-        except FileNotFoundError:
-            print(f"🚨 Error: Symptom knowledge base file not found at {filepath}")
-            self.symptom_kb = {}
-        except json.JSONDecodeError:
-            print(f"🚨 Error: Could not decode JSON from {filepath}")
-            self.symptom_kb = {}
+        # Shared, read-only view from the process-wide registry (parsed once, reloaded on change)
+        self.symptom_kb_path = filepath
+        get_knowledge_registry().symptom_kb(filepath)
+
+    def _load_localization(self, filepath: str):
+        self.localization_path = filepath
+        get_knowledge_registry().kb_localization(filepath)
+
+    # The KB and its indexes are looked up in the registry on every use, so a session that
+    # outlives a KB reload asks its next questions from the new snapshot
+    def _knowledge(self) -> SymptomKnowledge:
+        return get_knowledge_registry().symptom_kb(self.symptom_kb_path)
+
+    @property
+    def symptom_kb(self) -> Mapping[str, Mapping]:
+        # Read-only symptom_name.lower() -> symptom_data
+        return self._knowledge().by_name
+
+    @property
+    def symptom_index(self) -> SymptomIndex:
+        # Inverted index over KB names and keywords
+        return self._knowledge().index
+
+    @property
+    def semantic_matcher(self) -> SemanticSymptomMatcher:
+        # Dense n-gram matrix for paraphrases
+        return self._knowledge().semantic
+
+    @property
+    def localized_kb(self) -> Mapping[str, Mapping]:
+        # symptom_name.lower() -> KB strings in self.language. English is the KB itself; other
+        # languages come from the offline localization build, if it matches the current KB
+        kb = self._knowledge()
+        if self.language.startswith("en"):
+            return kb.by_name
+        localization = get_knowledge_registry().kb_localization(self.localization_path)
+        if localization.error:
+            return {}
+        if localization.version.get("kb_fingerprint") != kb.fingerprint:
+            if self._localization_mismatch_warned != (localization.source, kb.fingerprint):
+                self._localization_mismatch_warned = (localization.source, kb.fingerprint)
+                print(f"⚠️ KB localization in {localization.source} was built for a different KB; translating live. "
+                      f"Rebuild with: python src/kb_build.py localize")
+            return {}
+        return localization.languages.get(self.language, {})
+
+    def _localized(self, symptom_name: str, field: str, position: Optional[int] = None) -> Optional[str]:
+        """Pre-localized KB string in self.language (None if the build has no translation for it)"""
+        value = self.localized_kb.get(symptom_name.lower(), {}).get(field)
+        if position is not None:
+            value = value[position] if value and position < len(value) else None
+        return value
 
     def identify_relevant_symptoms(self) -> List[Dict]:
         '''
         Identifies symptoms from the knowledge base relevant to the NLU result.
         Returns a list of symptom data dictionaries from the KB.
         '''
-        if not self.symptom_kb:
+        kb = self._knowledge() # One snapshot for the whole lookup
+        if not kb.by_name:
             print("ℹ️ Symptom knowledge base not loaded. Cannot identify relevant symptoms.")
             return []
 
-        relevant_symptoms_data = []
-        processed_symptom_kb_names = set() # Tracks KB symptom names already added
+        relevant_symptoms: Dict[str, Mapping] = {} # symptom_name.lower() -> symptom_data, in the order found
         
-        for entity in self.nlu_result.entities:
-            if entity.entity_type == "symptom":
-                entity_text_lower = self.utils.translate_text_to_english(entity.text).lower()
-                # Attempt direct match with symptom_name (which are keys in self.symptom_kb)
-                if entity_text_lower in self.symptom_kb and entity_text_lower not in processed_symptom_kb_names:
-                    relevant_symptoms_data.append(self.symptom_kb[entity_text_lower])
-                    processed_symptom_kb_names.add(entity_text_lower)
-                    continue
-
-                # If no direct match on entity_text_lower as a primary key,
-                # iterate through KB to check keywords for each symptom.
-                for kb_symptom_name_lower, kb_symptom_data in self.symptom_kb.items():
-                    if kb_symptom_name_lower in processed_symptom_kb_names:
-                        continue # Already added this KB symptom
-
-                    # Check if entity_text_lower is one of the keywords for this KB symptom
-                    # Also, check if entity_text_lower contains any of the keywords or vice-versa (more flexible)
-                    # Or if the kb_symptom_name_lower itself is present in entity_text_lower
-                    # This handles cases like "terrible cough" matching "cough"
-
-                    # Check if kb_symptom_name (the key) is in entity_text_lower
-                    if kb_symptom_name_lower in entity_text_lower:
-                        relevant_symptoms_data.append(kb_symptom_data)
-                        processed_symptom_kb_names.add(kb_symptom_name_lower)
-                        break # Found match for this entity, move to next entity
-
-                    # Check keywords
-                    found_keyword_match = False
-                    for keyword in kb_symptom_data.get("keywords", []):
-                        if keyword.lower() in entity_text_lower:
-                            relevant_symptoms_data.append(kb_symptom_data)
-                            processed_symptom_kb_names.add(kb_symptom_name_lower)
-                            found_keyword_match = True
-                            break
-                    if found_keyword_match:
-                        break # Found keyword match for this entity, move to next entity
-
+        language = self.state.detected_language
+        entities = self.state.entities # (text, canonical KB name) of each symptom entity
+        candidates = [self._lexical_candidates(kb, text, canonical_name, language) for text, canonical_name in entities]
+
+        # Paraphrases no name, keyword or alias covers ("my head is pounding"): nearest KB phrases by
+        # n-gram TF-IDF cosine, every unresolved entity scored against the whole KB in one matrix product
+        unresolved = [position for position, found in enumerate(candidates) if not found]
+        if unresolved:
+            for position, matches in zip(unresolved, kb.semantic.match([entities[position][0] for position in unresolved])):
+                candidates[position] = [match.entry for match in matches]
+
+        # Translation is only the fallback for entities nothing local resolves
+        for position, (text, _) in enumerate(entities):
+            if not candidates[position]:
+                print(f"🌐 No local KB match for '{text}' ({language}); translating to English to match.")
+                english_text = self.utils.translate_text_to_english(text)
+                candidates[position] = self._lexical_candidates(kb, english_text)
+                if not candidates[position]:
+                    candidates[position] = [match.entry for match in kb.semantic.match([english_text])[0]]
+
+        # Each entity contributes one symptom: the best one not already found for an earlier entity
+        for found in candidates:
+            for entry in found:
+                if entry["symptom_name"].lower() not in relevant_symptoms:
+                    relevant_symptoms[entry["symptom_name"].lower()] = entry
+                    break
+
+        relevant_symptoms_data = list(relevant_symptoms.values())
         if not relevant_symptoms_data:
             print("ℹ️ No relevant symptoms identified from NLU entities based on current KB.")
         return relevant_symptoms_data
 
+    def _lexical_candidates(self, kb: SymptomKnowledge, text: str, canonical_name: Optional[str] = None,
+                            language: Optional[str] = None) -> List[Mapping]:
+        # Entities found by KB keyword matching already name their symptom
+        if canonical_name and canonical_name.lower() in kb.by_name:
+            return [kb.by_name[canonical_name.lower()]]
+        # KB symptoms whose name, keyword or alias in the user's language occurs in the text (stemmed, whole words), best first
+        return [match.entry for match in kb.index.search(text, language, partial=False)]
+
     def prepare_follow_up_questions(self):
         '''
         Prepares a list of follow-up questions for relevant symptoms.
         Questions are not asked if details for that symptom are already collected
         or if the question was already posed in the current pending list.
         '''
-        self.pending_follow_up_questions = [] # Clear previous pending questions
+        self.state.pending = [] # Clear previous pending questions
         relevant_symptoms = self.identify_relevant_symptoms()
+        self.state.symptom_ids = [symptom_data["symptom_name"].lower() for symptom_data in relevant_symptoms]
 
         # Using a set for existing_pending_texts to ensure unique questions in the current batch
         existing_pending_texts = set()
@@ -176,25 +296,69 @@ class SymptomChecker:
                 # For now, if any answer is recorded, skip re-adding its general follow-ups.
                 continue
 
-            for question_text in symptom_data.get("follow_up_questions", []):
+            for position, question_text in enumerate(symptom_data.get("follow_up_questions", [])):
                 if question_text not in existing_pending_texts:
-                    self.pending_follow_up_questions.append({
-                        "symptom_name": symptom_name_kb, # Use KB's canonical symptom name
-                        "question": question_text
-                    })
+                    self.state.pending.append((symptom_name_kb.lower(), position)) # Resolved against the KB when asked
                     existing_pending_texts.add(question_text)
 
-        print(f"ℹ️ Prepared {len(self.pending_follow_up_questions)} follow-up questions.")
+        print(f"ℹ️ Prepared {len(self.state.pending)} follow-up questions.")
 
 
     def get_next_question(self) -> Optional[Dict[str, str]]:
         '''
         Returns the next follow-up question and removes it from the pending list.
         Returns None if no questions are pending.
+        With a questioner, the most informative pending question is asked instead of the
+        first, and the remaining ones are dropped once it decides to stop.
+        '''
+        if self.questioner is not None:
+            return self._adaptive_question(remove=True)
+        while self.state.pending:
+            question = self._question_data(*self.state.pending.pop(0))
+            if question is not None:
+                return question
+        return None
+
+    def peek_next_question(self) -> Optional[Dict[str, str]]:
         '''
-        if not self.pending_follow_up_questions:
+        Returns the question get_next_question() would return, without removing it.
+        Used to prefetch the next question's translation while the current one is shown.
+        '''
+        if self.questioner is not None:
+            return self._adaptive_question(remove=False)
+        for symptom_id, position in self.state.pending:
+            question = self._question_data(symptom_id, position)
+            if question is not None:
+                return question
+        return None
+
+    def _adaptive_question(self, remove: bool) -> Optional[Dict[str, str]]:
+        symptom_kb = self.symptom_kb
+        symptoms = {symptom_id: symptom_kb[symptom_id] for symptom_id in self.state.symptom_ids if symptom_id in symptom_kb}
+        index = self.questioner.next_question(symptoms, self.state.pending, self.state.answers,
+                                              self.state.original_text, self.state.language)
+        if index is None:
+            if remove and self.state.pending:
+                print(f"ℹ️ Enough information for the assessment; skipping {len(self.state.pending)} follow-up questions.")
+                self.state.pending = []
+            return None
+        symptom_id, position = self.state.pending.pop(index) if remove else self.state.pending[index]
+        return self._question_data(symptom_id, position)
+
+    def _question_data(self, symptom_id: str, position: int) -> Optional[Dict[str, str]]:
+        symptom_data = self.symptom_kb.get(symptom_id) if self.symptom_kb else None
+        questions = symptom_data.get("follow_up_questions", ()) if symptom_data else ()
+        if position >= len(questions):
+            print(f"⚠️ Follow-up question {position} of '{symptom_id}' is no longer in the knowledge base; skipping it.")
             return None
-        return self.pending_follow_up_questions.pop(0)
+        symptom_name_kb = symptom_data["symptom_name"]
+        return {
+            "symptom_name": symptom_name_kb, # Use KB's canonical symptom name
+            "question": questions[position],
+            # Pre-localized strings to show the user (None: translate live)
+            "localized_symptom_name": self._localized(symptom_name_kb, "symptom_name"),
+            "localized_question": self._localized(symptom_name_kb, "follow_up_questions", position),
+        }
 
     def record_answer(self, symptom_name: str, question_asked: str, user_answer: str):
         '''
@@ -207,23 +371,28 @@ class SymptomChecker:
         self.collected_symptom_details[symptom_name_lower][question_asked] = user_answer
         print(f"📝 Recorded answer for {symptom_name_lower} regarding '{question_asked}'.")
 
-    def _clean_llm_json_response(self, response_content: str) -> str:
-        response_content = response_content.strip()
-        if response_content.startswith("```json"): # Handles ```json
-            response_content = response_content[7:]
-        elif response_content.startswith("```"): # Handles ```
-            response_content = response_content[3:]
-
-        if response_content.endswith("```"):
-            response_content = response_content[:-3]
-        return response_content.strip()
+    def relevant_kb_triage_points(self, symptom_ids: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+        '''
+        KB triage points for the symptoms answered so far (or for `symptom_ids`), in order:
+        English point -> pre-localized point (None: translate live).
+        '''
+        relevant_kb_triage_points = {}
+        symptom_kb = self.symptom_kb
+        if symptom_kb: # Check if KB is loaded
+            symptom_ids = self.collected_symptom_details.keys() if symptom_ids is None else symptom_ids
+            for symptom_name_lower in symptom_ids: # these are already lower
+                symptom_data_from_kb = symptom_kb.get(symptom_name_lower)
+                if symptom_data_from_kb and "basic_triage_points" in symptom_data_from_kb:
+                    for position, point in enumerate(symptom_data_from_kb["basic_triage_points"]):
+                        relevant_kb_triage_points.setdefault(point, self._localized(symptom_name_lower, "basic_triage_points", position))
+        return relevant_kb_triage_points
 
     def generate_preliminary_assessment(self) -> Dict[str, Any]:
         if not self.sarvam_client or not getattr(self.sarvam_client, 'api_key', None): # Check for client and its api_key
             print("🚨 Error: SarvamAPIClient not available or API key missing for assessment.")
             return self.DEFAULT_ASSESSMENT_ERROR.copy()
 
-        full_symptom_description = f"User's initial query: {self.nlu_result.original_text}\n\nDetails from follow-up questions:\n"
+        full_symptom_description = f"User's initial query: {self.state.original_text}\n\nDetails from follow-up questions:\n"
         if not self.collected_symptom_details:
             full_symptom_description += "No follow-up details were collected.\n"
         else:
@@ -250,25 +419,27 @@ Keep your language empathetic and clear. Base your entire response on the user q
         llm_content_raw = "" # Initialize for logging in case of early failure
         try:
             print("🔄 Calling Sarvam-M for preliminary assessment...")
-            response = self.sarvam_client.chat_completion(messages=messages, temperature=0.4, max_tokens=600)
+            # Streamed and cut off as soon as the JSON object closes (any trailing prose is never read)
+            # Never cached: the assessment is for this session's answers
+            response = self.sarvam_client.chat_completion(messages=messages, temperature=0.4, max_tokens=600,
+                                                         policy=self.request_policy, structured=True, use_cache=False)
 
             if not response or "choices" not in response or not response["choices"]:
                 print("🚨 Error: Invalid response structure from LLM.")
                 return self.DEFAULT_ASSESSMENT_ERROR.copy()
 
             llm_content_raw = response["choices"][0]["message"]["content"]
-            llm_content_cleaned = self._clean_llm_json_response(llm_content_raw)
-
-            if not llm_content_cleaned: # If cleaning results in empty string
-                print(f"🚨 Error: LLM response content was empty after cleaning: {llm_content_raw}")
+            if not llm_content_raw.strip():
+                print("🚨 Error: LLM response content was empty.")
                 return self.DEFAULT_ASSESSMENT_ERROR.copy()
 
-            llm_assessment_data = json.loads(llm_content_cleaned)
+            # First JSON object in the reply; code fences and surrounding prose are ignored
+            llm_assessment_data = parse_json_object(llm_content_raw)
 
             required_keys = ["assessment_summary", "suggested_severity", "recommended_next_steps", "potential_warnings", "disclaimer"]
             for key in required_keys:
                 if key not in llm_assessment_data:
-                    print(f"🚨 Error: LLM response missing required key: '{key}' from content: {llm_content_cleaned}")
+                    print(f"🚨 Error: LLM response missing required key: '{key}' from content: {llm_content_raw}")
                     error_copy = self.DEFAULT_ASSESSMENT_ERROR.copy()
                     error_copy["potential_warnings"].append(f"LLM output parsing issue: missing key '{key}'.")
                     return error_copy
@@ -284,14 +455,9 @@ Keep your language empathetic and clear. Base your entire response on the user q
             traceback.print_exc()
             return self.DEFAULT_ASSESSMENT_ERROR.copy()
 
-        relevant_kb_triage_points = []
-        if self.symptom_kb: # Check if KB is loaded
-            for symptom_name_lower in self.collected_symptom_details.keys(): # these are already lower
-                symptom_data_from_kb = self.symptom_kb.get(symptom_name_lower)
-                if symptom_data_from_kb and "basic_triage_points" in symptom_data_from_kb:
-                    relevant_kb_triage_points.extend(symptom_data_from_kb["basic_triage_points"])
-
-        llm_assessment_data["relevant_kb_triage_points"] = list(set(relevant_kb_triage_points))
+        relevant_kb_triage_points = self.relevant_kb_triage_points()
+        llm_assessment_data["relevant_kb_triage_points"] = list(relevant_kb_triage_points)
+        llm_assessment_data["localized_kb_triage_points"] = list(relevant_kb_triage_points.values())
 
         return llm_assessment_data
 
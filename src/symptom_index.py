@@ -0,0 +1,236 @@
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    from src.text_features import tokenize
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.text_features import tokenize
+
+# Inflectional suffixes stripped by stem(), longest first. Deliberately small: plural and
+# common verb endings only (plus "-ish", so "feverish" finds fever), applied identically
+# to KB phrases and queries.
+STEM_SUFFIXES: Dict[str, Tuple[str, ...]] = {
+    "en": ("ies", "ing", "ish", "ed", "s"),
+    "hi": ("ियों", "ियाँ", "ियां", "ाओं", "ाएँ", "ाएं", "ों", "ें", "ीं"),
+    "mr": ("ांना", "ांची", "ांचा", "ांचे", "ाला", "ांत", "ात", "ां"),
+    "bn": ("গুলো", "গুলি", "দের", "ের"),
+    "ta": ("க்கள்", "கள்"),
+    "te": ("లు",),
+    "kn": ("ಗಳು",),
+    "ml": ("കൾ",),
+}
+
+# First codepoint of each script block -> default stemming language for tokens in that script
+_SCRIPT_BLOCKS = ((0x0900, 0x0980, "hi"), (0x0980, 0x0A00, "bn"), (0x0B80, 0x0C00, "ta"),
+                  (0x0C00, 0x0C80, "te"), (0x0C80, 0x0D00, "kn"), (0x0D00, 0x0D80, "ml"))
+_LANGUAGE_SCRIPT = {"en": "en", "hi": "hi", "mr": "hi", "bn": "bn", "ta": "ta", "te": "te", "kn": "kn", "ml": "ml"}
+_MIN_STEM_LENGTH = 2
+_KEEP_FINAL_S = ("ss", "us", "is")
+_SIBILANT_PLURALS = ("ches", "shes", "sses", "xes", "zes")  # "itches" -> "itch", not "itche"
+_VOWELS = "aeiou"
+
+
+def _script_language(token: str) -> str:
+    codepoint = ord(token[0])
+    for start, end, language in _SCRIPT_BLOCKS:
+        if start <= codepoint < end:
+            return language
+    return "en"
+
+
+def stem(token: str, language: Optional[str] = None) -> str:
+    """
+    Light suffix stripping for one normalized token. `language` (e.g. "hi" or "hi-IN")
+    picks the suffix table when it matches the token's script; otherwise the script decides.
+    """
+    if not token:
+        return token
+    script_language = _script_language(token)
+    language = (language or "").split("-")[0]
+    if _LANGUAGE_SCRIPT.get(language) != script_language:
+        language = script_language
+    if language == "en":
+        return _stem_english(token)
+    for suffix in STEM_SUFFIXES.get(language, ()):
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+
+def _strip_english_suffix(token: str) -> str:
+    for suffix in STEM_SUFFIXES["en"]:
+        if not token.endswith(suffix) or len(token) - len(suffix) < _MIN_STEM_LENGTH:
+            continue
+        if suffix == "ies":
+            return token[:-3] + "y"
+        if suffix == "s":
+            if token.endswith(_SIBILANT_PLURALS):
+                return token[:-2]
+            # "gas", "has": too short to be a plural
+            return token if token.endswith(_KEEP_FINAL_S) or len(token) <= 3 else token[:-1]
+        if suffix == "ed" and token.endswith("eed"):
+            return token  # "bleed", "need": not a past tense
+        base = token[:-len(suffix)]
+        if len(base) < 3:
+            return token
+        # "running" -> "runn" -> "run"
+        if len(base) > 3 and base[-1] == base[-2] and base[-1] not in "lsz":
+            base = base[:-1]
+        return base
+    return token
+
+
+def _stem_english(token: str) -> str:
+    """
+    Strip one inflectional suffix, then normalize the stem's ending so every form of a
+    word meets: a final silent "e" is dropped ("ache", "aches", "aching", "ached" -> "ach";
+    "breathe", "breathing" -> "breath") and so is an adjective "-y" after a consonant
+    ("itchy" -> "itch", "watery" -> "water").
+    """
+    stem_ = _strip_english_suffix(token)
+    if len(stem_) > 4 and stem_.endswith("y") and stem_[-2] not in _VOWELS:
+        stem_ = stem_[:-1]
+        if stem_[-1] == stem_[-2] and stem_[-1] not in "lsz":  # "runny" -> "run"
+            stem_ = stem_[:-1]
+    if len(stem_) > 3 and stem_.endswith("e") and not stem_.endswith("ee"):
+        stem_ = stem_[:-1]
+    return stem_
+
+
+def stemmed_tokens(text: str, language: Optional[str] = None) -> Tuple[str, ...]:
+    return tuple(stem(token, language) for token in tokenize(text))
+
+
+@dataclass(frozen=True)
+class SymptomMatch:
+    symptom_name: str
+    entry: Mapping[str, Any]      # The KB entry
+    score: float                  # >= 1 for a whole name/keyword match, < 1 for partial token overlap
+    phrase: Optional[str]         # The name or keyword that matched whole, if any
+
+    @property
+    def exact(self) -> bool:
+        return self.phrase is not None
+
+
+class SymptomIndex:
+    """
+    Inverted index from KB symptom names, keywords and per-language keyword aliases
+    to KB entries.
+
+    Phrases are normalized (NFC + casefold), tokenized and stemmed, and stored as token
+    tuples, so an entity is matched by looking up each of its token n-grams (up to
+    the longest indexed phrase): O(tokens) dictionary lookups however large the KB.
+    A posting list per token also ranks partial overlaps ("chest" -> "chest pain")
+    by inverse document frequency, below any whole-phrase match.
+    """
+
+    def __init__(self, symptoms: Sequence[Mapping[str, Any]]):
+        self.symptoms = tuple(symptoms)
+        self.phrases: Dict[Tuple[str, ...], List[Tuple[int, str, bool]]] = {}  # tokens -> [(symptom id, phrase, is name)]
+        self.postings: Dict[str, List[int]] = {}                                 # token -> symptom ids
+        self.max_phrase_tokens = 1
+        for symptom_id, symptom in enumerate(self.symptoms):
+            self.add_phrase(symptom_id, symptom["symptom_name"], is_name=True)
+            for keyword in symptom.get("keywords", ()):
+                self.add_phrase(symptom_id, keyword)
+            for language, aliases in symptom.get("keyword_aliases", {}).items():
+                for alias in aliases:
+                    self.add_phrase(symptom_id, alias, language=language)
+        self.idf = {token: math.log(1 + len(self.symptoms) / len(ids)) for token, ids in self.postings.items()}
+
+    def add_phrase(self, symptom_id: int, phrase: str, is_name: bool = False, language: Optional[str] = None):
+        tokens = stemmed_tokens(phrase, language)
+        if not tokens:
+            return
+        entries = self.phrases.setdefault(tokens, [])
+        if all(existing_id != symptom_id for existing_id, _, _ in entries):
+            entries.append((symptom_id, phrase, is_name))
+        for token in set(tokens):
+            ids = self.postings.setdefault(token, [])
+            if not ids or ids[-1] != symptom_id:
+                ids.append(symptom_id)
+        self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+
+    def search(self, text: str, language: Optional[str] = None, limit: int = 5,
+               partial: bool = True) -> List[SymptomMatch]:
+        """
+        Ranked candidate symptoms for an entity text: whole name/keyword matches first
+        (longer phrases and symptom names rank higher), then partial token overlaps.
+        """
+        tokens = stemmed_tokens(text, language)
+        scores: Dict[int, Tuple[float, Optional[str]]] = {}
+        for start in range(len(tokens)):
+            for end in range(start + 1, min(len(tokens), start + self.max_phrase_tokens) + 1):
+                for symptom_id, phrase, is_name in self.phrases.get(tokens[start:end], ()):
+                    score = (end - start) + (0.5 if is_name else 0.0)
+                    if score > scores.get(symptom_id, (0.0, None))[0]:
+                        scores[symptom_id] = (score, phrase)
+
+        if partial:
+            overlap: Dict[int, float] = {}
+            for token in set(tokens):
+                for symptom_id in self.postings.get(token, ()):
+                    if symptom_id not in scores:
+                        overlap[symptom_id] = overlap.get(symptom_id, 0.0) + self.idf[token]
+            for symptom_id, weight in overlap.items():
+                scores[symptom_id] = (weight / (weight + 1.0), None)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1][0], item[0]))[:limit]
+        return [SymptomMatch(self.symptoms[symptom_id]["symptom_name"], self.symptoms[symptom_id], score, phrase)
+                for symptom_id, (score, phrase) in ranked]
+
+    def best(self, text: str, language: Optional[str] = None) -> Optional[SymptomMatch]:
+        """The top whole-phrase match for an entity text, or None"""
+        matches = self.search(text, language, limit=1, partial=False)
+        return matches[0] if matches else None
+
+
+def _linear_scan(symptoms: Sequence[Mapping[str, Any]], entity_text: str) -> Optional[Mapping[str, Any]]:
+    """The substring scan SymptomIndex replaces, kept for the benchmark"""
+    entity_text = entity_text.lower()
+    for symptom in symptoms:
+        if symptom["symptom_name"].lower() in entity_text:
+            return symptom
+        if any(keyword.lower() in entity_text for keyword in symptom.get("keywords", ())):
+            return symptom
+    return None
+
+
+def synthetic_kb(size: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """A KB of `size` symptoms with two- and three-word names and keywords, for benchmarks"""
+    import random
+    rng = random.Random(seed)
+    syllables = ["ka", "ro", "mi", "tu", "sel", "pra", "dho", "vin", "ga", "lu", "ner", "sha", "bi", "co", "dan"]
+    vocabulary = sorted({"".join(rng.choices(syllables, k=3)) for _ in range(4000)})
+    names = set()
+    while len(names) < size:
+        names.add(" ".join(rng.sample(vocabulary, rng.choice((2, 3)))))
+    return [{"symptom_name": name, "keywords": [" ".join(rng.sample(vocabulary, 2)) for _ in range(3)]}
+            for name in sorted(names)]
+
+
+if __name__ == "__main__":
+    # Benchmark: entity lookups against a synthetic 10k-symptom KB, index vs. linear substring scan
+    import random
+    import time
+
+    kb = synthetic_kb(10_000)
+    start = time.perf_counter()
+    index = SymptomIndex(kb)
+    print(f"Indexed {len(kb)} symptoms ({len(index.phrases)} phrases, {len(index.postings)} tokens) "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rng = random.Random(1)
+    queries = [f"severe {rng.choice(kb)['symptom_name']} since yesterday" for _ in range(500)]
+    queries += [f"mild {rng.choice(rng.choice(kb)['keywords'])}" for _ in range(500)]
+    for name, lookup in [("index", lambda text: index.best(text)), ("linear scan", lambda text: _linear_scan(kb, text))]:
+        sample = queries if name == "index" else queries[:100]
+        start = time.perf_counter()
+        hits = sum(lookup(text) is not None for text in sample)
+        elapsed = time.perf_counter() - start
+        print(f"{name:12s} {len(sample)} lookups, {hits} hits: {elapsed / len(sample) * 1e6:,.0f} µs/lookup")
@@ -0,0 +1,78 @@
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from src.phrase_matcher import normalize_text
+except ImportError:
+    import os
+    import sys
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    from src.phrase_matcher import normalize_text
+
+# Letters, digits and combining marks (Indic vowel signs are marks, not \w on their own)
+WORD_PATTERN = re.compile(r"[^\W_][\wऀ-෿]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens of `text` (NFC + casefold), keeping Indic matras attached"""
+    return WORD_PATTERN.findall(normalize_text(text))
+
+
+def char_ngrams(tokens: Sequence[str], ngram_range: Tuple[int, int]) -> Iterable[str]:
+    """Character n-grams of each token padded with spaces, so prefixes and suffixes get their own grams"""
+    low, high = ngram_range
+    for token in tokens:
+        padded = f" {token} "
+        for n in range(low, high + 1):
+            for start in range(len(padded) - n + 1):
+                yield padded[start:start + n]
+
+
+@dataclass(frozen=True)
+class HashedNgramVectorizer:
+    """
+    Stateless text -> vector mapping: character n-grams plus word unigrams and
+    bigrams, hashed (CRC32, stable across processes) into `n_features` buckets.
+    Counts are log-scaled and each row is L2-normalized.
+
+    Being stateless there is no vocabulary to ship; a model only has to store
+    these parameters (see to_dict/from_dict).
+    """
+    n_features: int = 2 ** 13
+    char_ngram_range: Tuple[int, int] = (2, 4)
+    word_ngrams: int = 2
+
+    def features(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        grams = list(char_ngrams(tokens, self.char_ngram_range))
+        for n in range(1, self.word_ngrams + 1):
+            grams.extend("w:" + " ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def indices(self, text: str) -> np.ndarray:
+        return np.fromiter((zlib.crc32(gram.encode("utf-8")) % self.n_features for gram in self.features(text)),
+                           dtype=np.int64)
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Dense (len(texts), n_features) float32 matrix"""
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            np.add.at(matrix[row], self.indices(text), 1.0)
+        np.log1p(matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def to_dict(self) -> Dict:
+        return {"n_features": self.n_features, "char_ngram_range": list(self.char_ngram_range),
+                "word_ngrams": self.word_ngrams}
+
+    @classmethod
+    def from_dict(cls, params: Dict) -> "HashedNgramVectorizer":
+        return cls(n_features=int(params["n_features"]),
+                   char_ngram_range=tuple(params["char_ngram_range"]),
+                   word_ngrams=int(params["word_ngrams"]))
@@ -3,10 +3,10 @@ import streamlit.components.v1 as components
 import os
 import json
 import time # For polling audio capture status
+import threading
 import numpy as np # For checking audio data (though not directly used in this version)
 from dotenv import load_dotenv
 from typing import Optional
-import re
 from streamlit_mic_recorder import mic_recorder
 import soundfile as sf
 import io
@@ -17,18 +17,20 @@ from firebase_admin import credentials, firestore
 # Adjust import paths
 try:
     from src.nlu_processor import SarvamMNLUProcessor, HealthIntent, NLUResult
-    from src.response_generator import HealHubResponseGenerator
+    from src.response_generator import HealHubResponseGenerator, get_emergency_response
     from src.symptom_checker import SymptomChecker
     from src.audio_capture import AudioCleaner # Import audio modules
     from src.utils import HealHubUtilities
+    from src.prefetch import FollowUpPrefetcher, assessment_display_parts
 except ImportError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
     from src.nlu_processor import SarvamMNLUProcessor, HealthIntent, NLUResult
-    from src.response_generator import HealHubResponseGenerator
+    from src.response_generator import HealHubResponseGenerator, get_emergency_response
     from src.symptom_checker import SymptomChecker
     from src.audio_capture import AudioCleaner
     from src.utils import HealHubUtilities
+    from src.prefetch import FollowUpPrefetcher, assessment_display_parts
 
 # --- Environment and API Key Setup ---
 load_dotenv()
@@ -47,10 +49,17 @@ if 'text_query_input_area' not in st.session_state:
 # Symptom Checker states
 if 'symptom_checker_active' not in st.session_state:
     st.session_state.symptom_checker_active = False
-if 'symptom_checker_instance' not in st.session_state:
-    st.session_state.symptom_checker_instance = None
+if 'symptom_session' not in st.session_state:
+    # Only the compact SymptomSessionState is kept per session; checkers are rebuilt around it on each turn
+    st.session_state.symptom_session = None
 if 'pending_symptom_question_data' not in st.session_state:
     st.session_state.pending_symptom_question_data = None
+if 'follow_up_prefetcher' not in st.session_state:
+    # Background translation of the next question / the assessment for the active symptom session
+    st.session_state.follow_up_prefetcher = None
+if 'assessment_pending' not in st.session_state:
+    # The last answer is in and the assessment is running in the background; collected after the page renders
+    st.session_state.assessment_pending = False
 
 # Voice Input states
 if 'voice_input_stage' not in st.session_state:
@@ -80,8 +89,32 @@ LANGUAGE_MAP = {
 DISPLAY_LANGUAGES = list(LANGUAGE_MAP.keys())
 
 
+@st.cache_resource(show_spinner=False)
+def start_translation_warmup():
+    """Warm the shared translation cache once per process, in the background."""
+    util = HealHubUtilities(api_key=SARVAM_API_KEY)
+    warmup_thread = threading.Thread(
+        target=util.warm_translation_cache,
+        kwargs={"extra_texts": [SymptomChecker.DEFAULT_ASSESSMENT_ERROR["disclaimer"]]},
+        name="translation-warmup",
+        daemon=True,
+    )
+    warmup_thread.start()
+    return warmup_thread
+
+
 
 # --- Helper Functions ---
+def end_symptom_session():
+    """Drop the symptom checker conversation and cancel any prefetch work still queued for it."""
+    if st.session_state.follow_up_prefetcher is not None:
+        st.session_state.follow_up_prefetcher.cancel()
+    st.session_state.symptom_checker_active = False
+    st.session_state.symptom_session = None
+    st.session_state.pending_symptom_question_data = None
+    st.session_state.follow_up_prefetcher = None
+    st.session_state.assessment_pending = False
+
 def add_message_to_conversation(role: str, content: str, lang_code: Optional[str] = None):
     message = {"role": role, "content": content}
     if lang_code and role == "user":
@@ -182,6 +215,7 @@ def main_ui():
     if not SARVAM_API_KEY: 
         st.error("🚨 SARVAM_API_KEY not found. Please set it in your .env file for the application to function.")
         st.stop()
+    start_translation_warmup()
 
     col1, col2 = st.columns([3, 9])
     with col1:
@@ -198,7 +232,7 @@ def main_ui():
             st.session_state.current_language_display = selected_lang_display
             st.session_state.current_language_code = LANGUAGE_MAP[selected_lang_display]
             st.session_state.conversation = [] 
-            st.session_state.symptom_checker_active = False; st.session_state.symptom_checker_instance = None; st.session_state.pending_symptom_question_data = None
+            end_symptom_session()
             st.session_state.voice_input_stage = None
             st.rerun()
 
@@ -223,54 +257,67 @@ def main_ui():
                 
                 with spinner_placeholder.info("🧠 Thinking..."):
                     nlu_output: NLUResult = nlu_processor.process_transcription(user_query_text, source_language=lang_code)
-                    if nlu_output.intent == HealthIntent.SYMPTOM_QUERY and not nlu_output.is_emergency:
+                    if nlu_output.is_emergency:
+                        # Pre-localized reply in the user's language: no response generation or translation calls
+                        add_message_to_conversation("assistant", get_emergency_response(user_lang))
+                        st.session_state.symptom_checker_active = False
+                    elif nlu_output.intent == HealthIntent.SYMPTOM_QUERY:
+                        end_symptom_session() # Cancels prefetch work of an abandoned conversation
                         st.session_state.symptom_checker_active = True
-                        st.session_state.symptom_checker_instance = SymptomChecker(nlu_result=nlu_output, api_key=SARVAM_API_KEY)
-                        st.session_state.symptom_checker_instance.prepare_follow_up_questions()
-                        st.session_state.pending_symptom_question_data = st.session_state.symptom_checker_instance.get_next_question()
+                        symptom_checker = SymptomChecker(nlu_result=nlu_output, api_key=SARVAM_API_KEY, language=user_lang, utils=util)
+                        st.session_state.symptom_session = symptom_checker.state
+                        prefetcher = st.session_state.follow_up_prefetcher = FollowUpPrefetcher(util, user_lang)
+                        symptom_checker.prepare_follow_up_questions()
+                        st.session_state.pending_symptom_question_data = symptom_checker.get_next_question()
                         if st.session_state.pending_symptom_question_data:
-                            question_to_ask_raw = st.session_state.pending_symptom_question_data['question']
-                            symptom_context_raw = st.session_state.pending_symptom_question_data['symptom_name']
-                            question_to_ask_translated = util.translate_text(question_to_ask_raw, user_lang)
-                            symptom_context_translated = util.translate_text(symptom_context_raw, user_lang)
+                            # Pre-localized KB strings; live translation only if the localization build lacks them
+                            symptom_context_translated, question_to_ask_translated = prefetcher.question_texts(st.session_state.pending_symptom_question_data)
                             add_message_to_conversation("assistant", f"{question_to_ask_translated}: {symptom_context_translated}")
+                            prefetcher.prefetch_next(symptom_checker) # Translated while the user answers
                         else:
                             generate_and_display_assessment()
                     else:
-                        bot_response = response_gen.generate_response(user_query_text, nlu_output)
-                        translated_bot_response = util.translate_text(bot_response, user_lang)
+                        # Render the reply into the placeholder as it streams in (translated sentence by sentence)
+                        with spinner_placeholder.container():
+                            st.markdown("⚕️")
+                            translated_bot_response = st.write_stream(util.translate_stream(
+                                response_gen.generate_response_stream(user_query_text, nlu_output), user_lang))
+                        spinner_placeholder.empty()
                         add_message_to_conversation("assistant", translated_bot_response)
                         st.session_state.symptom_checker_active = False
             except Exception as e:
                 st.error(f"An error occurred: {str(e)}")
                 # Standardized error message
                 add_message_to_conversation("system", f"Sorry, an error occurred while processing your request. Please try rephrasing or try again later. (Details: {str(e)})")
-                st.session_state.symptom_checker_active = False # Reset states on error
-                st.session_state.symptom_checker_instance = None
-                st.session_state.pending_symptom_question_data = None
+                end_symptom_session() # Reset states on error
             finally:
                 st.session_state.voice_input_stage = None # Always reset voice stage after processing or error
 
         def handle_follow_up_answer(answer_text: str):
             util = HealHubUtilities(api_key=SARVAM_API_KEY)
             user_lang = st.session_state.current_language_code
-            if st.session_state.symptom_checker_instance and st.session_state.pending_symptom_question_data:
+            if st.session_state.symptom_session and st.session_state.pending_symptom_question_data:
+                symptom_checker = SymptomChecker.from_state(st.session_state.symptom_session, api_key=SARVAM_API_KEY, utils=util)
+                prefetcher = st.session_state.follow_up_prefetcher or FollowUpPrefetcher(util, user_lang)
+                st.session_state.follow_up_prefetcher = prefetcher
                 # Add user's follow-up answer to conversation log
                 add_message_to_conversation("user", answer_text, lang_code=st.session_state.current_language_code.split('-')[0])
                 
                 question_asked = st.session_state.pending_symptom_question_data['question']
                 symptom_name = st.session_state.pending_symptom_question_data['symptom_name']
                 with spinner_placeholder.info("Recording answer..."):
-                    st.session_state.symptom_checker_instance.record_answer(symptom_name, question_asked, answer_text)
-                    st.session_state.pending_symptom_question_data = st.session_state.symptom_checker_instance.get_next_question()
+                    symptom_checker.record_answer(symptom_name, question_asked, answer_text)
+                    st.session_state.pending_symptom_question_data = symptom_checker.get_next_question()
+                    if not st.session_state.pending_symptom_question_data:
+                        prefetcher.start_assessment(symptom_checker) # LLM call starts as soon as the last answer is in
                 if st.session_state.pending_symptom_question_data:
-                    question_to_ask_raw = st.session_state.pending_symptom_question_data['question']
-                    symptom_context_raw = st.session_state.pending_symptom_question_data['symptom_name']
-                    question_to_ask_translated = util.translate_text(question_to_ask_raw, user_lang)
-                    symptom_context_translated = util.translate_text(symptom_context_raw, user_lang)
+                    # Prefetched on the previous turn: served from the translation cache
+                    symptom_context_translated, question_to_ask_translated = prefetcher.question_texts(st.session_state.pending_symptom_question_data)
                     add_message_to_conversation("assistant", f"{symptom_context_translated}: {question_to_ask_translated}")
+                    prefetcher.prefetch_next(symptom_checker)
                 else:
-                    generate_and_display_assessment()
+                    # Not waited on here: the page, this answer included, renders while the assessment runs
+                    st.session_state.assessment_pending = True
             else: 
                 st.warning("No pending question to answer or symptom checker not active.")
                 st.session_state.symptom_checker_active = False
@@ -293,9 +340,7 @@ def main_ui():
             else: 
                 add_message_to_conversation("user", user_input, lang_code=current_lang_code.split('-')[0])
                 if st.session_state.symptom_checker_active: # Reset if symptom checker was active but no pending q
-                    st.session_state.symptom_checker_active = False 
-                    st.session_state.symptom_checker_instance = None
-                    st.session_state.pending_symptom_question_data = None
+                    end_symptom_session()
                 # process_and_display_response will process the new query.
                 # It should NOT add the user message again.
                 process_and_display_response(user_input, current_lang_code)
@@ -304,40 +349,42 @@ def main_ui():
             # If called from a non-button context that needs immediate UI update, rerun might be needed.
 
         def generate_and_display_assessment():
+            st.session_state.assessment_pending = False
             util = HealHubUtilities(api_key=SARVAM_API_KEY)
             user_lang = st.session_state.current_language_code
-            if st.session_state.symptom_checker_instance:
+            if st.session_state.symptom_session:
+                symptom_checker = SymptomChecker.from_state(st.session_state.symptom_session, api_key=SARVAM_API_KEY, utils=util)
+                prefetcher = st.session_state.follow_up_prefetcher or FollowUpPrefetcher(util, user_lang)
                 with spinner_placeholder.info("🔬 Generating preliminary assessment..."):
-                    assessment = st.session_state.symptom_checker_instance.generate_preliminary_assessment()
+                    # Started in the background when the last answer was recorded; every label and
+                    # assessment string is translated in one batched, deduplicated call
+                    result = prefetcher.assessment(symptom_checker)
+                    if result is None: # Conversation abandoned (new query, language change)
+                        end_symptom_session()
+                        st.session_state.voice_input_stage = None
+                        return
+                    assessment, translated = result
                     try:
-                        assessment_str = f"<h4> {util.translate_text('Preliminary Health Assessment', user_lang)}:</h4>\n\n"
-                        assessment_str += f"**{util.translate_text('Summary', user_lang)}:** {util.translate_text(assessment.get('assessment_summary', 'N/A'), user_lang)}\n\n"
-                        assessment_str += f"**{util.translate_text('Suggested Severity', user_lang)}:** {util.translate_text(assessment.get('suggested_severity', 'N/A'), user_lang)}\n\n"
-                        assessment_str += f"**{util.translate_text('Recommended Next Steps', user_lang)}:**\n"
-                        next_steps = assessment.get('recommended_next_steps', 'N/A')
-                        if isinstance(next_steps, list): 
-                            for step in next_steps: assessment_str += f"- {util.translate_text(step, user_lang)}\n"
-                        elif isinstance(next_steps, str): # This is the block to modify
-                            ### Replace the original problematic f-string line here
-                            # Split on punctuation marks (., !, ?) followed by whitespace
-                            sentences = re.split(r'(?<=[.!?])\s+', next_steps.strip())
-                            # Add bullet to each sentence
-                            temp_steps = '\n- '.join(sentences).strip()
-                            # remove leading bullet if present (e.g. if next_steps started with punctuation)
-                            temp_steps = temp_steps.lstrip('- ')
-                            # Append to assessment_str
-                            assessment_str += f"{util.translate_text(temp_steps, user_lang)}\n"
-                        else: 
-                            assessment_str += f"- {util.translate_text('N/A', user_lang)}\n"
-                        warnings = assessment.get('potential_warnings')
-                        if warnings and isinstance(warnings, list) and len(warnings) > 0 :
-                            assessment_str += f"\n**{util.translate_text('Potential Warnings', user_lang)}:**\n"
-                            for warning in warnings: assessment_str += f"- {util.translate_text(warning, user_lang)}\n"
-                        kb_points = assessment.get('relevant_kb_triage_points')
-                        if kb_points and isinstance(kb_points, list) and len(kb_points) > 0:
-                            assessment_str += f"\n**{util.translate_text('Relevant Triage Points from Knowledge Base', user_lang)}:**\n"
-                            for point in kb_points: assessment_str += f"- {util.translate_text(point, user_lang)}\n"
-                        assessment_str += f"\n\n**{util.translate_text('Disclaimer', user_lang)}:** {util.translate_text(assessment.get('disclaimer', 'Always consult a doctor for medical advice.'), user_lang)}"
+                        parts = assessment_display_parts(assessment)
+                        summary, severity, next_steps = parts['summary'], parts['severity'], parts['next_steps']
+                        step_texts, warnings, disclaimer = parts['step_texts'], parts['warnings'], parts['disclaimer']
+                        kb_points, localized_kb_points = parts['kb_points'], parts['localized_kb_points']
+
+                        assessment_str = f"<h4> {translated['Preliminary Health Assessment']}:</h4>\n\n"
+                        assessment_str += f"**{translated['Summary']}:** {translated[summary]}\n\n"
+                        assessment_str += f"**{translated['Suggested Severity']}:** {translated[severity]}\n\n"
+                        assessment_str += f"**{translated['Recommended Next Steps']}:**\n"
+                        if isinstance(next_steps, str):
+                            assessment_str += f"{translated[step_texts[0]]}\n"
+                        else:
+                            for step in step_texts: assessment_str += f"- {translated[step]}\n"
+                        if warnings:
+                            assessment_str += f"\n**{translated['Potential Warnings']}:**\n"
+                            for warning in warnings: assessment_str += f"- {translated[warning]}\n"
+                        if kb_points:
+                            assessment_str += f"\n**{translated['Relevant Triage Points from Knowledge Base']}:**\n"
+                            for point in kb_points: assessment_str += f"- {localized_kb_points.get(point) or translated[point]}\n"
+                        assessment_str += f"\n\n**{translated['Disclaimer']}:** {translated[disclaimer]}"
                         add_message_to_conversation("assistant", assessment_str)
                     except Exception as e:
                         st.error(f"Error formatting assessment: {e}")
@@ -346,9 +393,7 @@ def main_ui():
                             add_message_to_conversation("assistant", f"Could not format assessment. Raw data:\n```json\n{raw_assessment_json}\n```")
                         except Exception as json_e:
                             add_message_to_conversation("assistant", f"Could not format or serialize assessment: {json_e}")
-                st.session_state.symptom_checker_active = False
-                st.session_state.symptom_checker_instance = None
-                st.session_state.pending_symptom_question_data = None
+                end_symptom_session()
             st.session_state.voice_input_stage = None # Reset voice stage
 
         # Capture and Process audio
@@ -555,6 +600,11 @@ def main_ui():
         if audio:
             st.session_state.captured_audio_data = audio['bytes']
             st.rerun()
+
+        # Started by the last follow-up answer; collected once the rest of the page is on screen
+        if st.session_state.assessment_pending:
+            generate_and_display_assessment()
+            st.rerun()
     # The old `if send_button and user_query_text_from_area:` block is now removed,
     # as its logic is handled by the handle_text_submission callback.
 
@@ -1,6 +1,8 @@
-import json
+import os
 import re
-from typing import Dict, List, Optional
+import unicodedata
+import concurrent.futures
+from typing import Dict, Iterable, Iterator, List, Optional
 from dataclasses import dataclass
 import requests
 import numpy as np
@@ -9,12 +11,47 @@ from pydub import AudioSegment
 import io
 import soundfile as sf
 
+from src.http_transport import get_transport
+from src.request_policy import RequestPolicy
+from src.cache import TieredCache, canonical_key, get_translation_cache
+from src.knowledge_registry import DEFAULT_KB_PATH, get_knowledge_registry
+from src.language_detector import get_language_detector
+
+TRANSLATION_MODE = "formal"
+TRANSLATION_MODEL = "mayura:v1"
+TRANSLATE_MAX_INPUT_CHARS = 1000  # Per-request input limit of the /translate endpoint
+TRANSLATE_MAX_WORKERS = 4         # Concurrent /translate requests per translate_many call
+
+# Where a streamed reply can be cut for translation: after sentence punctuation
+# (including the Devanagari danda) or at a line break
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?।])\s+|\n+')
+
+# Fixed labels rendered by the Streamlit UI. They are translated for every assessment,
+# so they are pre-populated into the translation cache at startup.
+UI_TRANSLATION_LABELS = (
+    "Preliminary Health Assessment",
+    "Summary",
+    "Suggested Severity",
+    "Recommended Next Steps",
+    "Potential Warnings",
+    "Relevant Triage Points from Knowledge Base",
+    "Disclaimer",
+    "N/A",
+    "Always consult a doctor for medical advice.",
+)
+
 class HealHubUtilities:
     """Core utilities for HealHub healthcare application"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, translation_cache: Optional[TieredCache] = None,
+                 request_policies: Optional[Dict[str, RequestPolicy]] = None,
+                 base_url: Optional[str] = None):
         self.api_key = api_key
-        self.base_api_url = "https://api.sarvam.ai"
+        self.base_api_url = (base_url or os.getenv("SARVAM_BASE_URL") or "https://api.sarvam.ai").rstrip("/")
+        # Per-endpoint overrides ("translate", "tts", "stt", "detect_language") of the transport's default policies
+        self.request_policies = dict(request_policies or {})
+        # Translation memory shared by every HealHubUtilities instance unless one is injected
+        self.translation_cache = translation_cache if translation_cache is not None else get_translation_cache()
         self._initialize_language_support()
 
     def _initialize_language_support(self):
@@ -70,56 +107,241 @@ class HealHubUtilities:
         if target_lang.startswith("en"):
             return text  # No translation needed for English
 
+        return self._translate(text, target_lang)
+
+    def translate_text_to_english(self, text: str) -> str:
+        """
+        Translate text to target language using Sarvam-M
+        Args:
+            text: Text to translate
+        """
+        return self._translate(text, 'en-IN')
+
+    def translate_stream(self, chunks: Iterable[str], target_lang: str) -> Iterator[str]:
+        """
+        Translate a stream of text chunks (e.g. LLM deltas) as it arrives.
+
+        Chunks are buffered until a sentence or line ends; each completed span is
+        translated and yielded with its surrounding whitespace kept, so the reply can
+        be rendered progressively in the user's language. English passes through.
+        """
+        if target_lang.startswith("en"):
+            yield from chunks
+            return
+
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            last_boundary = None
+            for last_boundary in SENTENCE_BOUNDARY.finditer(buffer):
+                pass
+            if last_boundary is None:
+                continue
+            complete, buffer = buffer[:last_boundary.end()], buffer[last_boundary.end():]
+            yield self._translate_span(complete, target_lang)
+        if buffer:
+            yield self._translate_span(buffer, target_lang)
+
+    def _translate_span(self, span: str, target_lang: str) -> str:
+        """Translate a span, keeping its leading/trailing whitespace (newlines carry markdown structure)"""
+        body = span.strip()
+        if not body:
+            return span
+        leading = span[:len(span) - len(span.lstrip())]
+        trailing = span[len(span.rstrip()):]
+        return leading + self._translate(body, target_lang) + trailing
+
+    def _translation_cache_key(self, text: str, target_lang: str, source_lang: str = 'auto') -> str:
+        """Cache key for a translation: (endpoint, normalized text, source, target, mode, model)"""
+        normalized_text = unicodedata.normalize("NFC", self.clean_whitespace(text))
+        return canonical_key("translate", self.base_api_url, normalized_text, source_lang, target_lang,
+                             TRANSLATION_MODE, TRANSLATION_MODEL)
+
+    def _translate(self, text: str, target_lang: str, source_lang: str = 'auto') -> str:
+        """Translate through the translation cache, calling /translate on a miss"""
+        if not text or not text.strip():
+            return text
+
+        cache_key = self._translation_cache_key(text, target_lang, source_lang)
+        cached_translation = self.translation_cache.get(cache_key)
+        if cached_translation is not None:
+            return cached_translation
+
+        try:
+            translated_text = self.clean_whitespace(self._request_translation(text, target_lang, source_lang))
+            self.translation_cache.set(cache_key, translated_text)
+            return translated_text
+        except Exception as e:
+            print(f"Translation error: {e}")
+            return text  # Fallback to original
+
+    def _request_translation(self, text: str, target_lang: str, source_lang: str = 'auto') -> str:
+        """Single /translate call. Returns the raw translated text (line breaks preserved)."""
         headers = {"api-subscription-key": self.api_key}
         payload = {
             "input": text,
             "target_language_code": target_lang,
-            "source_language_code": 'auto',
-            "mode": "formal",
-            "model": "mayura:v1",
+            "source_language_code": source_lang,
+            "mode": TRANSLATION_MODE,
+            "model": TRANSLATION_MODEL,
         }
 
+        response = get_transport().post(
+            "translate",
+            f"{self.base_api_url}/translate",
+            policy=self.request_policies.get("translate"),
+            headers=headers,
+            json=payload
+        )
+        response.raise_for_status()
+        return response.json()["translated_text"]
+
+    def translate_many(self, texts: List[str], target_lang: str, max_workers: int = TRANSLATE_MAX_WORKERS) -> List[str]:
+        """
+        Translate a list of strings, preserving order.
+
+        Identical strings are translated once and cached translations are reused.
+        The remaining single-line strings are packed, one per line, into as few
+        /translate requests as the input limit allows; requests run concurrently on a
+        bounded thread pool. A packed request whose output does not split back into
+        the same number of lines is retried string by string.
+
+        Args:
+            texts: Strings to translate
+            target_lang: Target language code (e.g., 'hi-IN')
+            max_workers: Maximum concurrent /translate requests
+        """
+        if target_lang.startswith("en"):
+            return list(texts)
+
+        translations: Dict[str, str] = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                translations[text] = text
+                continue
+            cached_translation = self.translation_cache.get(self._translation_cache_key(text, target_lang))
+            if cached_translation is not None:
+                translations[text] = cached_translation
+            else:
+                misses.append(text)
+
+        requests_to_send = self._pack_for_translation(misses)
+        if requests_to_send:
+            worker_count = max(1, min(max_workers, len(requests_to_send)))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=worker_count) as executor:
+                for result in executor.map(lambda group: self._translate_group(group, target_lang), requests_to_send):
+                    translations.update(result)
+
+        return [translations.get(text, text) for text in texts]
+
+    def _pack_for_translation(self, texts: List[str]) -> List[List[str]]:
+        """Group strings into newline-joined requests that stay within the input limit"""
+        groups: List[List[str]] = []
+        current_group: List[str] = []
+        current_length = 0
+        for text in texts:
+            packable = "\n" not in text and len(text) < TRANSLATE_MAX_INPUT_CHARS
+            if not packable:
+                groups.append([text])
+                continue
+            added_length = len(text) + (1 if current_group else 0)
+            if current_group and current_length + added_length > TRANSLATE_MAX_INPUT_CHARS:
+                groups.append(current_group)
+                current_group, current_length = [], 0
+                added_length = len(text)
+            current_group.append(text)
+            current_length += added_length
+        if current_group:
+            groups.append(current_group)
+        return groups
+
+    def _translate_group(self, group: List[str], target_lang: str) -> Dict[str, str]:
+        """Translate one packed request, falling back to per-string calls if it can't be unpacked"""
+        if len(group) == 1:
+            return {group[0]: self._translate(group[0], target_lang)}
+
         try:
-            response = requests.post(
-                f"{self.base_api_url}/translate",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            return self.clean_whitespace(response.json()["translated_text"])
+            translated_block = self._request_translation("\n".join(group), target_lang)
+            translated_lines = [line.strip() for line in translated_block.split("\n") if line.strip()]
         except Exception as e:
-            print(f"Translation error: {e}")
-            return text  # Fallback to original
+            print(f"Batch translation error: {e}")
+            translated_lines = []
 
-    def translate_text_to_english(self, text: str) -> str:
+        if len(translated_lines) != len(group):
+            if translated_lines:
+                print(f"⚠️ Packed translation returned {len(translated_lines)} lines for {len(group)} inputs; translating individually.")
+            return {text: self._translate(text, target_lang) for text in group}
+
+        result = {}
+        for text, translated_line in zip(group, translated_lines):
+            translated_text = self.clean_whitespace(translated_line)
+            self.translation_cache.set(self._translation_cache_key(text, target_lang), translated_text)
+            result[text] = translated_text
+        return result
+
+    def warm_translation_cache(self, languages: Optional[Iterable[str]] = None,
+                               extra_texts: Optional[Iterable[str]] = None,
+                               kb_filepath: str = DEFAULT_KB_PATH) -> int:
         """
-        Translate text to target language using Sarvam-M
+        Pre-populate the translation cache with static UI labels and symptom
+        knowledge base strings (symptom names, follow-up questions, triage points).
+
         Args:
-            text: Text to translate
+            languages: Target language codes (default: every non-English language in LANGUAGE_MAP)
+            extra_texts: Additional fixed strings to translate (e.g. the assessment disclaimer)
+            kb_filepath: Symptom knowledge base to read strings from
+
+        Returns:
+            Number of translations requested from the API (cache hits are not counted)
         """
-        
+        texts = list(UI_TRANSLATION_LABELS) + list(extra_texts or [])
+        knowledge = get_knowledge_registry().symptom_kb(kb_filepath)
+        if knowledge.error:
+            print(f"⚠️ Could not read knowledge base strings for translation warm-up from {kb_filepath}: {knowledge.error}")
+        for symptom in knowledge.symptoms:
+            texts.append(symptom.get("symptom_name", ""))
+            texts.extend(symptom.get("follow_up_questions", ()))
+            texts.extend(symptom.get("basic_triage_points", ()))
+
+        texts = [text for text in dict.fromkeys(texts) if text and text.strip()]
+        target_languages = [lang for lang in (languages or self.LANGUAGE_MAP.keys()) if not lang.startswith("en")]
+
+        requested = 0
+        for lang in target_languages:
+            misses = [text for text in texts if self.translation_cache.get(self._translation_cache_key(text, lang)) is None]
+            if misses:
+                self.translate_many(misses, lang)
+                requested += len(misses)
+        print(f"✅ Translation cache warmed: {len(texts)} strings x {len(target_languages)} languages ({requested} requested).")
+        return requested
+
+    def transliterate_text(self, text: str, source_lang: str, target_lang: str = "en-IN") -> Optional[str]:
+        """
+        Transliterate text into another script via Sarvam /transliterate (by default
+        romanize it, e.g. "बुखार" -> "bukhar"). Returns None on failure.
+        """
+        if not text or not text.strip():
+            return None
         headers = {"api-subscription-key": self.api_key}
         payload = {
             "input": text,
-            "target_language_code": 'en-IN',
-            "source_language_code": 'auto',
-            "mode": "formal",
-            "model": "mayura:v1",
+            "source_language_code": source_lang,
+            "target_language_code": target_lang,
         }
-
         try:
-            response = requests.post(
-                f"{self.base_api_url}/translate",
+            response = get_transport().post(
+                "transliterate",
+                f"{self.base_api_url}/transliterate",
+                policy=self.request_policies.get("transliterate"),
                 headers=headers,
-                json=payload,
-                timeout=30
+                json=payload
             )
             response.raise_for_status()
-            return self.clean_whitespace(response.json()["translated_text"])
+            return self.clean_whitespace(response.json()["transliterated_text"])
         except Exception as e:
-            print(f"Translation error: {e}")
-            return text  # Fallback to original
+            print(f"Transliteration error: {e}")
+            return None
 
     def synthesize_speech(self, text, language_code):
         """
@@ -139,11 +361,12 @@ class HealHubUtilities:
         }
 
         try:
-            response = requests.post(
+            response = get_transport().post(
+                "tts",
                 f"{self.base_api_url}/text-to-speech",
+                policy=self.request_policies.get("tts"),
                 headers=headers,
-                json=payload,
-                timeout=30
+                json=payload
             )
             response.raise_for_status()
             result = response.json()
@@ -195,12 +418,13 @@ class HealHubUtilities:
         }
 
         try:
-            response = requests.post(
+            response = get_transport().post(
+                "stt",
                 f"{self.base_api_url}/speech-to-text",
+                policy=self.request_policies.get("stt"),
                 headers=headers,
                 data=payload,
-                files=files,
-                timeout=60
+                files=files
             )
             response.raise_for_status()
             result = response.json()
@@ -220,51 +444,11 @@ class HealHubUtilities:
 
     def batch_translate(self, texts: List[str], target_lang: str) -> List[str]:
         """Optimized batch translation for multiple texts"""
-        if target_lang.startswith("en"):
-            return texts
-
-        headers = {"api-subscription-key": self.api_key}
-        payload = {
-            "texts": texts,
-            "target_lang": target_lang,
-            "context": "healthcare"
-        }
-
-        try:
-            response = requests.post(
-                f"{self.base_api_url}/translate/batch",
-                headers=headers,
-                json=payload,
-                timeout=45
-            )
-            response.raise_for_status()
-            return response.json()["translations"]
-        except Exception as e:
-            print(f"Batch translation error: {e}")
-            return texts
+        return self.translate_many(texts, target_lang)
 
     def detect_language(self, text: str) -> str:
-        """Robust language detection with code-mixing support"""
-        # First check for strong indicators
-        if re.search(r"[\u0900-\u097F]", text):  # Hindi/Sanskrit Unicode range
-            return "hi-IN"
-        if re.search(r"[\u0B80-\u0BFF]", text):  # Tamil
-            return "ta-IN"
-        
-        # Fallback to API detection
-        try:
-            headers = {"Authorization": f"Bearer {self.api_key}"}
-            response = requests.post(
-                f"{self.base_api_url}/detect-language",
-                headers=headers,
-                json={"text": text},
-                timeout=15
-            )
-            response.raise_for_status()
-            return response.json().get("language", "en-IN")
-        except Exception as e:
-            print(f"Language detection error: {e}")
-            return "en-IN"
+        """Robust language detection with code-mixing support, computed locally (no API call)"""
+        return get_language_detector().detect(text)
 
     def get_display_language(self, lang_code: str) -> str:
         """Get user-friendly language name"""
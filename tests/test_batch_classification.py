@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import LRUCache, TieredCache
+from src.nlu_processor import SarvamMNLUProcessor, HealthIntent
+from src.stub_server import StubSarvamServer, StubConfig
+
+QUERIES = ["I have a fever", "What is malaria?", "Is paracetamol safe?", "How can I sleep better?",
+           "How do I prevent dengue?", "I have a cough", "What is diabetes?", "My stomach hurts"]
+INTENTS = ["symptom_query", "disease_info", "medication_info", "wellness_tip",
+           "prevention_info", "symptom_query", "disease_info", "symptom_query"]
+
+
+def _batch_completion(answer):
+    """Fake chat_completion: `answer(queries)` returns the JSON content for one numbered batch prompt"""
+    def chat_completion(messages, model="sarvam-m", **kwargs):
+        queries = [json.loads(quoted) for quoted in re.findall(r'^\d+\. (".*")$', messages[-1]["content"], re.MULTILINE)]
+        chat_completion.batches.append(queries)
+        return {"choices": [{"message": {"content": answer(queries)}}]}
+    chat_completion.batches = []
+    return chat_completion
+
+
+def _answers(queries, skip=()):
+    return [{"id": number, "intent": INTENTS[QUERIES.index(query)], "confidence": 0.9}
+            for number, query in enumerate(queries, 1) if query not in skip]
+
+
+class TestBatchClassification(unittest.TestCase):
+
+    def setUp(self):
+        # Threshold above 1 sends every query to Sarvam-M
+        self.processor = SarvamMNLUProcessor(api_key="test_api_key_123", intent_threshold=1.01)
+
+    def test_only_missing_and_invalid_items_are_retried(self):
+        def answer(queries):
+            if len(queries) < 4:
+                return json.dumps(_answers(queries))
+            items = _answers(queries, skip={"What is malaria?"})    # Dropped on the first attempt
+            if items[0]["id"] == 1:
+                items[0]["intent"] = "not_an_intent"                # Invalid on the first attempt
+                items.append({"id": 99, "intent": "emergency", "confidence": 1.0})  # Outside the batch
+            return json.dumps(items)
+        self.processor.sarvam_client.chat_completion = fake = _batch_completion(answer)
+
+        report = self.processor.classify_batch(QUERIES, batch_size=4)
+
+        self.assertEqual([intent.value for intent, _ in report.results], INTENTS)
+        self.assertEqual(sorted(map(sorted, fake.batches[2:])), [["How do I prevent dengue?"],
+                                                                 ["I have a fever", "What is malaria?"]])
+        self.assertEqual((report.llm_calls, report.retried, report.failed), (4, 3, 0))
+        self.assertEqual(self.processor.nlu_stats["batch_retried_items"], 3)
+
+    def test_large_inputs_are_classified_locally_in_chunks_off_the_event_loop(self):
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123", intent_threshold=0.0)  # Every query stays local
+        classifier = processor.intent_classifier
+        expected = [processor._map_intent(label, text) for text, (label, _) in zip(QUERIES, classifier.predict_batch(QUERIES))]
+        calls = []
+
+        def predict_batch(texts, predict=classifier.predict_batch):
+            calls.append((len(texts), threading.current_thread() is threading.main_thread()))
+            return predict(texts)
+
+        with patch.object(classifier, "predict_batch", side_effect=predict_batch), \
+             patch.object(processor.sarvam_client, "chat_completion", side_effect=AssertionError("no LLM calls")):
+            report = processor.classify_batch(QUERIES * 300, local_chunk_size=1000)
+
+        self.assertEqual(calls, [(1000, False), (1000, False), (400, False)])
+        self.assertEqual((report.local, report.llm_calls), (2400, 0))
+        self.assertEqual([intent for intent, _ in report.results], expected * 300)
+        self.assertEqual(len(report.languages), 2400)
+
+    def test_items_still_failing_after_the_last_attempt_are_unknown(self):
+        self.processor.sarvam_client.chat_completion = fake = _batch_completion(
+            lambda queries: "not json" if "I have a cough" in queries else json.dumps(_answers(queries)))
+
+        report = self.processor.classify_batch(QUERIES, batch_size=4, max_attempts=2)
+
+        self.assertEqual(report.results[5], (HealthIntent.UNKNOWN, 0.5))
+        self.assertEqual(report.results[0], (HealthIntent.SYMPTOM_QUERY, 0.9))
+        self.assertEqual((report.llm_calls, report.failed), (3, 4))
+        self.assertEqual(fake.batches[-1], QUERIES[4:])
+
+    def test_batches_run_concurrently_up_to_the_limit(self):
+        lock, in_flight, peak = threading.Lock(), [0], [0]
+
+        def answer(queries):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            time.sleep(0.05)
+            with lock:
+                in_flight[0] -= 1
+            return json.dumps(_answers(queries))
+        self.processor.sarvam_client.chat_completion = _batch_completion(answer)
+
+        report = self.processor.classify_batch(QUERIES * 2, batch_size=2, max_concurrency=3)
+
+        self.assertEqual(report.llm_calls, 8)
+        self.assertEqual(peak[0], 3)
+        self.assertGreater(report.queries_per_second, 0)
+
+    def test_process_batch_against_stub(self):
+        stub = StubSarvamServer(StubConfig()).start()
+        self.addCleanup(stub.stop)
+        with patch.dict(os.environ, {"SARVAM_BASE_URL": stub.base_url}):
+            processor = SarvamMNLUProcessor(api_key="test_api_key_123", intent_threshold=1.01)
+        processor.sarvam_client.cache = TieredCache(LRUCache())
+
+        results = processor.process_batch(["I have a fever and a headache", "मुझे सीने में दर्द है", "What is malaria?"])
+
+        self.assertEqual(stub.stats()["chat"]["requests"], 1)
+        self.assertEqual(results[0].intent, HealthIntent.SYMPTOM_QUERY)
+        self.assertIn("fever", [entity.text.lower() for entity in results[0].entities])
+        self.assertTrue(results[1].is_emergency)
+        self.assertEqual(results[1].language_detected, "hi-IN")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
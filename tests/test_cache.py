@@ -0,0 +1,179 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import LRUCache, SQLiteCache, TieredCache, canonical_key
+from src.nlu_processor import HealthIntent, NLUResult, SarvamAPIClient
+from src.response_generator import HealHubResponseGenerator
+from src.utils import HealHubUtilities, UI_TRANSLATION_LABELS
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCacheTiers(unittest.TestCase):
+
+    def test_canonical_key_ignores_dict_order(self):
+        self.assertEqual(canonical_key({"a": 1, "b": [1, 2]}), canonical_key({"b": [1, 2], "a": 1}))
+        self.assertNotEqual(canonical_key({"a": 1}), canonical_key({"a": 2}))
+
+    def test_lru_eviction_and_ttl(self):
+        clock = FakeClock()
+        cache = LRUCache(max_entries=2, ttl_seconds=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "a" becomes most recently used
+        cache.set("c", 3)                   # Evicts "b"
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        clock.now += 11
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_sqlite_tier_persists_and_promotes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "cache.sqlite3")
+            first = TieredCache(LRUCache(max_entries=4), SQLiteCache(path, max_entries=2))
+            first.set("k1", {"value": 1})
+            first.set("k2", {"value": 2})
+            first.set("k3", {"value": 3})  # Persistent tier evicts the least recently accessed row
+            first.persistent.close()
+
+            second = TieredCache(LRUCache(max_entries=4), SQLiteCache(path, max_entries=2))
+            self.assertEqual(second.get("k3"), {"value": 3})
+            self.assertEqual(second.memory.get("k3"), {"value": 3})  # Promoted into memory
+            self.assertEqual(len(second.persistent), 2)
+            second.persistent.close()
+
+    def test_sqlite_writes_keep_a_running_count(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            clock = FakeClock()
+            cache = SQLiteCache(os.path.join(tmp_dir, "cache.sqlite3"), max_entries=3, ttl_seconds=10, clock=clock)
+            statements = []
+            cache._conn.set_trace_callback(statements.append)
+            for index in range(5):
+                clock.now += 1
+                cache.set(f"k{index}", index)
+            clock.now += 1
+            cache.set("k3", "updated")  # Overwriting an existing key evicts nothing
+            self.assertFalse([sql for sql in statements if "COUNT(" in sql])
+            self.assertEqual(cache.stats()["evictions"], 2)
+            self.assertEqual([cache.get(f"k{index}") for index in range(5)], [None, None, 2, "updated", 4])
+
+            clock.now += 11
+            self.assertIsNone(cache.get("k4"))  # Expired rows leave the count too
+            cache.set("k5", 5)
+            self.assertEqual((len(cache), cache.stats()["evictions"]), (3, 2))
+            cache.close()
+
+
+class TestChatCompletionCache(unittest.TestCase):
+
+    def _mock_transport(self, payload):
+        transport = MagicMock()
+        transport.post.return_value.json.return_value = payload
+        return transport
+
+    def test_repeated_completion_is_served_from_cache(self):
+        payload = {"choices": [{"message": {"content": "{\"intent\": \"wellness_tip\"}"}}]}
+        transport = self._mock_transport(payload)
+        client = SarvamAPIClient(api_key="test_api_key_123", cache=TieredCache(LRUCache()))
+        messages = [{"role": "user", "content": "How can I sleep better?"}]
+
+        with patch('src.nlu_processor.get_transport', return_value=transport):
+            self.assertEqual(client.chat_completion(messages, temperature=0.3, max_tokens=100), payload)
+            self.assertEqual(client.chat_completion(messages, temperature=0.3, max_tokens=100), payload)
+            self.assertEqual(transport.post.call_count, 1)
+
+            # Different parameters and explicit bypass both go to the network
+            client.chat_completion(messages, temperature=0.9, max_tokens=100)
+            client.chat_completion(messages, temperature=0.3, max_tokens=100, use_cache=False)
+            self.assertEqual(transport.post.call_count, 3)
+
+        self.assertEqual(client.cache.stats()["hits"], 1)
+
+    def test_endpoints_never_share_completions_and_replies_are_not_cached(self):
+        payload = {"choices": [{"message": {"content": "Drink water and rest."}}]}
+        transport = self._mock_transport(payload)
+        shared = TieredCache(LRUCache())
+        stub = SarvamAPIClient(api_key="test_api_key_123", cache=shared, base_url="http://127.0.0.1:8123")
+        live = SarvamAPIClient(api_key="test_api_key_123", cache=shared, base_url="https://api.sarvam.ai")
+        messages = [{"role": "user", "content": "I have a cold"}]
+
+        with patch('src.nlu_processor.get_transport', return_value=transport):
+            stub.chat_completion(messages)
+            live.chat_completion(messages)
+            self.assertEqual(transport.post.call_count, 2)
+
+            # User-facing replies are generated fresh every time
+            generator = HealHubResponseGenerator(api_key="test_api_key_123")
+            generator.sarvam_client = live
+            nlu_result = NLUResult("I have a cold", HealthIntent.SYMPTOM_QUERY, 0.9, [], False, True, "en-IN")
+            generator.generate_response("I have a cold", nlu_result)
+            generator.generate_response("I have a cold", nlu_result)
+            self.assertEqual(transport.post.call_count, 4)
+
+    def test_failed_completion_is_not_cached(self):
+        transport = self._mock_transport({})
+        client = SarvamAPIClient(api_key="test_api_key_123", cache=TieredCache(LRUCache()))
+        messages = [{"role": "user", "content": "hello"}]
+
+        with patch('src.nlu_processor.get_transport', return_value=transport):
+            client.chat_completion(messages)
+            client.chat_completion(messages)
+        self.assertEqual(transport.post.call_count, 2)
+
+
+class TestTranslationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = MagicMock()
+        self.transport.post.side_effect = self._fake_translate
+        self.util = HealHubUtilities(api_key="test_api_key_123", translation_cache=TieredCache(LRUCache()))
+
+    @staticmethod
+    def _fake_translate(endpoint, url, headers=None, json=None, **kwargs):
+        response = MagicMock()
+        lines = json["input"].split("\n")
+        response.json.return_value = {"translated_text": "\n".join(f"[{json['target_language_code']}] {line}" for line in lines)}
+        return response
+
+    def test_translation_is_cached_per_target_language(self):
+        with patch('src.utils.get_transport', return_value=self.transport):
+            self.assertEqual(self.util.translate_text("Summary", "hi-IN"), "[hi-IN] Summary")
+            self.assertEqual(self.util.translate_text("  Summary ", "hi-IN"), "[hi-IN] Summary")  # Normalized key
+            self.assertEqual(self.util.translate_text("Summary", "ta-IN"), "[ta-IN] Summary")
+            self.assertEqual(self.util.translate_text("Summary", "en-IN"), "Summary")  # No call for English
+        self.assertEqual(self.transport.post.call_count, 2)
+
+    def test_warm_up_covers_labels_and_kb_strings(self):
+        kb = {"symptoms": [{"symptom_name": "fever", "keywords": ["hot"],
+                            "follow_up_questions": ["How high is the fever?"],
+                            "basic_triage_points": ["High fever is concerning."]}]}
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            kb_path = os.path.join(tmp_dir, "kb.json")
+            with open(kb_path, "w", encoding="utf-8") as f:
+                json.dump(kb, f)
+
+            with patch('src.utils.get_transport', return_value=self.transport):
+                requested = self.util.warm_translation_cache(languages=["hi-IN", "en-IN"], kb_filepath=kb_path)
+                self.assertEqual(requested, len(UI_TRANSLATION_LABELS) + 3)
+                calls_after_warm_up = self.transport.post.call_count
+                self.assertEqual(self.util.warm_translation_cache(languages=["hi-IN"], kb_filepath=kb_path), 0)
+                self.assertEqual(self.util.translate_text("How high is the fever?", "hi-IN"), "[hi-IN] How high is the fever?")
+            self.assertEqual(self.transport.post.call_count, calls_after_warm_up)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.nlu_processor import SarvamMNLUProcessor, HealthIntent, EMERGENCY_LATENCY_SLO_MS, SUPPORTED_LANGUAGE_CODES
+from src.prompts import EMERGENCY_RESPONSES
+from src.response_generator import HealHubResponseGenerator, get_emergency_response
+
+
+def _no_network(*args, **kwargs):
+    raise AssertionError("The emergency path must not make network calls")
+
+
+class TestEmergencyFastPath(unittest.TestCase):
+
+    def test_emergency_path_makes_zero_network_calls(self):
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123", background_nlu=False)
+        generator = HealHubResponseGenerator(api_key="test_api_key_123")
+        queries = [("Help, my father has chest pain and is unconscious", "en-IN"),
+                   ("मुझे सीने में दर्द है", "hi-IN"),
+                   ("எனக்கு மார்பு வலி", "ta-IN")]
+
+        with patch("requests.Session.request", side_effect=_no_network):
+            for query, language in queries:
+                start = time.perf_counter()
+                result = processor.process_transcription(query, language)
+                reply = generator.generate_response(query, result)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+
+                self.assertTrue(result.is_emergency and result.short_circuited, query)
+                self.assertEqual(result.intent, HealthIntent.EMERGENCY)
+                self.assertEqual(reply, get_emergency_response(result.language_detected))
+                self.assertEqual("".join(generator.generate_response_stream(query, result)), reply)
+                self.assertLess(elapsed_ms, EMERGENCY_LATENCY_SLO_MS, query)
+
+        self.assertEqual(processor.nlu_stats["emergency_short_circuits"], len(queries))
+        self.assertEqual(processor.nlu_stats["intent_llm_calls"], 0)
+
+    def test_full_nlu_runs_in_the_background(self):
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123", background_nlu=True)
+        calls = []
+
+        def slow_completion(messages, model="sarvam-m", **kwargs):
+            calls.append(messages[0]["content"])
+            time.sleep(0.3)
+            return {"choices": [{"message": {"content": json.dumps({"intent": "emergency", "confidence": 0.9, "entities": []})}}]}
+        processor.sarvam_client.chat_completion = slow_completion
+
+        start = time.perf_counter()
+        result = processor.process_transcription("I think it is a heart attack, help", "en-IN")
+        self.assertLess(time.perf_counter() - start, 0.1)  # Did not wait for the LLM
+        self.assertTrue(result.short_circuited)
+
+        background = processor.last_background_nlu.result(timeout=5)
+        self.assertFalse(background.short_circuited)
+        self.assertTrue(background.is_emergency)
+        self.assertTrue(calls)
+
+    def test_short_circuit_can_be_disabled(self):
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123", emergency_short_circuit=False)
+        processor.sarvam_client.chat_completion = lambda messages, model="sarvam-m", **kwargs: {
+            "choices": [{"message": {"content": json.dumps({"intent": "emergency", "confidence": 0.9, "entities": []})}}]}
+
+        result = processor.process_transcription("chest pain", "en-IN")
+
+        self.assertTrue(result.is_emergency)
+        self.assertFalse(result.short_circuited)
+
+    def test_every_supported_language_has_a_localized_reply(self):
+        for language in SUPPORTED_LANGUAGE_CODES:
+            self.assertIn(language.split('-')[0], EMERGENCY_RESPONSES)
+            self.assertIn("112", get_emergency_response(language))
+        self.assertEqual(get_emergency_response("xx-YY"), EMERGENCY_RESPONSES["en"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,64 @@
+import unittest
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.http_transport import SarvamTransport, DEFAULT_TIMEOUTS
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        payload = json.dumps({"echo": json.loads(body or b"{}")}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSarvamTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/translate"
+        self.transport = SarvamTransport(pool_maxsize=2, timeouts={"translate": 5})
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        for i in range(5):
+            response = self.transport.post("translate", self.url, json={"input": i})
+            self.assertEqual(response.json()["echo"]["input"], i)
+
+        stats = self.transport.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["misses"], 1)  # Only the first call opens a connection
+        self.assertEqual(stats["hits"], 4)
+
+        self.transport.reset_stats()
+        self.assertEqual(self.transport.stats(), {"requests": 0, "hits": 0, "misses": 0})
+
+    def test_per_endpoint_timeouts(self):
+        self.assertEqual(self.transport.timeout_for("translate"), 5)
+        self.assertEqual(self.transport.timeout_for("stt"), DEFAULT_TIMEOUTS["stt"])
+        self.assertEqual(self.transport.timeout_for("unknown"), DEFAULT_TIMEOUTS["default"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
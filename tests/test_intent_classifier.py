@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import patch
+import io
+import json
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.intent_classifier import IntentClassifier, evaluate, load_dataset, main, DEFAULT_TRAINING_DATA_PATH
+from src.nlu_processor import SarvamMNLUProcessor, HealthIntent
+from src.text_features import HashedNgramVectorizer
+
+
+def _llm_intent(intent):
+    def chat_completion(messages, model="sarvam-m", **kwargs):
+        if "intent classifier" in messages[0]["content"]:
+            content = {"intent": intent, "confidence": 0.9}
+        else:
+            content = {"entities": []}
+        chat_completion.calls.append(messages[0]["content"])
+        return {"choices": [{"message": {"content": json.dumps(content)}}]}
+    chat_completion.calls = []
+    return chat_completion
+
+
+class TestIntentClassifier(unittest.TestCase):
+
+    def test_train_save_load_round_trip(self):
+        texts = ["I have fever", "I have a cough", "what is malaria", "what is dengue"] * 3
+        labels = ["symptom_query", "symptom_query", "disease_info", "disease_info"] * 3
+        classifier = IntentClassifier.train(texts, labels, HashedNgramVectorizer(n_features=512), epochs=100)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "model.npz")
+            classifier.save(path)
+            loaded = IntentClassifier.load(path)
+
+        self.assertEqual(loaded.predict("I have a headache")[0], "symptom_query")
+        self.assertEqual(loaded.predict("what is typhoid")[0], "disease_info")
+        # The sparse single-query path agrees with the dense batch path
+        for text in ["I have a headache", "what is typhoid", ""]:
+            label, confidence = loaded.predict(text)
+            batch_label, batch_confidence = loaded.predict_batch([text])[0]
+            self.assertEqual(label, batch_label)
+            self.assertAlmostEqual(confidence, batch_confidence, places=4)
+
+    def test_shipped_model_is_confident_on_common_queries(self):
+        classifier = IntentClassifier.load("src/intent_classifier.npz")
+        for text, intent in [("मुझे बुखार है", "symptom_query"), ("What are the symptoms of diabetes?", "disease_info"),
+                             ("How can I sleep better?", "wellness_tip")]:
+            label, confidence = classifier.predict(text)
+            self.assertEqual(label, intent, text)
+            self.assertGreaterEqual(confidence, 0.85, text)
+        texts, labels = load_dataset(DEFAULT_TRAINING_DATA_PATH)
+        self.assertGreater(evaluate(classifier, texts, labels).accuracy, 0.9)
+
+    def test_cli_trains_and_evaluates(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, "model.npz")
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(["train", "--out", model_path, "--epochs", "50", "--features", "1024"])
+                main(["evaluate", "--data", DEFAULT_TRAINING_DATA_PATH, "--model", model_path])
+            self.assertTrue(os.path.exists(model_path))
+        self.assertIn("Held-out evaluation", output.getvalue())
+        self.assertIn("the fast path covers", output.getvalue())
+
+
+class TestIntentFastPath(unittest.TestCase):
+
+    def test_confident_queries_skip_the_llm(self):
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123", intent_audit_rate=0)
+        processor.sarvam_client.chat_completion = fake = _llm_intent("symptom_query")
+
+        result = processor.process_transcription("I have a fever and a headache", "en-IN")
+
+        self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY)
+        self.assertFalse(any("intent classifier" in prompt for prompt in fake.calls))
+        self.assertEqual(processor.intent_fast_path_report()["fast_path_rate"], 1.0)
+
+    def test_unconfident_queries_fall_back_and_are_compared_and_logged(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            log_path = os.path.join(tmp_dir, "intents.jsonl")
+            with patch.dict(os.environ, {"HEALHUB_INTENT_LOG_PATH": log_path}):
+                processor = SarvamMNLUProcessor(api_key="test_api_key_123", intent_threshold=1.01)
+            processor.sarvam_client.chat_completion = _llm_intent("symptom_query")
+
+            result = processor.process_transcription("I have a fever and a headache", "en-IN")
+            texts, labels = load_dataset(log_path)
+
+        self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY)
+        self.assertEqual((texts, labels), (["I have a fever and a headache"], ["symptom_query"]))
+        report = processor.intent_fast_path_report()
+        self.assertEqual(report["fast_path_rate"], 0.0)
+        self.assertEqual((report["compared"], report["agreement_rate"]), (1, 1.0))
+
+    def test_sampled_confident_queries_are_audited_in_the_background(self):
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123", intent_audit_rate=1.0)
+        processor.sarvam_client.chat_completion = fake = _llm_intent("general_health")
+
+        result = processor.process_transcription("I have a fever and a headache", "en-IN")
+        processor.last_intent_audit.result(timeout=5)
+
+        self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY)  # The audit never changes the answer
+        self.assertTrue(any("intent classifier" in prompt for prompt in fake.calls))
+        report = processor.intent_fast_path_report()
+        self.assertEqual(report["fast_path_rate"], 1.0)
+        self.assertEqual((report["compared"], report["agreement_rate"]), (0, None))
+        self.assertEqual((report["audited"], report["audit_agreement_rate"]), (1, 0.0))
+
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123", intent_audit_rate=0)
+        processor.sarvam_client.chat_completion = _llm_intent("general_health")
+        processor.process_transcription("I have a fever and a headache", "en-IN")
+        self.assertIsNone(processor.last_intent_audit)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,59 @@
+import unittest
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.kb_build import build_keyword_aliases, format_kb_json
+from src.knowledge_registry import DEFAULT_KB_PATH, build_kb_keyword_matcher
+
+
+class FakeUtilities:
+    """Stands in for HealHubUtilities: dictionary translation, uppercase 'transliteration'"""
+    TRANSLATIONS = {"fever": "बुखार", "temperature": "तापमान", "hot": "गर्म", "cough": "खांसी", "coughing": "खांसी"}
+
+    def __init__(self):
+        self.translate_calls = []
+
+    def translate_many(self, texts, target_lang):
+        self.translate_calls.append((list(texts), target_lang))
+        return [self.TRANSLATIONS.get(text, text) for text in texts]
+
+    def transliterate_text(self, text, source_lang, target_lang="en-IN"):
+        return {"बुखार": "bukhar", "खांसी": "khansi"}.get(text)
+
+
+class TestKBBuild(unittest.TestCase):
+
+    def test_aliases_are_translated_transliterated_and_merged(self):
+        symptoms = [{"symptom_name": "fever", "keywords": ["temperature", "hot"], "keyword_aliases": {"hi-IN": ["ज्वर"]}},
+                    {"symptom_name": "cough", "keywords": ["coughing", "hacking"]}]
+        utils = FakeUtilities()
+
+        added = build_keyword_aliases(symptoms, utils, ["hi-IN"])
+
+        # One packed translate_many call per language for every distinct term
+        self.assertEqual(utils.translate_calls, [(["fever", "temperature", "hot", "cough", "coughing", "hacking"], "hi-IN")])
+        self.assertEqual(symptoms[0]["keyword_aliases"]["hi-IN"], ["ज्वर", "बुखार", "तापमान", "गर्म", "bukhar"])
+        # Duplicates and untranslated (English) terms are dropped
+        self.assertEqual(symptoms[1]["keyword_aliases"]["hi-IN"], ["खांसी", "khansi"])
+        self.assertEqual(added, 6)
+
+        build_keyword_aliases(symptoms, utils, ["hi-IN"], transliterate=False, refresh=True)
+        self.assertEqual(symptoms[0]["keyword_aliases"]["hi-IN"], ["बुखार", "तापमान", "गर्म"])
+
+    def test_format_round_trips_the_shipped_kb(self):
+        with open(DEFAULT_KB_PATH, 'r', encoding='utf-8') as f:
+            text = f.read()
+        self.assertEqual(format_kb_json(json.loads(text)) + "\n", text)
+
+    def test_keyword_matcher_skips_romanized_aliases(self):
+        matcher = build_kb_keyword_matcher([{"symptom_name": "vomiting", "keywords": [],
+                                             "keyword_aliases": {"hi-IN": ["उल्टी", "ulti"]}}])
+        self.assertEqual([match.payloads[0] for match in matcher.find_all("उल्टी हो रही है")], ["vomiting"])
+        self.assertEqual(matcher.find_all("multiple issues"), [])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,129 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.kb_build import ALIAS_LANGUAGES, build_kb_localization, load_kb, write_kb
+from src.knowledge_registry import DEFAULT_KB_LOCALIZATION_PATH, DEFAULT_KB_PATH, get_knowledge_registry, kb_fingerprint
+from src.nlu_processor import NLUResult, MedicalEntity, HealthIntent
+from src.symptom_checker import SymptomChecker
+
+KB = {"symptoms": [
+    {"symptom_name": "Fever", "keywords": ["hot"], "follow_up_questions": ["How high is the fever?", "Any chills?"],
+     "basic_triage_points": ["Fever > 3 days needs check."]},
+    {"symptom_name": "cough", "keywords": [], "follow_up_questions": ["Is it dry?"],
+     "basic_triage_points": ["Coughing blood is urgent."]},
+]}
+
+
+class FakeUtilities:
+    """Tags each string with its language; 'Any chills?' fails (comes back untranslated)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate_many(self, texts, target_lang):
+        self.calls += 1
+        return [text if text == "Any chills?" else f"[{target_lang}] {text}" for text in texts]
+
+
+def _nlu_result(language):
+    entities = [MedicalEntity("fever", "symptom", 0.9, 0, 5), MedicalEntity("cough", "symptom", 0.9, 10, 15)]
+    return NLUResult("fever and cough", HealthIntent.SYMPTOM_QUERY, 0.9, entities, False, True, language)
+
+
+class TestKBLocalization(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.kb_path = os.path.join(tmp_dir.name, "kb.json")
+        self.localization_path = os.path.join(tmp_dir.name, "kb_localized.json")
+        write_kb(KB, self.kb_path)
+        self.utils = FakeUtilities()
+        write_kb(build_kb_localization(KB["symptoms"], self.utils, ["hi-IN", "ta-IN"]), self.localization_path)
+
+    def _checker(self, language="hi-IN"):
+        return SymptomChecker(_nlu_result(language), api_key="test_api_key_123", symptom_kb_path=self.kb_path,
+                              localization_path=self.localization_path)
+
+    def test_build_is_versioned_per_language(self):
+        with open(self.localization_path, 'r', encoding='utf-8') as f:
+            localization = json.load(f)
+        self.assertEqual(self.utils.calls, 2)  # One packed translate_many per language
+        self.assertEqual(set(localization["version"]), {"kb_fingerprint", "built_at", "translation_model", "translation_mode"})
+        self.assertEqual(localization["languages"]["ta-IN"]["fever"], {
+            "symptom_name": "[ta-IN] Fever",
+            "follow_up_questions": ["[ta-IN] How high is the fever?", None],
+            "basic_triage_points": ["[ta-IN] Fever > 3 days needs check."],
+        })
+
+    def test_questions_and_triage_points_are_localized_without_network_calls(self):
+        with patch("src.utils.get_transport", side_effect=AssertionError("no network")), \
+             patch("src.nlu_processor.get_transport", side_effect=AssertionError("no network")):
+            checker = self._checker()
+            checker.prepare_follow_up_questions()
+            question = checker.get_next_question()
+        self.assertEqual(question, {"symptom_name": "Fever", "question": "How high is the fever?",
+                                    "localized_symptom_name": "[hi-IN] Fever",
+                                    "localized_question": "[hi-IN] How high is the fever?"})
+        self.assertIsNone(checker.get_next_question()["localized_question"])  # Translated live by the UI
+
+        checker.record_answer("Fever", question["question"], "102F")
+        checker.record_answer("cough", "Is it dry?", "Yes")
+        with patch.object(checker.sarvam_client, "chat_completion", return_value={"choices": [{"message": {"content": json.dumps(
+                {"assessment_summary": "s", "suggested_severity": "m", "recommended_next_steps": "r", "potential_warnings": [], "disclaimer": "d"})}}]}):
+            assessment = checker.generate_preliminary_assessment()
+        self.assertEqual(assessment["relevant_kb_triage_points"], ["Fever > 3 days needs check.", "Coughing blood is urgent."])
+        self.assertEqual(assessment["localized_kb_triage_points"],
+                         ["[hi-IN] Fever > 3 days needs check.", "[hi-IN] Coughing blood is urgent."])
+
+    def test_english_uses_the_kb_and_stale_or_missing_builds_are_ignored(self):
+        checker = self._checker("en-IN")
+        checker.prepare_follow_up_questions()
+        self.assertEqual(checker.get_next_question()["localized_question"], "How high is the fever?")
+
+        self.assertEqual(self._checker("bn-IN").localized_kb, {})  # Language not built
+
+        KB["symptoms"][1]["follow_up_questions"].append("Any phlegm?")
+        self.addCleanup(KB["symptoms"][1]["follow_up_questions"].pop)
+        write_kb(KB, self.kb_path)
+        get_knowledge_registry().invalidate()
+        checker = self._checker()
+        self.assertEqual(checker.localized_kb, {})
+        checker.prepare_follow_up_questions()
+        self.assertIsNone(checker.get_next_question()["localized_symptom_name"])
+
+        self.localization_path += ".missing"
+        self.assertEqual(self._checker().localized_kb, {})
+
+    def test_shipped_build_covers_the_shipped_kb_without_network_calls(self):
+        kb = load_kb(DEFAULT_KB_PATH)
+        localization = load_kb(DEFAULT_KB_LOCALIZATION_PATH)
+        self.assertEqual(localization["version"]["kb_fingerprint"], kb_fingerprint(kb["symptoms"]))
+        self.assertEqual(set(localization["languages"]), set(ALIAS_LANGUAGES))
+        for language, symptoms in localization["languages"].items():
+            for symptom in kb["symptoms"]:
+                localized = symptoms[symptom["symptom_name"].lower()]
+                self.assertTrue(localized["symptom_name"], (language, symptom["symptom_name"]))
+                for field in ("follow_up_questions", "basic_triage_points"):
+                    self.assertEqual(len(localized[field]), len(symptom[field]), (language, symptom["symptom_name"], field))
+                    self.assertTrue(all(localized[field]), (language, symptom["symptom_name"], field))
+
+        get_knowledge_registry().invalidate()
+        with patch("src.utils.get_transport", side_effect=AssertionError("no network")), \
+             patch("src.nlu_processor.get_transport", side_effect=AssertionError("no network")):
+            checker = SymptomChecker(_nlu_result("hi-IN"), api_key="test_api_key_123")
+            checker.prepare_follow_up_questions()
+            question = checker.get_next_question()
+        self.assertEqual(question["localized_symptom_name"], "बुखार")
+        self.assertEqual(question["localized_question"],
+                         localization["languages"]["hi-IN"]["fever"]["follow_up_questions"][0])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.knowledge_registry import KnowledgeRegistry, get_knowledge_registry, load_symptom_knowledge
+from src.nlu_processor import HealthIntent, MedicalEntity, NLUResult, SarvamMNLUProcessor
+from src.symptom_checker import SymptomChecker
+
+
+def _write_kb(path, symptoms):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"symptoms": [{"symptom_name": name, "keywords": [f"{name} keyword"]} for name in symptoms]}, f)
+
+
+class TestKnowledgeRegistry(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.kb_path = os.path.join(tmp_dir.name, "kb.json")
+        _write_kb(self.kb_path, ["Fever"])
+        self.now = [0.0]
+        self.registry = KnowledgeRegistry(check_interval=5.0, clock=lambda: self.now[0])
+
+    def test_file_is_parsed_once_and_shared(self):
+        first = self.registry.symptom_kb(self.kb_path)
+        self.assertIs(self.registry.symptom_kb(self.kb_path), first)
+        self.assertEqual(list(first.by_name), ["fever"])
+        self.assertEqual(first.keyword_matcher.search("high FEVER KEYWORD").payloads, ("Fever",))
+        self.assertEqual(self.registry.stats()["loads"], 1)
+
+        processors = [SarvamMNLUProcessor(api_key="test_api_key_123") for _ in range(2)]
+        self.assertIs(processors[0].safety_matcher, processors[1].safety_matcher)
+        self.assertIs(processors[0].kb_keyword_matcher, get_knowledge_registry().symptom_kb().keyword_matcher)
+
+    def test_snapshots_are_read_only(self):
+        knowledge = self.registry.symptom_kb(self.kb_path)
+        with self.assertRaises(TypeError):
+            knowledge.by_name["cough"] = {}
+        with self.assertRaises(TypeError):
+            knowledge.symptoms[0]["keywords"] = []
+        with self.assertRaises(AttributeError):
+            knowledge.symptoms[0]["keywords"].append("chills")
+
+    def test_reloads_after_change_once_interval_passes(self):
+        old = self.registry.symptom_kb(self.kb_path)
+        _write_kb(self.kb_path, ["Fever", "Cough"])
+        self.assertIs(self.registry.symptom_kb(self.kb_path), old)  # Within the check interval
+
+        self.now[0] = 10.0
+        new = self.registry.symptom_kb(self.kb_path)
+        self.assertEqual(list(new.by_name), ["fever", "cough"])
+        self.assertEqual(list(old.by_name), ["fever"])  # Held snapshots are unaffected by the swap
+        self.assertEqual(self.registry.stats()["reloads"], 1)
+
+        self.now[0] = 20.0
+        self.assertIs(self.registry.symptom_kb(self.kb_path), new)  # Unchanged file is not re-parsed
+
+    def test_broken_edit_keeps_last_good_snapshot(self):
+        good = self.registry.symptom_kb(self.kb_path)
+        with open(self.kb_path, 'w', encoding='utf-8') as f:
+            f.write('{"symptoms": [')
+        self.now[0] = 10.0
+        self.assertIs(self.registry.symptom_kb(self.kb_path), good)
+        self.assertEqual(self.registry.stats()["failed_reloads"], 1)
+
+        missing = self.registry.symptom_kb(self.kb_path + ".missing")
+        self.assertEqual(dict(missing.by_name), {})
+        self.assertIsNotNone(missing.error)
+
+    def test_concurrent_first_access_loads_once(self):
+        with patch("src.knowledge_registry.load_symptom_knowledge", wraps=load_symptom_knowledge) as loader:
+            snapshots = []
+            threads = [threading.Thread(target=lambda: snapshots.append(self.registry.symptom_kb(self.kb_path)))
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len({id(snapshot) for snapshot in snapshots}), 1)
+        self.assertEqual(loader.call_count, 1)
+
+    def test_slow_build_only_blocks_its_own_file(self):
+        config_path = os.path.join(os.path.dirname(self.kb_path), "nlu_config.json")
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump({"keyword_lists": {"emergency_keywords": {"en": ["chest pain"]}}}, f)
+        loading, release = threading.Event(), threading.Event()
+        self.addCleanup(release.set)
+
+        def slow_load(filepath, stamp=None):
+            loading.set()
+            release.wait(5)
+            return load_symptom_knowledge(filepath, stamp)
+
+        with patch("src.knowledge_registry.load_symptom_knowledge", side_effect=slow_load):
+            thread = threading.Thread(target=self.registry.symptom_kb, args=(self.kb_path,))
+            thread.start()
+            self.assertTrue(loading.wait(5))
+            config = self.registry.nlu_config(config_path)  # Not queued behind the KB build
+            self.assertTrue(thread.is_alive())
+            release.set()
+            thread.join()
+        self.assertTrue(config.safety_matcher.is_emergency("sudden chest pain", "en-IN"))
+        self.assertEqual(self.registry.stats()["loads"], 2)
+
+    def test_long_lived_consumers_see_reloaded_snapshots(self):
+        processor = SarvamMNLUProcessor(api_key="test_api_key_123")
+        processor.knowledge = self.registry
+        processor._load_symptom_kb(self.kb_path)
+        nlu_result = NLUResult("a cough", HealthIntent.SYMPTOM_QUERY, 0.9, [MedicalEntity("cough", "symptom", 0.9, 2, 7)],
+                               False, True, "en-IN")
+        with patch("src.symptom_checker.get_knowledge_registry", return_value=self.registry):
+            checker = SymptomChecker(nlu_result, api_key="test_api_key_123", symptom_kb_path=self.kb_path)
+            with patch.object(checker.utils, "translate_text_to_english", return_value="cough"):
+                self.assertIsNone(processor.kb_keyword_matcher.search("a cough keyword"))
+                self.assertEqual(checker.identify_relevant_symptoms(), [])
+
+                _write_kb(self.kb_path, ["Fever", "Cough"])
+                self.now[0] = 10.0
+                self.assertEqual(processor.kb_keyword_matcher.search("a cough keyword").payloads, ("Cough",))
+                self.assertEqual([symptom["symptom_name"] for symptom in checker.identify_relevant_symptoms()], ["Cough"])
+                self.assertIn("cough", checker.localized_kb)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
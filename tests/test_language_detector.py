@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.language_detector import SCRIPTS, get_language_detector, script_histograms
+from src.utils import HealHubUtilities
+
+SAMPLES = [
+    ("मुझे बुखार और सिरदर्द है", "hi-IN"),
+    ("मला ताप आहे आणि खोकला येतो", "mr-IN"),
+    ("আমি ঘন ঘন প্রস্রাব করছি", "bn-IN"),
+    ("எனக்கு வாந்தி மற்றும் வயிற்று வலி உள்ளது", "ta-IN"),
+    ("నాకు జ్వరం మరియు శరీరంలో నొప్పి ఉంది", "te-IN"),
+    ("ನನಗೆ ಎದೆನೋವು ಮತ್ತು ಉಸಿರಾಟದಲ್ಲಿ ತೊಂದರೆ ಇದೆ", "kn-IN"),
+    ("എനിക്ക് പലതവണ മൂത്രം വരുന്നു", "ml-IN"),
+    ("What are the symptoms of diabetes?", "en-IN"),
+]
+
+
+class TestLanguageDetector(unittest.TestCase):
+
+    def setUp(self):
+        self.detector = get_language_detector()
+
+    def test_every_supported_language(self):
+        for text, language in SAMPLES:
+            self.assertEqual(self.detector.detect(text), language, text)
+        self.assertEqual(self.detector.detect_batch([text for text, _ in SAMPLES]),
+                         [language for _, language in SAMPLES])
+
+    def test_code_mixed_and_romanized_text(self):
+        self.assertEqual(self.detector.detect("मुझे chest pain हो रहा है"), "hi-IN")
+        self.assertEqual(self.detector.detect("எனக்கு fever இருக்கிறது"), "ta-IN")
+        guess = self.detector.guess("kal se pet mein dard ho raha hai")
+        self.assertEqual((guess.language, guess.romanized), ("hi-IN", True))
+        for text in ["I have fever", "Can I take crocin?", "ok", "12345", ""]:
+            self.assertEqual(self.detector.detect(text), "en-IN", text)
+
+    def test_marathi_is_told_apart_from_hindi(self):
+        self.assertEqual(self.detector.detect("माझे डोके दुखते"), "mr-IN")
+        self.assertEqual(self.detector.detect("मला बरे वाटत नाही"), "mr-IN")
+        self.assertEqual(self.detector.detect("क्या मुझे टीबी है?"), "hi-IN")
+
+    def test_histograms_are_computed_per_text_in_one_pass(self):
+        histograms = script_histograms(["ab क", "", "தமிழ் x"])
+        self.assertEqual(histograms.shape, (3, len(SCRIPTS)))
+        self.assertEqual(histograms[0, SCRIPTS.index("Latn")], 2)
+        self.assertEqual(histograms[0, SCRIPTS.index("Deva")], 1)
+        self.assertEqual(histograms[1].sum(), 0)
+        self.assertEqual(histograms[2, SCRIPTS.index("Taml")], 5)
+
+    def test_utilities_detect_language_makes_no_api_call(self):
+        util = HealHubUtilities(api_key="test_api_key_123")
+        with patch("src.utils.get_transport", side_effect=AssertionError("network call")):
+            self.assertEqual(util.detect_language("ನನಗೆ ಜ್ವರ ಇದೆ"), "kn-IN")
+            self.assertEqual(util.detect_language("hello there"), "en-IN")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
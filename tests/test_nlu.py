@@ -1,4 +1,27 @@
-from src.nlu_processor import SarvamMNLUProcessor
+import json
+import time
+import types
+import unittest
+from unittest.mock import patch
+
+from src.knowledge_registry import build_kb_keyword_matcher
+from src.nlu_processor import SarvamMNLUProcessor, HealthIntent, MedicalEntity
+
+
+def _fake_completion(delay=0.0):
+    """Build a chat_completion stand-in that answers intent and entity prompts."""
+    def chat_completion(messages, model="sarvam-m", **kwargs):
+        time.sleep(delay)
+        system_prompt = messages[0]["content"]
+        if "healthcare query analyzer" in system_prompt:
+            content = {"intent": "symptom_query", "confidence": 0.9, "language": "en-IN",
+                       "entities": [{"text": "fever", "type": "symptom", "start": 7, "end": 12, "confidence": 0.9}]}
+        elif "intent classifier" in system_prompt:
+            content = {"intent": "symptom_query", "confidence": 0.9}
+        else:
+            content = {"entities": [{"text": "fever", "type": "symptom", "start": 7, "end": 12, "confidence": 0.9}]}
+        return {"choices": [{"message": {"content": json.dumps(content)}}]}
+    return chat_completion
 
 def test_nlu():
     try:
@@ -32,5 +55,114 @@ def test_nlu():
         print("Make sure to set your SARVAM_API_KEY environment variable")
         print("Get your API key from: https://dashboard.sarvam.ai")
 
+class TestNLUPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = SarvamMNLUProcessor(api_key="test_api_key_123")
+
+    def test_stages_run_concurrently(self):
+        self.processor.sarvam_client.chat_completion = _fake_completion(delay=0.3)
+
+        start = time.perf_counter()
+        result = self.processor.process_transcription("I have fever", "en-IN")
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY)
+        self.assertEqual([e.text for e in result.entities], ["fever"])
+        self.assertFalse(result.is_emergency)
+        self.assertLess(elapsed, 0.55)  # Two 0.3s calls overlap instead of adding up
+
+    def test_sync_wrapper_inside_running_loop(self):
+        import asyncio
+        self.processor.sarvam_client.chat_completion = _fake_completion()
+
+        async def call_from_loop():
+            return self.processor.process_transcription("I have fever", "en-IN")
+
+        result = asyncio.run(call_from_loop())
+        self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY)
+
+    def test_sync_stage_helpers_run_the_async_stages(self):
+        import asyncio
+        self.processor.sarvam_client.chat_completion = _fake_completion()
+        self.processor.intent_threshold = 1.1  # Force the Sarvam-M path
+
+        self.assertEqual(self.processor._classify_intent("I have fever", "en-IN"), (HealthIntent.SYMPTOM_QUERY, 0.9))
+
+        async def call_from_loop():
+            return self.processor._extract_medical_entities("I have fever", "en-IN")
+
+        self.assertEqual([e.text for e in asyncio.run(call_from_loop())], ["fever"])
+
+    def test_fused_mode_uses_single_call(self):
+        calls = []
+        fake = _fake_completion()
+        def counting_completion(messages, model="sarvam-m", **kwargs):
+            calls.append(messages[0]["content"])
+            return fake(messages, model, **kwargs)
+        self.processor.sarvam_client.chat_completion = counting_completion
+
+        result = self.processor.process_transcription("I have fever", "en-IN", nlu_mode="fused")
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY)
+        self.assertEqual([e.text for e in result.entities], ["fever"])
+        self.assertEqual(result.language_detected, "en-IN")
+        self.assertEqual(self.processor.nlu_stats["fused_fallbacks"], 0)
+
+    def test_fused_mode_falls_back_on_schema_violation(self):
+        fake = _fake_completion()
+        def completion(messages, model="sarvam-m", **kwargs):
+            if "healthcare query analyzer" in messages[0]["content"]:
+                # Missing "entities" and "language", confidence out of range
+                return {"choices": [{"message": {"content": '{"intent": "symptom_query", "confidence": 7}'}}]}
+            return fake(messages, model, **kwargs)
+        self.processor.sarvam_client.chat_completion = completion
+
+        result = self.processor.process_transcription("I have fever", "en-IN", nlu_mode="fused")
+
+        self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY)
+        self.assertEqual([e.text for e in result.entities], ["fever"])
+        self.assertEqual(self.processor.nlu_stats["fused_fallbacks"], 1)
+
+
+class TestKBEntityAugmentation(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = SarvamMNLUProcessor(api_key="test_api_key_123")
+
+    def test_keyword_hits_map_to_canonical_symptoms(self):
+        text = "Since Monday I have a HEADACHE, a runny nose and a sore throat"
+        llm_entities = [MedicalEntity(text="sore throat", entity_type="symptom", confidence=0.9, start_pos=51, end_pos=62)]
+
+        entities = self.processor._augment_with_kb_entities(text, list(llm_entities))
+
+        added = entities[len(llm_entities):]
+        self.assertIn(("HEADACHE", "headache"), [(e.text, e.canonical_name) for e in added])
+        for entity in added:
+            self.assertEqual(text[entity.start_pos:entity.end_pos], entity.text)
+            self.assertNotEqual(entity.canonical_name, "sore throat")  # Covered by the LLM span
+
+    def test_latency_stays_flat_as_kb_grows(self):
+        text = "I have had fever, a dry cough and body aches for three days " * 5
+        small_kb = self.processor.symptom_kb
+        large_kb = list(small_kb) + [{"symptom_name": f"synthetic symptom {i}",
+                                "keywords": [f"synthetic keyword {i} {j}" for j in range(5)]} for i in range(3000)]
+
+        def best_of(kb, runs=20):
+            snapshot = types.SimpleNamespace(symptoms=kb, keyword_matcher=build_kb_keyword_matcher(kb))
+            timings = []
+            with patch.object(self.processor.knowledge, "symptom_kb", return_value=snapshot):
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    self.processor._augment_with_kb_entities(text, [])
+                    timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        small, large = best_of(small_kb), best_of(large_kb)
+        # 170x more keywords; a per-keyword scan grows linearly, the compiled matcher barely moves
+        self.assertLess(large, max(small * 10, 0.002))
+
+
 if __name__ == "__main__":
     test_nlu()
@@ -0,0 +1,152 @@
+import unittest
+from unittest.mock import patch
+import concurrent.futures
+import json
+import os
+import sys
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import LRUCache, TieredCache
+from src.kb_build import write_kb
+from src.nlu_processor import NLUResult, MedicalEntity, HealthIntent
+from src.prefetch import ASSESSMENT_LABELS, FollowUpPrefetcher
+from src.symptom_checker import SymptomChecker
+from src.utils import HealHubUtilities
+
+KB = {"symptoms": [
+    {"symptom_name": "Fever", "keywords": [], "follow_up_questions": ["How high is the fever?", "Any chills?"],
+     "basic_triage_points": ["Fever > 3 days needs check."]},
+    {"symptom_name": "cough", "keywords": [], "follow_up_questions": ["Is it dry?"],
+     "basic_triage_points": ["Coughing blood is urgent."]},
+]}
+
+LLM_REPLY = {"choices": [{"message": {"content": json.dumps(
+    {"assessment_summary": "Likely viral.", "suggested_severity": "Seems mild", "recommended_next_steps": ["Rest"],
+     "potential_warnings": [], "disclaimer": "d"})}}]}
+
+
+def _fake_translation(text, target_lang, source_lang='auto'):
+    return "\n".join(f"[{target_lang}] {line}" for line in text.split("\n"))
+
+
+class TestFollowUpPrefetcher(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        kb_path = os.path.join(tmp_dir.name, "kb.json")
+        write_kb(KB, kb_path)
+        self.utils = HealHubUtilities(api_key="test_api_key_123", translation_cache=TieredCache(LRUCache()))
+        nlu_result = NLUResult("fever", HealthIntent.SYMPTOM_QUERY, 0.9, [MedicalEntity("fever", "symptom", 0.9, 0, 5)],
+                               False, True, "hi-IN")
+        self.kb_path = kb_path
+        self.localization_path = os.path.join(tmp_dir.name, "missing.json")
+        self.checker = SymptomChecker(nlu_result, api_key="test_api_key_123", symptom_kb_path=kb_path,
+                                      localization_path=self.localization_path, utils=self.utils)
+        self.checker.prepare_follow_up_questions()
+
+    def test_next_question_and_assessment_labels_are_translated_ahead(self):
+        prefetcher = FollowUpPrefetcher(self.utils, "hi-IN")
+        first = self.checker.get_next_question()
+        with patch.object(self.utils, "_request_translation", side_effect=_fake_translation):
+            prefetcher.prefetch_next(self.checker).result()
+        with patch.object(self.utils, "_request_translation", side_effect=AssertionError("not prefetched")):
+            second = self.checker.get_next_question()
+            self.assertEqual(prefetcher.question_texts(second), ("[hi-IN] Fever", "[hi-IN] Any chills?"))
+
+        # Showing the last question: the assessment's fixed strings are warmed instead
+        self.checker.record_answer("Fever", first["question"], "102F")
+        with patch.object(self.utils, "_request_translation", side_effect=_fake_translation):
+            prefetcher.prefetch_next(self.checker).result()
+        with patch.object(self.utils, "_request_translation", side_effect=AssertionError("not prefetched")):
+            translated = self.utils.translate_many([*ASSESSMENT_LABELS, "Fever > 3 days needs check."], "hi-IN")
+        self.assertEqual(translated[-1], "[hi-IN] Fever > 3 days needs check.")
+
+    def test_last_question_warms_the_triage_points_of_its_unanswered_symptom(self):
+        entities = [MedicalEntity("fever", "symptom", 0.9, 0, 5), MedicalEntity("cough", "symptom", 0.9, 10, 15)]
+        nlu_result = NLUResult("fever and cough", HealthIntent.SYMPTOM_QUERY, 0.9, entities, False, True, "hi-IN")
+        checker = SymptomChecker(nlu_result, api_key="test_api_key_123", symptom_kb_path=self.kb_path,
+                                 localization_path=self.localization_path, utils=self.utils)
+        checker.prepare_follow_up_questions()
+        prefetcher = FollowUpPrefetcher(self.utils, "hi-IN")
+        for question in (checker.get_next_question(), checker.get_next_question()):
+            checker.record_answer(question["symptom_name"], question["question"], "yes")
+        self.assertEqual(checker.get_next_question()["symptom_name"], "cough")  # Last question, cough unanswered
+
+        with patch.object(self.utils, "_request_translation", side_effect=_fake_translation):
+            prefetcher.prefetch_next(checker).result()
+        with patch.object(self.utils, "_request_translation", side_effect=AssertionError("not prefetched")):
+            translated = self.utils.translate_many(["Fever > 3 days needs check.", "Coughing blood is urgent."], "hi-IN")
+        self.assertEqual(translated[1], "[hi-IN] Coughing blood is urgent.")
+
+    def test_assessment_runs_while_the_page_renders(self):
+        prefetcher = FollowUpPrefetcher(self.utils, "hi-IN")
+        for question in iter(self.checker.get_next_question, None):
+            self.checker.record_answer(question["symptom_name"], question["question"], "yes")
+        llm_started, page_rendered = threading.Event(), threading.Event()
+
+        def slow_chat_completion(*args, **kwargs):
+            llm_started.set()
+            self.assertTrue(page_rendered.wait(5))  # Still in flight while the caller renders
+            return LLM_REPLY
+
+        with patch.object(self.checker.sarvam_client, "chat_completion", side_effect=slow_chat_completion) as chat_completion, \
+             patch.object(self.utils, "_request_translation", side_effect=_fake_translation):
+            future = prefetcher.start_assessment(self.checker)
+            self.assertTrue(llm_started.wait(5))
+            self.assertFalse(future.done())
+            page_rendered.set()  # The UI renders the last answer here, then collects the assessment
+            assessment, translated = prefetcher.assessment(self.checker)
+        chat_completion.assert_called_once()
+        self.assertEqual(translated[assessment["assessment_summary"]], "[hi-IN] Likely viral.")
+
+    def test_cancelled_assessment_is_not_generated_again(self):
+        prefetcher = FollowUpPrefetcher(self.utils, "hi-IN")
+        for question in iter(self.checker.get_next_question, None):
+            self.checker.record_answer(question["symptom_name"], question["question"], "yes")
+        with patch.object(self.checker.sarvam_client, "chat_completion", return_value=LLM_REPLY) as chat_completion, \
+             patch.object(self.utils, "_request_translation", side_effect=_fake_translation):
+            prefetcher.start_assessment(self.checker).result()
+            prefetcher.cancel()
+            self.assertIsNone(prefetcher.assessment(self.checker))
+        chat_completion.assert_called_once()
+
+    def test_assessment_and_translations_start_when_the_last_answer_is_recorded(self):
+        prefetcher = FollowUpPrefetcher(self.utils, "hi-IN")
+        for question in iter(self.checker.get_next_question, None):
+            self.checker.record_answer(question["symptom_name"], question["question"], "yes")
+        with patch.object(self.checker.sarvam_client, "chat_completion", return_value=LLM_REPLY) as chat_completion, \
+             patch.object(self.utils, "_request_translation", side_effect=_fake_translation):
+            prefetcher.start_assessment(self.checker).result()
+            self.assertIs(prefetcher.start_assessment(self.checker), prefetcher.start_assessment(self.checker))
+            with patch.object(self.utils, "translate_many", side_effect=AssertionError("already translated")):
+                assessment, translated = prefetcher.assessment(self.checker)
+        chat_completion.assert_called_once()
+        self.assertEqual(assessment["relevant_kb_triage_points"], ["Fever > 3 days needs check."])
+        self.assertEqual(translated["Likely viral."], "[hi-IN] Likely viral.")
+        self.assertEqual(translated["Fever > 3 days needs check."], "[hi-IN] Fever > 3 days needs check.")
+
+    def test_cancel_drops_queued_work(self):
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        executor.submit(release.wait)  # Keeps prefetch jobs queued
+        prefetcher = FollowUpPrefetcher(self.utils, "hi-IN", executor=executor)
+        self.checker.get_next_question()
+
+        with patch.object(self.utils, "_request_translation", side_effect=AssertionError("cancelled")):
+            queued = prefetcher.prefetch_next(self.checker)
+            prefetcher.cancel()
+            release.set()
+            self.assertTrue(queued.cancelled())
+            self.assertTrue(prefetcher.cancelled)
+            self.assertIsNone(prefetcher.prefetch_next(self.checker))
+            self.assertIsNone(prefetcher.start_assessment(self.checker))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
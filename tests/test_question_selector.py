@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.knowledge_registry import DEFAULT_KB_PATH
+from src.nlu_processor import NLUResult, MedicalEntity, HealthIntent
+from src.question_selector import AdaptiveQuestioner, parse_triage_point, question_covers
+from src.question_selector import DEFAULT_VIGNETTES_PATH, P_REPORTED, evaluate
+from src.symptom_checker import SymptomChecker
+
+# symptom -> (level of each triage point, triage points each follow-up question covers)
+KB_TRIAGE = {
+    "fever": ([1, 2, 3], [[0], [1], [2]]),
+    "cough": ([1, 3, 2], [[0], [1], [2]]),
+    "headache": ([3, 3, 1], [[0], [0], [1]]),
+    "stomach ache": ([3, 3, 1], [[], [0], [1], []]),
+    "diarrhea": ([1, 2, 3], [[0], [2], [1], [1]]),
+    "vomiting": ([1, 3, 3], [[], [1, 2], [0], [2]]),
+    "skin rash": ([1, 3, 1], [[0], [2], [], [1]]),
+    "joint pain": ([1, 1, 1], [[], [2], [2], [1]]),
+    "shortness of breath": ([3, 2, 1], [[1], [0], [0, 2], []]),
+    "chest pain": ([3, 1, 1], [[0], [0], [0], [0, 1]]),
+    "fatigue": ([1, 1, 3], [[2], [2], [], [0, 1]]),
+    "body aches": ([1, 1, 1], [[1], [1, 2], [], [0, 1, 2]]),
+    "sore throat": ([3, 1, 0], [[1], [0], [1], [0, 2]]),
+    "loss of taste or smell": ([1, 1, 1], [[0, 1], [], [2], [0]]),
+    "constipation": ([2, 1, 0], [[1], [0, 1], [0], [2]]),
+    "night sweats": ([1, 1, 1], [[1], [], [0], [2]]),
+    "unexplained weight loss": ([1, 1, 1], [[0], [], [1], []]),
+    "dental pain": ([3, 1, 0], [[0], [], [0, 1], [0]]),
+}
+
+
+class TestAdaptiveQuestioner(unittest.TestCase):
+
+    def setUp(self):
+        with open(DEFAULT_KB_PATH, 'r', encoding='utf-8') as f:
+            self.kb = {symptom["symptom_name"].lower(): symptom for symptom in json.load(f)["symptoms"]}
+
+    def _checker(self, questioner):
+        entities = [MedicalEntity("fever", "symptom", 0.9, 7, 12), MedicalEntity("cough", "symptom", 0.9, 17, 22)]
+        nlu_result = NLUResult("I have fever and cough", HealthIntent.SYMPTOM_QUERY, 0.9, entities, False, True, "en-IN")
+        checker = SymptomChecker(nlu_result, api_key="test_api_key_123", questioner=questioner)
+        checker.prepare_follow_up_questions()
+        return checker
+
+    def test_triage_points_are_parsed_into_levels_and_thresholds(self):
+        duration, temperature, red_flags = [parse_triage_point("fever", text) for text in self.kb["fever"]["basic_triage_points"]]
+        self.assertEqual((duration.level, duration.min_days), (1, 3.0))
+        self.assertEqual((temperature.level, temperature.min_temperature_f), (2, 103.0))
+        self.assertEqual(red_flags.level, 3)
+        self.assertTrue({"confusion", "stiff", "neck"} <= red_flags.terms)
+        self.assertEqual(parse_triage_point("cough", self.kb["cough"]["basic_triage_points"][0]).min_days, 14.0)
+
+    def test_every_kb_symptom_has_pinned_levels_and_question_coverage(self):
+        self.assertEqual(set(KB_TRIAGE), set(self.kb))
+        for symptom_id, (levels, coverage) in KB_TRIAGE.items():
+            points = [parse_triage_point(symptom_id, text) for text in self.kb[symptom_id]["basic_triage_points"]]
+            self.assertEqual([point.level for point in points], levels, symptom_id)
+            self.assertEqual([[index for index, point in enumerate(points) if question_covers(symptom_id, question, point)]
+                              for question in self.kb[symptom_id]["follow_up_questions"]], coverage, symptom_id)
+
+        # Stems and synonyms, not raw words: "suddenly" covers "sudden", "bowel" covers "stools"
+        sudden = parse_triage_point("shortness of breath", self.kb["shortness of breath"]["basic_triage_points"][0])
+        self.assertTrue(question_covers("shortness of breath", "Did it start suddenly or gradually?", sudden))
+        self.assertEqual(parse_triage_point("headache", "Frequent or worsening headaches should be discussed with a "
+                                                        "healthcare provider.").level, 1)
+
+    def test_red_flags_end_the_questions_and_denials_are_read_with_negation(self):
+        questioner = AdaptiveQuestioner()
+        symptoms = {name: self.kb[name] for name in ("fever", "cough")}
+        severity, confidence = questioner.assess(symptoms, {"cough": {"Any other symptoms?": "I am coughing up blood"}})
+        self.assertEqual(severity, "emergency")
+        self.assertGreater(confidence, 0.9)
+        pending = [("fever", 0), ("fever", 1), ("fever", 2)]
+        # The reported red flag settles the emergency point; the temperature one still has to be asked
+        self.assertEqual(questioner.next_question(symptoms, pending, {}, "fever with stiff neck and confusion"), 1)
+        self.assertIsNone(questioner.next_question(symptoms, pending, {"fever": {"q": "104F"}},
+                                                   "fever with stiff neck and confusion"))
+        self.assertIsNotNone(questioner.next_question(symptoms, pending, {}, "fever, no stiff neck or confusion"))
+        # The budget only limits optional questions: unresolved red-flag points are asked about regardless
+        self.assertEqual(AdaptiveQuestioner(budget=1).next_question(symptoms, pending, {"fever": {"q": "a"}}), 1)
+        self.assertIsNone(AdaptiveQuestioner(budget=1).next_question(
+            symptoms, [("fever", 0)], {"fever": {"q": "99F, no stiff neck or confusion"}}))
+
+    def test_every_symptom_gets_a_question_and_red_flags_are_never_skipped(self):
+        questioner = AdaptiveQuestioner(budget=0, confidence=0.5)
+        for symptom_id, (levels, coverage) in KB_TRIAGE.items():
+            symptoms = {symptom_id: self.kb[symptom_id]}
+            pending = [(symptom_id, position) for position in range(len(coverage))]
+            answers = {}
+            while (index := questioner.next_question(symptoms, pending, answers, f"I have {symptom_id}")) is not None:
+                _, position = pending.pop(index)
+                answers.setdefault(symptom_id, {})[self.kb[symptom_id]["follow_up_questions"][position]] = "no"
+            asked = [position for position in range(len(coverage)) if (symptom_id, position) not in pending]
+            self.assertTrue(asked, symptom_id)
+            for point, level in enumerate(levels):
+                if level >= 2 and any(point in covered for covered in coverage):
+                    self.assertTrue(any(point in coverage[position] for position in asked), (symptom_id, point))
+
+    def test_symptom_checker_asks_the_most_informative_questions_first(self):
+        checker = self._checker(AdaptiveQuestioner(budget=3))
+        self.assertEqual(len(checker.state.pending), 6)
+        first = checker.get_next_question()
+        self.assertEqual(first["question"], self.kb["cough"]["follow_up_questions"][2])  # Covers both severe red-flag points
+        checker.record_answer(first["symptom_name"], first["question"], "no, nothing like that")
+        second = checker.peek_next_question()
+        self.assertEqual(checker.get_next_question(), second)
+        self.assertEqual(second["question"], self.kb["fever"]["follow_up_questions"][1])
+        checker.record_answer(second["symptom_name"], second["question"], "104F")
+        # Past the budget, but both remaining red-flag questions are still asked before stopping
+        for question in (self.kb["cough"]["follow_up_questions"][1], self.kb["fever"]["follow_up_questions"][2]):
+            self.assertEqual(checker.get_next_question()["question"], question)
+            checker.record_answer("cough" if question in self.kb["cough"]["follow_up_questions"] else "fever", question, "no")
+        self.assertIsNone(checker.get_next_question())  # Temperature above 103F: confident it needs prompt attention
+        self.assertEqual(checker.state.pending, [])
+
+        with patch.dict(os.environ, {"HEALHUB_ADAPTIVE_QUESTIONS": "0"}):
+            checker = self._checker(None)
+        self.assertIsNone(checker.questioner)
+        self.assertEqual(checker.get_next_question()["question"], self.kb["fever"]["follow_up_questions"][0])
+
+    def test_labelled_vignettes_need_fewer_turns_and_none_is_under_triaged(self):
+        with open(DEFAULT_VIGNETTES_PATH, 'r', encoding='utf-8') as f:
+            vignettes = json.load(f)["vignettes"]
+        self.assertTrue({symptom_id for vignette in vignettes for symptom_id in vignette["answers"]} <= set(self.kb))
+        symptoms = list(self.kb.values())
+        sequential = evaluate(symptoms, vignettes, None)
+        adaptive = evaluate(symptoms, vignettes, AdaptiveQuestioner())
+        self.assertEqual(sequential["under_triaged"], [])
+        self.assertEqual(adaptive["under_triaged"], [])
+        self.assertLess(adaptive["average_turns"], sequential["average_turns"])
+
+    def test_a_denial_only_negates_its_own_answer_and_clause(self):
+        questioner = AdaptiveQuestioner()
+        symptoms = {"cough": self.kb["cough"], "shortness of breath": self.kb["shortness of breath"]}
+        answers = {"cough": {"Any chest pain?": "no", "Phlegm?": "there was blood in what I coughed up"}}
+        self.assertEqual(questioner.assess(symptoms, answers)[0], "emergency")
+        answers = {"shortness of breath": {"Other symptoms?": "no, but my ankles have been swollen"}}
+        points = questioner.triage_points({"shortness of breath": self.kb["shortness of breath"]})
+        self.assertEqual(questioner.point_probabilities(points, answers)[2], P_REPORTED)  # Swelling in feet or ankles
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.http_transport import SarvamTransport
+from src.rate_limiter import EndpointGovernor, EndpointLimit, RateLimitTimeout, limits_from_env
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.server.lock:
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        time.sleep(0.1)
+        with self.server.lock:
+            self.server.active -= 1
+        payload = json.dumps({"ok": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestEndpointGovernor(unittest.TestCase):
+
+    def test_token_bucket_paces_after_burst(self):
+        governor = EndpointGovernor("translate", EndpointLimit(rate_per_second=20, burst=2, max_in_flight=4))
+        start = time.perf_counter()
+        for _ in range(6):
+            governor.acquire()
+            governor.release()
+        # Two requests ride the burst, the remaining four wait ~50 ms each
+        self.assertGreaterEqual(time.perf_counter() - start, 0.15)
+        self.assertGreater(governor.stats()["max_wait_ms"], 0)
+
+    def test_saturated_endpoint_times_out(self):
+        governor = EndpointGovernor("tts", EndpointLimit(max_in_flight=1, max_queue_wait=0.05))
+        governor.acquire()
+        with self.assertRaises(RateLimitTimeout):
+            governor.acquire()
+        governor.release()
+        governor.acquire()  # Slot is free again
+
+        stats = governor.stats()
+        self.assertEqual((stats["admitted"], stats["timeouts"], stats["in_flight"]), (2, 1, 1))
+
+    def test_limits_from_env(self):
+        with patch.dict(os.environ, {"HEALHUB_RATE_LIMIT_CHAT_RPS": "2.5", "HEALHUB_RATE_LIMIT_CHAT_CONCURRENCY": "3"}):
+            limits = limits_from_env()
+        self.assertEqual((limits["chat"].rate_per_second, limits["chat"].max_in_flight), (2.5, 3))
+        self.assertEqual(limits["tts"], EndpointLimit(rate_per_second=5, burst=10, max_in_flight=4))
+
+
+class TestTransportConcurrencyLimit(unittest.TestCase):
+
+    def test_in_flight_requests_are_bounded_and_queued(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+        server.daemon_threads = True
+        server.lock, server.active, server.peak = threading.Lock(), 0, 0
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        transport = SarvamTransport(limits={"chat": EndpointLimit(rate_per_second=100, burst=100, max_in_flight=2)})
+        url = f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+        try:
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                statuses = list(executor.map(lambda i: transport.post("chat", url, json={"i": i}).status_code, range(6)))
+        finally:
+            transport.close()
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(statuses, [200] * 6)
+        self.assertLessEqual(server.peak, 2)
+        stats = transport.limiter_stats()["chat"]
+        self.assertEqual((stats["admitted"], stats["in_flight"], stats["timeouts"]), (6, 0, 0))
+        self.assertGreater(stats["max_wait_ms"], 50)  # Later callers queued instead of failing
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,178 @@
+import unittest
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.http_transport import SarvamTransport
+from src.request_policy import CircuitBreaker, CircuitOpenError, RequestPolicy, retry_after_seconds
+
+
+class _ScriptedServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, script):
+        super().__init__(("127.0.0.1", 0), _ScriptedHandler)
+        self.script = list(script)  # (status, delay_seconds, headers) per request; last entry repeats
+        self.hits = 0
+        self.lock = threading.Lock()
+
+    def next_step(self):
+        with self.lock:
+            self.hits += 1
+            return self.script.pop(0) if len(self.script) > 1 else self.script[0]
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, delay, headers = self.server.next_step()
+        time.sleep(delay)
+        payload = json.dumps({"status": status}).encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRequestPolicy(unittest.TestCase):
+
+    def _serve(self, script, **transport_kwargs):
+        server = _ScriptedServer(script)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        transport = SarvamTransport(**transport_kwargs)
+        self.addCleanup(transport.close)
+        return server, transport, f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+    def test_retries_transient_status_honouring_retry_after(self):
+        server, transport, url = self._serve([(503, 0, {"Retry-After": "0"}), (429, 0, {}), (200, 0, {})])
+        policy = RequestPolicy(max_retries=2, backoff_base=0.01)
+
+        response = transport.post("chat", url, policy=policy, json={})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(server.hits, 3)
+        self.assertEqual(transport.policy_stats()["retries"], 2)
+
+    def test_gives_up_with_last_response_when_retries_run_out(self):
+        server, transport, url = self._serve([(503, 0, {})])
+        response = transport.post("chat", url, policy=RequestPolicy(max_retries=1, backoff_base=0.01), json={})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(server.hits, 2)
+
+    def test_circuit_opens_and_fails_fast(self):
+        server, transport, url = self._serve([(503, 0, {})])
+        policy = RequestPolicy(max_retries=0, failure_threshold=2, reset_timeout=60)
+
+        transport.post("chat", url, policy=policy, json={})
+        transport.post("chat", url, policy=policy, json={})
+        with self.assertRaises(CircuitOpenError):
+            transport.post("chat", url, policy=policy, json={})
+
+        self.assertEqual(server.hits, 2)  # The rejected call never reached the server
+        stats = transport.policy_stats()
+        self.assertEqual(stats["circuits"]["chat"], CircuitBreaker.OPEN)
+        self.assertEqual(stats["circuit_rejections"], 1)
+
+    def test_deadline_bounds_timed_out_retries(self):
+        server, transport, url = self._serve([(200, 1.0, {})], timeouts={"chat": 0.3})
+        policy = RequestPolicy(max_retries=5, backoff_base=0.01, deadline=0.5)
+
+        start = time.perf_counter()
+        with self.assertRaises(requests.exceptions.Timeout):
+            transport.post("chat", url, policy=policy, json={})
+        elapsed = time.perf_counter() - start
+
+        # Without the deadline: 6 attempts x 0.3s; the second attempt only gets what is left of 0.5s
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(server.hits, 2)
+
+    def test_no_retry_starts_past_the_deadline(self):
+        server, transport, url = self._serve([(503, 0, {"Retry-After": "5"})])
+        policy = RequestPolicy(max_retries=3, deadline=1.0)
+
+        start = time.perf_counter()
+        response = transport.post("chat", url, policy=policy, json={})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(server.hits, 1)
+
+    def test_policies_with_other_thresholds_get_their_own_breaker(self):
+        server, transport, url = self._serve([(503, 0, {})])
+        strict = RequestPolicy(max_retries=0, failure_threshold=1, reset_timeout=60)
+        lenient = RequestPolicy(max_retries=0, failure_threshold=3, reset_timeout=60)
+
+        same_thresholds = RequestPolicy(failure_threshold=1, reset_timeout=60)
+        self.assertIs(transport.breaker_for("chat", strict), transport.breaker_for("chat", same_thresholds))
+        self.assertIsNot(transport.breaker_for("chat", strict), transport.breaker_for("chat", lenient))
+        transport.post("chat", url, policy=strict, json={})
+        with self.assertRaises(CircuitOpenError):
+            transport.post("chat", url, policy=strict, json={})
+        transport.post("chat", url, policy=lenient, json={})  # Still closed after one failure
+
+        self.assertEqual(server.hits, 2)
+        self.assertEqual(transport.breaker_for("chat", lenient).state, CircuitBreaker.CLOSED)
+        self.assertEqual(transport.policy_stats()["circuits"]["chat"], CircuitBreaker.OPEN)
+
+    def test_hedged_request_beats_slow_primary(self):
+        server, transport, url = self._serve([(200, 1.0, {}), (200, 0, {})])
+        policy = RequestPolicy(hedge=True, hedge_min_delay=0.05, hedge_default_delay=0.1)
+
+        start = time.perf_counter()
+        response = transport.post("chat", url, policy=policy, json={})
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(elapsed, 0.6)
+        stats = transport.policy_stats()
+        self.assertEqual((stats["hedged"], stats["hedge_wins"]), (1, 1))
+
+
+class TestPolicyPrimitives(unittest.TestCase):
+
+    def test_circuit_breaker_half_open_probe(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        now[0] = 11
+        self.assertTrue(breaker.allow())   # Single probe
+        self.assertFalse(breaker.allow())  # Others still fail fast while the probe is out
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow())
+
+    def test_retry_after_parsing_and_backoff_bounds(self):
+        response = MagicMock()
+        response.headers = {"Retry-After": "120"}
+        self.assertEqual(retry_after_seconds(response, cap=10), 10)
+        response.headers = {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        self.assertEqual(retry_after_seconds(response, cap=10), 0)  # Date in the past
+        response.headers = {}
+        self.assertIsNone(retry_after_seconds(response, cap=10))
+
+        policy = RequestPolicy(backoff_base=0.5, backoff_max=1.0)
+        self.assertTrue(all(0 <= policy.backoff(attempt) <= 1.0 for attempt in range(6)))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,106 @@
+import unittest
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.phrase_matcher import PhraseMatcher
+from src.safety_matcher import DIAGNOSIS_PATTERNS, SafetyMatcher, _leading_chars
+
+
+class TestPhraseMatcher(unittest.TestCase):
+
+    def test_longest_phrase_wins_with_original_offsets(self):
+        matcher = PhraseMatcher(["chest", "chest pain", "pain"])
+        text = "Sudden CHEST PAIN and arm pain"
+        matches = matcher.find_all(text)
+        self.assertEqual([(m.phrase, m.text) for m in matches], [("chest pain", "CHEST PAIN"), ("pain", "pain")])
+        self.assertEqual(text[matches[0].start:matches[0].end], "CHEST PAIN")
+
+    def test_unicode_normalization_maps_back_to_original(self):
+        matcher = PhraseMatcher({"naïve": "n", "straße": "s"})
+        text = "A naïve STRASSE test"  # Decomposed diaeresis; casefolded sharp s
+        matches = matcher.find_all(text)
+        self.assertEqual([m.text for m in matches], ["naïve", "STRASSE"])
+        self.assertEqual([m.payloads for m in matches], [("n",), ("s",)])
+
+    def test_word_boundaries(self):
+        matcher = PhraseMatcher(["cold"], word_boundaries=True)
+        self.assertIsNone(matcher.search("a scolding"))
+        self.assertEqual(matcher.search("a cold, again").start, 2)
+
+
+class TestSafetyMatcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open("src/nlu_config.json", 'r', encoding='utf-8') as f:
+            cls.emergency_keywords = json.load(f)["keyword_lists"]["emergency_keywords"]
+        cls.matcher = SafetyMatcher(cls.emergency_keywords, DIAGNOSIS_PATTERNS)
+
+    def test_every_configured_keyword_is_detected(self):
+        for language, keywords in self.emergency_keywords.items():
+            for keyword in keywords:
+                self.assertTrue(self.matcher.is_emergency(f"please help, {keyword} now", f"{language}-IN"),
+                                f"{language}: {keyword}")
+        self.assertFalse(self.matcher.is_emergency("I have a mild cold", "en-IN"))
+
+    def test_english_keywords_apply_to_code_mixed_queries(self):
+        self.assertTrue(self.matcher.is_emergency("मुझे chest pain हो रहा है", "hi-IN"))
+
+    def test_scan_reports_all_hits_with_positions(self):
+        text = "What is wrong with me? I have chest pain, do I have a heart attack?"
+        hits = self.matcher.scan(text, "en-IN")
+        self.assertEqual([(hit.kind, hit.text) for hit in hits],
+                         [("diagnosis", "What is wrong"), ("emergency", "chest pain"),
+                          ("diagnosis", "do I have"), ("emergency", "heart attack")])
+        for hit in hits:
+            self.assertEqual(text[hit.start:hit.end], hit.text)
+
+    def test_diagnosis_patterns_match_as_before(self):
+        queries = ["Can you diagnose this rash?", "मेरा निदान करो", "Am I suffering from dengue?",
+                   "How do I prevent malaria?", "What illness causes joint pain?", "I feel fine today"]
+        for query in queries:
+            expected = any(re.search(pattern, query.lower(), re.IGNORECASE) for pattern in DIAGNOSIS_PATTERNS)
+            self.assertEqual(self.matcher.is_diagnosis_request(query), expected, query)
+        self.assertTrue(self.matcher.is_diagnosis_request("मेरा निदान करो"))
+
+    def test_guard_is_derived_from_the_patterns(self):
+        self.assertEqual(_leading_chars(DIAGNOSIS_PATTERNS[0]), {"w", "d"})
+        for pattern in [r'\b(\w+ disease)\b', r'(?i)what', r'a?b', r'[ab]c', r'(ab)*c']:
+            self.assertIsNone(_leading_chars(pattern), pattern)
+
+        text = ("Doctor, what is wrong? Please DIAGNOSE me, do I have flu or am I suffering from dengue? "
+                "मुझे क्या बीमारी है, निदान करो। எனக்கு என்ன நோய்? கண்டறிதல் வேண்டும். Should I worry? Is it serious?")
+        self.assertEqual([hit.text for hit in self.matcher.diagnosis_hits(text)],
+                         ["what is wrong", "DIAGNOSE", "do I have", "am I suffering", "निदान"])
+        # A pattern starting with a new character is still found; one without a literal start disables the guard
+        for extra, last_hit in [(r'\b(should i worry)\b', "Should I worry"), (r'\b(\w+ serious)\b', "it serious")]:
+            patterns = list(DIAGNOSIS_PATTERNS) + [extra]
+            matcher = SafetyMatcher(self.emergency_keywords, patterns)
+            self.assertEqual(matcher.diagnosis_hits(text)[-1].text, last_hit)
+            expected = sorted(match.span() for pattern in patterns for match in re.finditer(pattern, text.casefold()))
+            self.assertEqual([(hit.start, hit.end) for hit in matcher.diagnosis_hits(text)], expected)
+
+    def test_long_transcript_is_fast(self):
+        filler = "I have had a mild headache since last week. मुझे कल से हल्का बुखार है। "
+        text = (filler * 80)[:5000] + " chest pain"
+        p99s = []
+        for _ in range(3):  # Best of three rounds, so one scheduler hiccup does not fail the bound
+            timings = []
+            for run in range(200):
+                variant = text + " " * (run % 2)
+                start = time.perf_counter()
+                self.assertTrue(self.matcher.is_emergency(variant, "hi-IN"))
+                self.matcher.is_diagnosis_request(variant)
+                timings.append(time.perf_counter() - start)
+            p99s.append(sorted(timings)[int(0.99 * (len(timings) - 1))])
+        # Measured ~0.43 ms p50 and 0.55-1.2 ms p99 (about 0.3 ms of it NFC normalization); 3 ms leaves room for CI noise
+        self.assertLess(min(p99s), 0.003)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
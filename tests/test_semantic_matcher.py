@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.knowledge_registry import DEFAULT_KB_PATH
+from src.nlu_processor import NLUResult, MedicalEntity, HealthIntent
+from src.semantic_matcher import SemanticSymptomMatcher
+from src.symptom_checker import SymptomChecker
+
+
+class TestSemanticSymptomMatcher(unittest.TestCase):
+
+    def setUp(self):
+        with open(DEFAULT_KB_PATH, 'r', encoding='utf-8') as f:
+            self.symptoms = json.load(f)["symptoms"]
+        self.matcher = SemanticSymptomMatcher(self.symptoms)
+
+    def test_paraphrases_resolve_and_unrelated_text_does_not(self):
+        texts = ["my head is pounding", "feeling feverish", "throat is scratchy", "itchy red bumps", "bukhaar sa lag raha",
+                 "I sprained my ankle", "hello there", "back pain"]
+        results = self.matcher.match(texts)
+        self.assertEqual([matches[0].symptom_name if matches else None for matches in results],
+                         ["headache", "fever", "sore throat", "skin rash", "fever", None, None, None])
+        self.assertEqual(results[0][0].phrase, "head pain")
+        self.assertTrue(all(match.score >= self.matcher.threshold for matches in results for match in matches))
+
+    def test_opposites_negations_and_excluded_terms_do_not_match(self):
+        # Each of these shares n-grams with a KB phrase well above the threshold ("weight gain" scores 0.45
+        # against "sudden weight loss", "heart racing" 0.51 against "heart pain")
+        texts = ["weight gain", "gaining weight", "weight increase", "heart racing", "rapid heartbeat", "tired eyes",
+                 "no fever", "loss of appetite", "loose stools since morning"]
+        results = self.matcher.match(texts)
+        self.assertEqual([matches[0].symptom_name if matches else None for matches in results],
+                         [None, None, None, None, None, None, None, None, "diarrhea"])
+
+        # The same words on the matching side still resolve
+        results = self.matcher.match(["losing weight", "feeling tired", "no energy at all", "hard stools"])
+        self.assertEqual([matches[0].symptom_name for matches in results],
+                         ["unexplained weight loss", "fatigue", "fatigue", "constipation"])
+
+        contradicted = self.matcher.contradicted("tired eyes")
+        fatigue = [name for name, symptom_id in zip(self.matcher.phrases, self.matcher.phrase_symptoms)
+                   if self.symptoms[symptom_id]["symptom_name"] == "fatigue"]
+        self.assertEqual([phrase for phrase, blocked in zip(self.matcher.phrases, contradicted) if blocked], fatigue)
+
+    def test_matrix_is_saved_and_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            built = SemanticSymptomMatcher(self.symptoms, cache_dir=cache_dir)
+            self.assertFalse(built.memory_mapped)
+            loaded = SemanticSymptomMatcher(self.symptoms, cache_dir=cache_dir)
+            self.assertTrue(loaded.memory_mapped)
+            self.assertIsInstance(loaded.matrix, np.memmap)
+            self.assertEqual(loaded.best("feeling feverish"), built.best("feeling feverish"))
+
+            # A different KB gets its own file instead of a stale matrix
+            changed = SemanticSymptomMatcher(self.symptoms[:-1], cache_dir=cache_dir)
+            self.assertFalse(changed.memory_mapped)
+            self.assertEqual(len(os.listdir(cache_dir)), 4)
+
+    def test_symptom_checker_resolves_paraphrases_without_translation(self):
+        entities = [MedicalEntity("my head is pounding", "symptom", 0.8, 0, 19), MedicalEntity("coughs", "symptom", 0.9, 24, 30)]
+        nlu_result = NLUResult("my head is pounding and coughs", HealthIntent.SYMPTOM_QUERY, 0.9, entities, False, True, "en-IN")
+        checker = SymptomChecker(nlu_result, api_key="test_api_key_123")
+        with patch.object(checker.semantic_matcher, "match", wraps=checker.semantic_matcher.match) as match, \
+             patch.object(checker.utils, "translate_text_to_english", side_effect=AssertionError("no translation")):
+            names = [symptom["symptom_name"] for symptom in checker.identify_relevant_symptoms()]
+        self.assertEqual(names, ["headache", "cough"])
+        match.assert_called_once_with(["my head is pounding"])  # Only entities the index could not resolve
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
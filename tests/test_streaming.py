@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import LRUCache, TieredCache
+from src.nlu_processor import SarvamAPIClient, NLUResult, HealthIntent
+from src.response_generator import HealHubResponseGenerator
+from src.utils import HealHubUtilities
+
+DELTAS = ["Stay", " hydrated", " and rest.", "\nSee a doctor if it persists."]
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        self.server.requests.append(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(b": keep-alive comment\n\n")
+        for delta in DELTAS:
+            event = {"choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(0.01)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _nlu_result(language="en-IN"):
+    return NLUResult(original_text="I have a cold", language_detected=language, intent=HealthIntent.GENERAL_HEALTH,
+                     confidence=0.9, entities=[], is_emergency=False, requires_disclaimer=True)
+
+
+class TestChatCompletionStream(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+        self.server.daemon_threads = True
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = SarvamAPIClient(api_key="test_api_key_123", cache=TieredCache(LRUCache()))
+        self.client.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_stream_yields_deltas_and_caches_result(self):
+        messages = [{"role": "user", "content": "I have a cold"}]
+
+        self.assertEqual(list(self.client.chat_completion_stream(messages, max_tokens=50)), DELTAS)
+        self.assertTrue(self.server.requests[0]["stream"])
+
+        # The assembled completion now serves both the streaming and the blocking API
+        self.assertEqual(list(self.client.chat_completion_stream(messages, max_tokens=50)), ["".join(DELTAS)])
+        self.assertEqual(self.client.chat_completion(messages, max_tokens=50)["choices"][0]["message"]["content"],
+                         "".join(DELTAS))
+        self.assertEqual(len(self.server.requests), 1)
+
+
+class TestResponseStream(unittest.TestCase):
+
+    def setUp(self):
+        with patch('src.response_generator.SarvamAPIClient'):
+            self.generator = HealHubResponseGenerator(api_key="test_api_key_123")
+
+    def test_stream_records_time_to_first_token(self):
+        self.generator.sarvam_client.chat_completion_stream.return_value = iter(["  ", "\nHello", " there."])
+
+        self.assertEqual("".join(self.generator.generate_response_stream("hi", _nlu_result())), "Hello there.")
+        metrics = self.generator.last_stream_metrics
+        self.assertEqual(metrics["chunks"], 2)
+        self.assertLessEqual(metrics["ttft_ms"], metrics["total_ms"])
+
+    def test_empty_stream_falls_back(self):
+        self.generator.sarvam_client.chat_completion_stream.return_value = iter([])
+        reply = "".join(self.generator.generate_response_stream("hi", _nlu_result()))
+        self.assertIn("unable to assist", reply)
+
+
+class TestTranslateStream(unittest.TestCase):
+
+    def test_translates_completed_sentences_keeping_layout(self):
+        util = HealHubUtilities(api_key="test_api_key_123", translation_cache=TieredCache(LRUCache()))
+        util._translate = MagicMock(side_effect=lambda text, lang: f"<{text}>")
+
+        pieces = list(util.translate_stream(iter(["Drink wa", "ter. Rest", " well.\n- Sleep", " early"]), "hi-IN"))
+
+        self.assertEqual(pieces, ["<Drink water.> ", "<Rest well.>\n", "<- Sleep early>"])
+        self.assertEqual(list(util.translate_stream(iter(["a", "b"]), "en-IN")), ["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
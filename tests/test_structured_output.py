@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import LRUCache, TieredCache
+from src.nlu_processor import BATCH_INTENT_RESPONSE_SCHEMA, INTENT_RESPONSE_SCHEMA, SarvamAPIClient
+from src.structured_output import IncrementalJSONParser, json_start_chars, parse_json_object, parse_json_stream
+
+
+class TestIncrementalJSONParser(unittest.TestCase):
+
+    def test_fields_are_exposed_as_they_complete(self):
+        parser = IncrementalJSONParser()
+        self.assertFalse(parser.feed('```json\n{"intent": "symptom_'))
+        self.assertEqual(parser.fields, {})
+        self.assertFalse(parser.feed('query", "confi'))
+        self.assertEqual(parser.fields, {"intent": "symptom_query"})  # Intent before confidence
+        self.assertFalse(parser.feed('dence": 0.9'))
+        self.assertNotIn("confidence", parser.fields)  # A number is complete only at its delimiter
+        self.assertTrue(parser.feed(', "entities": [{"text": "a } \\" b"}]}\n```\nHope this helps!'))
+        self.assertEqual(parser.value, {"intent": "symptom_query", "confidence": 0.9, "entities": [{"text": 'a } " b'}]})
+        self.assertEqual(parser.json_text[-2:], "]}")
+
+    def test_parse_json_object_tolerates_fences_and_prose(self):
+        self.assertEqual(parse_json_object('Here you go:\n```\n{"a": [1, {"b": null}]}\n```\nAnything else?'),
+                         {"a": [1, {"b": None}]})
+        self.assertEqual(parse_json_object('[1] {"a": true}'), {"a": True})
+        self.assertEqual(parse_json_object('ids: [{"id": 1}, {"id": 2}] done', accept="{["), [{"id": 1}, {"id": 2}])
+        for bad in ["this is not json", '{"intent": "symptom_query", "confidence"', "", "{'a': 1}"]:
+            with self.assertRaises(json.JSONDecodeError, msg=bad):
+                parse_json_object(bad)
+
+    def test_stream_stops_once_the_top_level_value_closes(self):
+        consumed, arrived = [], []
+
+        def chunks():
+            for chunk in ['[{"id": 1, "intent": "emergency"},', ' {"id": 2}]', " Note:", " more prose"]:
+                consumed.append(chunk)
+                yield chunk
+        parser = parse_json_stream(chunks(), on_field=lambda index, value: arrived.append((index, value)))
+
+        self.assertEqual(len(consumed), 2)
+        self.assertEqual(arrived, [(0, {"id": 1, "intent": "emergency"}), (1, {"id": 2})])
+        self.assertEqual(parser.items, parser.value)
+
+
+class TestStructuredCompletion(unittest.TestCase):
+
+    def setUp(self):
+        self.client = SarvamAPIClient(api_key="test_api_key_123", cache=TieredCache(LRUCache()))
+        self.messages = [{"role": "user", "content": "Classify: 'fever'"}]
+
+    def test_structured_completion_is_cut_off_and_cached(self):
+        state = {"consumed": 0, "closed": False}
+
+        def stream(messages, model="sarvam-m", **kwargs):
+            try:
+                for chunk in ['```json\n{"intent": ', '"symptom_query", ', '"confidence": 0.9}', "\n```", " The user has a fever."]:
+                    state["consumed"] += 1
+                    yield chunk
+            finally:
+                state["closed"] = True  # The HTTP response is closed here
+        self.client.chat_completion_stream = stream
+        fields = []
+
+        response = self.client.chat_completion(self.messages, max_tokens=100, structured=True,
+                                               on_field=lambda key, value: fields.append(key))
+
+        self.assertEqual(response["choices"][0]["message"]["content"], '{"intent": "symptom_query", "confidence": 0.9}')
+        self.assertEqual((state["consumed"], state["closed"]), (3, True))
+        self.assertEqual(fields, ["intent", "confidence"])
+        # Cached under the plain completion key, so a non-streamed call for the same payload hits it
+        self.client.chat_completion_stream = None
+        self.assertEqual(self.client.chat_completion(self.messages, max_tokens=100), response)
+
+    def test_prose_brackets_are_skipped_and_invalid_replies_are_not_cached(self):
+        self.assertEqual((json_start_chars(INTENT_RESPONSE_SCHEMA), json_start_chars(BATCH_INTENT_RESPONSE_SCHEMA),
+                          json_start_chars()), ("{", "[", "{"))
+        reply = ['Sure [see below]: {"intent": ', '"symptom_query", "confidence": 0.9}']
+        self.client.chat_completion_stream = lambda *args, **kwargs: iter(reply)
+        response = self.client.chat_completion(self.messages, structured=True, schema=INTENT_RESPONSE_SCHEMA)
+        self.assertEqual(json.loads(response["choices"][0]["message"]["content"]), {"intent": "symptom_query", "confidence": 0.9})
+
+        # Parses, but fails the schema: returned to the caller, never served from the cache
+        other_messages = [{"role": "user", "content": "Classify: 'cough'"}]
+        self.client.chat_completion_stream = lambda *args, **kwargs: iter(['{"intent": 3}'])
+        self.assertEqual(self.client.chat_completion(other_messages, structured=True, schema=INTENT_RESPONSE_SCHEMA)
+                         ["choices"][0]["message"]["content"], '{"intent": 3}')
+        self.client.chat_completion_stream = lambda *args, **kwargs: iter(['{"intent": "symptom_query"}'])
+        self.assertEqual(self.client.chat_completion(other_messages, structured=True, schema=INTENT_RESPONSE_SCHEMA)
+                         ["choices"][0]["message"]["content"], '{"intent": "symptom_query"}')
+
+        self.client.stream_structured_output = False
+        with patch("src.nlu_processor.get_transport") as get_transport:
+            get_transport.return_value.post.return_value.json.return_value = {"choices": [{"message": {"content": "Sure [see below]"}}]}
+            self.client.chat_completion([{"role": "user", "content": "x"}], structured=True, schema=INTENT_RESPONSE_SCHEMA)
+            self.client.chat_completion([{"role": "user", "content": "x"}], structured=True, schema=INTENT_RESPONSE_SCHEMA)
+        self.assertEqual(get_transport.return_value.post.call_count, 2)
+
+    def test_streaming_can_be_disabled(self):
+        self.client.stream_structured_output = False
+        self.client.chat_completion_stream = lambda *args, **kwargs: self.fail("should not stream")
+        with patch("src.nlu_processor.get_transport") as get_transport:
+            get_transport.return_value.post.return_value.json.return_value = {"choices": [{"message": {"content": "{}"}}]}
+            self.assertEqual(self.client.chat_completion(self.messages, structured=True)["choices"][0]["message"]["content"], "{}")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,79 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import LRUCache, TieredCache
+from src.nlu_processor import SarvamMNLUProcessor, SarvamAPIClient, HealthIntent
+from src.request_policy import RequestPolicy
+from src.response_generator import HealHubResponseGenerator
+from src.stub_server import StubSarvamServer, StubConfig, RouteConfig, CANNED_REPLY
+from src.utils import HealHubUtilities
+
+
+class TestStubSarvamServer(unittest.TestCase):
+
+    def setUp(self):
+        self.config = StubConfig(stream_chunk_delay_ms=0)
+        self.stub = StubSarvamServer(self.config).start()
+        self.addCleanup(self.stub.stop)
+        env = patch.dict(os.environ, {"SARVAM_BASE_URL": self.stub.base_url})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_nlu_pipeline_runs_against_stub(self):
+        for mode in ("split", "fused"):
+            # No background intent audits: the stub's request count is the response path's
+            processor = SarvamMNLUProcessor(api_key="test_api_key_123", nlu_mode=mode, intent_audit_rate=0)
+            processor.sarvam_client.cache = TieredCache(LRUCache())
+            result = processor.process_transcription("I have a fever and a headache", source_language="en-IN")
+            self.assertEqual(result.intent, HealthIntent.SYMPTOM_QUERY, mode)
+            self.assertIn("fever", [entity.text.lower() for entity in result.entities])
+            if mode == "split":
+                self.assertEqual(processor.nlu_stats["intent_fast_path"], 1)
+        self.assertEqual(self.stub.stats()["chat"]["requests"], 2)  # Split: entity call only (local intent); one fused call
+
+    def test_streaming_reply_and_speech_routes(self):
+        generator = HealHubResponseGenerator(api_key="test_api_key_123")
+        generator.sarvam_client = SarvamAPIClient(api_key="test_api_key_123", cache=TieredCache(LRUCache()))
+        nlu = SarvamMNLUProcessor(api_key="test_api_key_123")
+        nlu.sarvam_client.cache = TieredCache(LRUCache())
+        nlu_result = nlu.process_transcription("How can I sleep better?", source_language="en-IN")
+
+        self.assertEqual("".join(generator.generate_response_stream("How can I sleep better?", nlu_result)), CANNED_REPLY)
+
+        util = HealHubUtilities(api_key="test_api_key_123", translation_cache=TieredCache(LRUCache()))
+        self.assertEqual(util.translate_text("Rest well", "hi-IN"), "[hi] Rest well")
+        self.assertTrue(util.synthesize_speech("Rest well", "hi-IN"))
+
+    def test_rate_limit_and_error_injection(self):
+        self.config.routes["translate"] = RouteConfig(rate_limit_rps=1)
+        self.config.routes["tts"] = RouteConfig(error_rate=1.0)
+        no_retry = RequestPolicy(max_retries=0)
+        util = HealHubUtilities(api_key="test_api_key_123", translation_cache=TieredCache(LRUCache()),
+                                request_policies={"translate": no_retry, "tts": no_retry})
+
+        self.assertEqual(util.translate_text("first", "ta-IN"), "[ta] first")
+        self.assertEqual(util.translate_text("second", "ta-IN"), "second")  # 429 -> original text
+        self.assertIsNone(util.synthesize_speech("hello there", "en-IN"))  # 503 -> no audio
+
+        stats = self.stub.stats()
+        self.assertEqual(stats["translate"]["rate_limited"], 1)
+        self.assertEqual(stats["tts"]["errors_injected"], 1)
+
+    def test_latency_samples_are_seeded(self):
+        config = StubConfig(seed=7, routes={"chat": RouteConfig(latency_median_ms=100, latency_p99_ms=400)})
+        first, second = StubSarvamServer(config), StubSarvamServer(config)
+        try:
+            samples = [first.sample_latency("chat") for _ in range(200)]
+            self.assertEqual(samples, [second.sample_latency("chat") for _ in range(200)])
+            self.assertAlmostEqual(sorted(samples)[100], 0.1, delta=0.03)
+        finally:
+            first._httpd.server_close()
+            second._httpd.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
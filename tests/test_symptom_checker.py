@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch, MagicMock
 import json
 import os
+import pickle
 import sys
 
 # Add src to sys.path to allow direct import of src modules
@@ -10,7 +11,7 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 try:
-    from src.symptom_checker import SymptomChecker
+    from src.symptom_checker import SymptomChecker, SymptomSessionState
     # Assuming HealthIntent, MedicalEntity, NLUResult are available via src.nlu_processor
     # or through symptom_checker.py's own placeholders if nlu_processor isn't fully there.
     from src.nlu_processor import NLUResult, MedicalEntity, HealthIntent
@@ -242,5 +243,30 @@ class TestSymptomChecker(unittest.TestCase):
         # Ensure chat_completion was not called because of the missing API key
         mock_client_instance.chat_completion.assert_not_called()
 
+    def test_session_state_is_compact_and_resumable(self):
+        nlu_res = create_mock_nlu_result(text="I have a fever and a cough", entities_data=[("fever", "symptom"), ("cough", "symptom")])
+        checker = SymptomChecker(nlu_res, api_key=self.mock_api_key, symptom_kb_path=self.dummy_kb_path)
+        checker.prepare_follow_up_questions()
+        first = checker.get_next_question()
+        checker.record_answer(first["symptom_name"], first["question"], "102F")
+
+        state = checker.state
+        self.assertFalse(hasattr(state, "__dict__"))
+        self.assertEqual(state.symptom_ids, ["fever", "cough"])
+        self.assertEqual(state.pending, [("fever", 1), ("cough", 0), ("cough", 1)])
+        serialized = json.dumps(state.to_dict())
+        self.assertLess(len(serialized.encode("utf-8")), 400)
+        self.assertEqual(pickle.loads(pickle.dumps(state)), state)
+
+        # Another worker resumes the session with its own (shared) services
+        restored = SymptomSessionState.from_dict(json.loads(serialized))
+        resumed = SymptomChecker.from_state(restored, symptom_kb_path=self.dummy_kb_path,
+                                            sarvam_client=checker.sarvam_client, utils=checker.utils)
+        self.assertIs(resumed.utils, checker.utils)
+        self.assertEqual(resumed.collected_symptom_details, {"fever": {"How high is the fever?": "102F"}})
+        self.assertEqual(resumed.get_next_question()["question"], "Any chills?")
+        self.assertEqual(len(resumed.pending_follow_up_questions), 2)
+        self.assertIs(restored.pending, resumed.state.pending)  # The checker mutates the session's state in place
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
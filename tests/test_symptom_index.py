@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.knowledge_registry import DEFAULT_KB_PATH, get_knowledge_registry
+from src.nlu_processor import NLUResult, MedicalEntity, HealthIntent
+from src.symptom_checker import SymptomChecker
+from src.symptom_index import SymptomIndex, _linear_scan, stem, synthetic_kb
+
+
+class TestSymptomIndex(unittest.TestCase):
+
+    def setUp(self):
+        with open(DEFAULT_KB_PATH, 'r', encoding='utf-8') as f:
+            self.index = SymptomIndex(json.load(f)["symptoms"])
+
+    def test_stemming_per_language(self):
+        for token, expected in [("aches", "ach"), ("bodies", "body"), ("coughing", "cough"), ("running", "run"),
+                                ("loss", "loss"), ("vomited", "vomit"), ("दर्दों", "दर्द"), ("தலைவலிகள்", "தலைவலி"),
+                                ("నొప్పులు", "నొప్పు"), ("is", "is")]:
+            self.assertEqual(stem(token), expected, token)
+        self.assertEqual(stem("डोक्यात", "mr-IN"), "डोक्य")
+        self.assertEqual(stem("डोक्यात", "hi-IN"), "डोक्यात")
+
+    def test_english_inflections_share_a_stem(self):
+        for forms in [("bleed", "bleeding", "bleeds"), ("ache", "aches", "aching", "ached"), ("breathe", "breathing", "breathes"),
+                      ("itch", "itches", "itchy", "itching"), ("fever", "fevers", "feverish"), ("diabetes", "diabetes"),
+                      ("run", "running", "runny"), ("swell", "swelling", "swelled")]:
+            self.assertEqual({stem(form) for form in forms}, {stem(forms[0])}, forms)
+        self.assertEqual([stem(token) for token in ("gas", "has", "need", "red", "knees")], ["gas", "has", "need", "red", "knee"])
+
+        self.assertEqual(self.index.best("I feel feverish").symptom_name, "fever")  # As the old substring scan did
+        for text, expected in [("I am aching all over", "body aches"), ("my head aches", "headache"),
+                               ("breathing trouble", "shortness of breath"), ("itches all over", "skin rash")]:
+            self.assertIn(expected, [match.symptom_name for match in self.index.search(text)], text)
+
+    def test_whole_phrase_matches_rank_first(self):
+        self.assertEqual(self.index.best("terrible coughing").symptom_name, "cough")
+        self.assertEqual(self.index.best("feeling hot").phrase, "hot")
+        self.assertIsNone(self.index.best("a flu shot"))  # "hot" only as a substring
+        self.assertIsNone(self.index.best("feeling great"))
+        names = [match.symptom_name for match in self.index.search("chest pain and body aches")]
+        self.assertEqual(names[:2], ["chest pain", "body aches"])
+        partial = self.index.search("pain in my chest")
+        self.assertEqual(partial[0].symptom_name, "chest pain")
+        self.assertFalse(partial[0].exact)
+        self.assertLess(partial[0].score, 1.0)
+
+    def test_agrees_with_the_linear_scan_on_a_10k_kb(self):
+        kb = synthetic_kb(10_000)
+        index = SymptomIndex(kb)
+        rng = random.Random(3)
+        for _ in range(200):
+            symptom = rng.choice(kb)
+            text = f"severe {rng.choice([symptom['symptom_name']] + symptom['keywords'])} since monday"
+            match = index.best(text)
+            self.assertIsNotNone(match, text)
+            self.assertIn(match.entry, [entry for entry in kb if _linear_scan([entry], text)])
+
+    def test_symptom_checker_uses_the_shared_index(self):
+        entities = [MedicalEntity(text, "symptom", 0.9, 0, len(text)) for text in ["coughing badly", "had a flu shot", "coughs"]]
+        nlu_result = NLUResult("coughing badly", HealthIntent.SYMPTOM_QUERY, 0.9, entities, False, True, "en-IN")
+        checker = SymptomChecker(nlu_result, api_key="test_api_key_123")
+
+        self.assertIs(checker.symptom_index, get_knowledge_registry().symptom_kb(DEFAULT_KB_PATH).index)
+        self.assertEqual([symptom["symptom_name"] for symptom in checker.identify_relevant_symptoms()], ["cough"])
+
+    def test_entities_match_kb_aliases_without_translation(self):
+        self.assertEqual(self.index.best("मुझे तेज़ बुखार है", "hi-IN").symptom_name, "fever")
+        self.assertEqual(self.index.best("மூன்று நாளாக தலைவலி", "ta-IN").symptom_name, "headache")
+        self.assertEqual(self.index.best("sir dard ho raha hai", "hi-IN").symptom_name, "headache")
+        self.assertIsNone(self.index.best("multiple issues", "en-IN"))  # "ulti" is an alias, not a substring
+
+        entities = [MedicalEntity("बुखार", "symptom", 0.9, 0, 5), MedicalEntity("খুব কাশি", "symptom", 0.9, 6, 14),
+                    MedicalEntity("सीने में दर्द", "symptom", 0.75, 15, 28, canonical_name="chest pain")]
+        nlu_result = NLUResult("बुखार ...", HealthIntent.SYMPTOM_QUERY, 0.9, entities, False, True, "hi-IN")
+        checker = SymptomChecker(nlu_result, api_key="test_api_key_123")
+        with patch.object(checker.utils, "translate_text_to_english", side_effect=AssertionError("no translation")):
+            names = [symptom["symptom_name"] for symptom in checker.identify_relevant_symptoms()]
+        self.assertEqual(names, ["fever", "cough", "chest pain"])
+
+    def test_unknown_entities_fall_back_to_translation(self):
+        entities = [MedicalEntity("गला बैठ गया", "symptom", 0.9, 0, 11)]
+        nlu_result = NLUResult("गला बैठ गया", HealthIntent.SYMPTOM_QUERY, 0.9, entities, False, True, "hi-IN")
+        checker = SymptomChecker(nlu_result, api_key="test_api_key_123")
+        with patch.object(checker.utils, "translate_text_to_english", return_value="sore throat") as translate:
+            names = [symptom["symptom_name"] for symptom in checker.identify_relevant_symptoms()]
+        translate.assert_called_once_with("गला बैठ गया")
+        self.assertEqual(names, ["sore throat"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
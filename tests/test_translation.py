@@ -0,0 +1,86 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.cache import LRUCache, TieredCache
+from src.utils import HealHubUtilities, TRANSLATE_MAX_INPUT_CHARS
+
+
+class FakeTranslateBackend:
+    """
+    Local stand-in for the /translate endpoint.
+
+    Translates line by line (like the real service does for multi-line input) by
+    prefixing each line with the target language. With merge_lines=True it joins
+    packed lines into one, simulating a response that can't be unpacked.
+    """
+
+    def __init__(self, merge_lines: bool = False):
+        self.merge_lines = merge_lines
+        self.inputs = []
+        self._lock = threading.Lock()
+
+    def post(self, endpoint, url, headers=None, json=None, **kwargs):
+        with self._lock:
+            self.inputs.append(json["input"])
+        lines = json["input"].split("\n")
+        translated = [f"<{json['target_language_code']}>{line}" for line in lines]
+        response = MagicMock()
+        response.json.return_value = {"translated_text": (" " if self.merge_lines else "\n").join(translated)}
+        return response
+
+
+class TestTranslateMany(unittest.TestCase):
+
+    def setUp(self):
+        self.util = HealHubUtilities(api_key="test_api_key_123", translation_cache=TieredCache(LRUCache()))
+
+    def _translate_many(self, backend, texts, lang="hi-IN"):
+        with patch('src.utils.get_transport', return_value=backend):
+            return self.util.translate_many(texts, lang)
+
+    def test_order_dedup_and_packing(self):
+        backend = FakeTranslateBackend()
+        texts = ["Summary", "Disclaimer", "Summary", "Rest and hydrate.", "", "Disclaimer"]
+
+        result = self._translate_many(backend, texts)
+
+        self.assertEqual(result, ["<hi-IN>Summary", "<hi-IN>Disclaimer", "<hi-IN>Summary",
+                                  "<hi-IN>Rest and hydrate.", "", "<hi-IN>Disclaimer"])
+        self.assertEqual(len(backend.inputs), 1)  # Three unique strings packed into one request
+
+    def test_requests_respect_input_limit(self):
+        backend = FakeTranslateBackend()
+        texts = [f"{i} " + "x" * 300 for i in range(7)]
+
+        result = self._translate_many(backend, texts)
+
+        self.assertEqual(result, [f"<hi-IN>{text}" for text in texts])
+        self.assertGreater(len(backend.inputs), 1)
+        self.assertTrue(all(len(block) <= TRANSLATE_MAX_INPUT_CHARS for block in backend.inputs))
+
+    def test_falls_back_when_lines_do_not_match(self):
+        backend = FakeTranslateBackend(merge_lines=True)
+        texts = ["Summary", "Disclaimer", "Multi\nline step"]
+
+        result = self._translate_many(backend, texts)
+
+        self.assertEqual(result[:2], ["<hi-IN>Summary", "<hi-IN>Disclaimer"])
+        self.assertEqual(result[2], "<hi-IN>Multi <hi-IN>line step")
+        # One packed attempt, two individual retries, one unpackable multi-line string
+        self.assertEqual(len(backend.inputs), 4)
+
+    def test_cached_and_english_skip_network(self):
+        backend = FakeTranslateBackend()
+        self._translate_many(backend, ["Summary"])
+        self._translate_many(backend, ["Summary"])
+        self.assertEqual(self._translate_many(backend, ["Summary"], lang="en-IN"), ["Summary"])
+        self.assertEqual(len(backend.inputs), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)